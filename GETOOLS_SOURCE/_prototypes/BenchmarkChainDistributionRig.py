@@ -0,0 +1,40 @@
+import time
+import maya.cmds as cmds
+
+import GETOOLS_SOURCE.utils.ChainDistributionPlan as ChainDistributionPlan
+import GETOOLS_SOURCE.utils.ChainDistributionRig as ChainDistributionRig
+
+count = 100
+frames = 100
+
+
+def PrepareScene():
+	cmds.file(new = True, force = True)
+	cmds.playbackOptions(min = 1, max = frames)
+	joints = []
+	cmds.select(clear = True)
+	for i in range(count):
+		joints.append(cmds.joint(name = "benchJoint{0}".format(i), position = (i * 5, 0, 0)))
+	cmds.setKeyframe(joints[0], attribute = "rotateZ", time = 1, value = 0)
+	cmds.setKeyframe(joints[0], attribute = "rotateZ", time = frames, value = 90)
+	cmds.select(joints, replace = True)
+	return joints
+
+
+# Planner only, no scene changes
+joints = PrepareScene()
+timeStart = time.time()
+ChainDistributionPlan.PlanRigVariant1(joints)
+ChainDistributionPlan.PlanRigVariant2(joints)
+timePlan = time.time() - timeStart
+
+# Full rig creation
+results = []
+for variant in (ChainDistributionRig.CreateRigVariant1, ChainDistributionRig.CreateRigVariant2):
+	PrepareScene()
+	timeStart = time.time()
+	variant(locatorSize = 1)
+	results.append(time.time() - timeStart)
+
+
+print("{0} links, {1} frames | plan {2:.4f}s | variant 1 {3:.4f}s | variant 2 {4:.4f}s".format(count, frames, timePlan, results[0], results[1]))
@@ -0,0 +1,38 @@
+import time
+import maya.cmds as cmds
+
+import GETOOLS_SOURCE.utils.Locators as Locators
+
+count = 1000
+repeats = 5
+
+
+# Prepare scene
+cmds.file(new = True, force = True)
+locators = Locators.CreateBatch(["benchLoc"] * count)[0]
+cmds.select(locators, replace = True)
+
+
+# Bulk scale
+timeStart = time.time()
+for i in range(repeats):
+	Locators.SelectedLocatorsSizeScale(1.1)
+timeScale = (time.time() - timeStart) / repeats
+
+# Bulk set
+timeStart = time.time()
+for i in range(repeats):
+	Locators.SelectedLocatorsSizeSet(2)
+timeSet = (time.time() - timeStart) / repeats
+
+# Legacy per locator logic for comparison
+timeStart = time.time()
+for item in locators:
+	shape = cmds.listRelatives(item, shapes = True, type = "locator")[0]
+	size = [cmds.getAttr(shape + ".localScale" + axis) for axis in ("X", "Y", "Z")]
+	for axis, value in zip(("X", "Y", "Z"), size):
+		cmds.setAttr(shape + ".localScale" + axis, value * 1.1)
+timeLegacy = time.time() - timeStart
+
+
+print("{0} locators | scale {1:.4f}s | set {2:.4f}s | legacy scale {3:.4f}s".format(count, timeScale, timeSet, timeLegacy))
@@ -0,0 +1,67 @@
+import time
+import maya.cmds as cmds
+
+import GETOOLS_SOURCE.utils.Baker as Baker
+import GETOOLS_SOURCE.utils.Sampler as Sampler
+
+count = 50
+frames = 200
+attributes = ("translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ")
+
+
+def PrepareScene():
+	# Constrained chain, every object depends on the animated driver
+	cmds.file(new = True, force = True)
+	cmds.playbackOptions(min = 1, max = frames)
+	driver = cmds.spaceLocator(name = "benchDriver")[0]
+	cmds.setKeyframe(driver, attribute = "translateX", time = 1, value = 0)
+	cmds.setKeyframe(driver, attribute = "translateX", time = frames, value = 100)
+	cmds.setKeyframe(driver, attribute = "rotateY", time = 1, value = 0)
+	cmds.setKeyframe(driver, attribute = "rotateY", time = frames, value = 360)
+	objects = []
+	for i in range(count):
+		item = cmds.group(empty = True, name = "benchObject{0}".format(i))
+		cmds.parentConstraint(driver, item, maintainOffset = False)
+		objects.append(item)
+	return objects
+
+times = Sampler.GetTimes(1, frames)
+
+
+# Sampling, legacy getAttr with time flag per plug and time
+objects = PrepareScene()
+timeStart = time.time()
+for item in objects:
+	for attribute in attributes:
+		[cmds.getAttr(item + "." + attribute, time = value) for value in times]
+timeSampleLegacy = time.time() - timeStart
+
+# Sampling, one DG context per time for all plugs
+timeStart = time.time()
+Sampler.SampleAttributes(objects, attributes, times)
+timeSample = time.time() - timeStart
+
+
+# Bake, legacy per frame loop with current time changes
+objects = PrepareScene()
+cmds.select(objects, replace = True)
+cmds.refresh(suspend = True)
+timeStart = time.time()
+for value in times:
+	cmds.currentTime(value)
+	cmds.setKeyframe(respectKeyable = True, animated = False, preserveCurveShape = True)
+timeBakeLegacy = time.time() - timeStart
+cmds.refresh(suspend = False)
+
+# Bake, sampled in time context and written as curves
+objects = PrepareScene()
+cmds.refresh(suspend = True)
+timeStart = time.time()
+Baker.BakeSampled(objects, times, attributes)
+timeBake = time.time() - timeStart
+cmds.refresh(suspend = False)
+
+
+print("{0} objects, {1} attributes, {2} frames".format(count, len(attributes), frames))
+print("sample | legacy getAttr {0:.4f}s | context {1:.4f}s".format(timeSampleLegacy, timeSample))
+print("bake | legacy frame loop {0:.4f}s | sampled {1:.4f}s".format(timeBakeLegacy, timeBake))
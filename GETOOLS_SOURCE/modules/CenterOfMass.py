@@ -25,7 +25,7 @@ import maya.cmds as cmds
 from functools import partial
 
 from .. import Settings
-from ..utils import Baker
+from ..utils import CenterOfMassEngine
 from ..utils import Colors
 from ..utils import Constraints
 from ..utils import Locators
@@ -44,10 +44,13 @@ class CenterOfMassAnnotations:
 	projectorYZ = _projector + " YZ plane"
 	projectorXZ = _projector + " XZ plane"
 	projectorXY = _projector + " XY plane"
+	balanceThreshold = "Height above the floor (Y = 0) when contact objects are treated as grounded.\nAlso the support width around one or two grounded contacts, like a two feet stance."
+	balanceAnalyze = "Select contact objects (feet, hands) and activate button.\nStability curve will be baked to the center of mass \"stability\" attribute:\npositive - center of mass is inside the support polygon, negative - outside.\nUnbalanced frame ranges will be printed to the Script Editor.\n\nY-up scene with the floor at Y = 0 is assumed."
 
 	### Weights
 	disconnectTargets = "Disconnect selected objects from Center Of Mass"
 	weightsCustom = "Custom weights"
+	weightsAuto = "Select skinned meshes and activate button.\nWeights will be calculated from mesh volume around each joint and center of mass will be constrained to these joints."
 	_weightInfo = "Approximate weight as percentage. In sum all weights should give 100%."
 	_weightSymmetry = "Select objects on both sides and activate button."
 	weightHead = _weightInfo
@@ -66,6 +69,7 @@ class CenterOfMassAnnotations:
 	link = "Constrain cached objects to baked locators."
 	linkOffset = "{0}\nUse maintain offset to keep transform difference".format(link)
 	selectRoot = "Select root locator if exists"
+	bakeOffline = "Evaluate center of mass from sampled segments positions for the whole time range and bake it to the center of mass object.\nPoint constraint will be replaced by animation."
 
 class CenterOfMassSettings:
 	COMRadius = 10 / 3
@@ -97,6 +101,7 @@ class CenterOfMass:
 
 		self.COMObject = None
 		self.CachedSelectedObjects = None
+		self.floatFieldBalanceThreshold = None
 
 		# self.layoutSetup = None
 		# self.layoutWeights = None
@@ -124,6 +129,11 @@ class CenterOfMass:
 		cmds.button(label = "YZ", command = partial(self.COMFloorProjection, "x"), backgroundColor = Colors.red10, annotation = CenterOfMassAnnotations.projectorYZ)
 		cmds.button(label = "XZ", command = partial(self.COMFloorProjection, "y"), backgroundColor = Colors.green10, annotation = CenterOfMassAnnotations.projectorXZ)
 		cmds.button(label = "XY", command = partial(self.COMFloorProjection, "z"), backgroundColor = Colors.blue10, annotation = CenterOfMassAnnotations.projectorXY)
+
+		cmds.rowLayout(parent = layoutColumn, numberOfColumns = 3, columnWidth3 = (110, 60, 60), columnAlign = [(1, "right"), (2, "center"), (3, "center")], columnAttach = [(1, "both", 0), (2, "both", 0), (3, "both", 0)])
+		cmds.text(label = "Balance threshold")
+		self.floatFieldBalanceThreshold = cmds.floatField(value = 5, minValue = 0, precision = 1, annotation = CenterOfMassAnnotations.balanceThreshold)
+		cmds.button(label = "Analyze", command = self.COMBalanceAnalysis, backgroundColor = Colors.yellow10, annotation = CenterOfMassAnnotations.balanceAnalyze)
 	def UILayoutWeights(self, layoutMain):
 		cmds.frameLayout(parent = layoutMain, label = Settings.frames2Prefix + "WEIGHTS", collapsable = True, backgroundColor = Settings.frames2Color, marginWidth = 0, marginHeight = 0, borderVisible = True)
 		layoutColumn = cmds.columnLayout(adjustableColumn = True, rowSpacing = Settings.columnLayoutRowSpacing)
@@ -131,6 +141,7 @@ class CenterOfMass:
 		countCells1 = 1
 		cmds.gridLayout(parent = layoutColumn, numberOfColumns = countCells1, cellWidth = Settings.windowWidthMargin / countCells1, cellHeight = Settings.lineHeight)
 		cmds.button(label = "Disconnect From Center Of Mass", command = self.COMDisconnectTargets, backgroundColor = Colors.red10, annotation = CenterOfMassAnnotations.disconnectTargets)
+		cmds.button(label = "Auto Weights From Skinned Meshes", command = self.COMAutoWeights, backgroundColor = Colors.blue10, annotation = CenterOfMassAnnotations.weightsAuto)
 		
 		def PartButton(partInfo = ("", 0), minMaxValue = CenterOfMassSettings.weightMinMax, onlyValue = False, annotation = ""):
 			value = partInfo[1]
@@ -188,6 +199,13 @@ class CenterOfMass:
 		cmds.button(label = "Bake Back", command = self.BakeCached, backgroundColor = Colors.orange50, annotation = CenterOfMassAnnotations.bakeOriginal)
 		cmds.button(label = "Select Root", command = self.SelectParent, backgroundColor = Colors.lightBlue10, annotation = CenterOfMassAnnotations.selectRoot)
 
+		countCells = 1
+		cmds.gridLayout(parent = layoutColumn, numberOfColumns = countCells, cellWidth = Settings.windowWidthMargin / countCells, cellHeight = Settings.lineHeight)
+		cmds.button(label = "Bake Center Of Mass", command = self.COMBakeOffline, backgroundColor = Colors.yellow10, annotation = CenterOfMassAnnotations.bakeOffline)
+		cmds.popupMenu()
+		cmds.menuItem(label = "Bake All Registered", command = self.COMBakeAll)
+		cmds.menuItem(label = "Select All Registered", command = self.COMSelectAll)
+
 
 	### CENTER OF MASS
 	def COMObjectCheck(self, *args):
@@ -212,6 +230,7 @@ class CenterOfMass:
 		cmds.setAttr(self.COMObject + ".drawLabel", 1)
 		cmds.setAttr(self.COMObject + ".type", 18)
 		cmds.setAttr(self.COMObject + ".otherType", "Center Of Mass", type = "string")
+		CenterOfMassEngine.Register(self.COMObject)
 		cmds.select(self.COMObject)
 	def COMActivate(self, *args):
 		# Check selected objects
@@ -219,6 +238,8 @@ class CenterOfMass:
 		if selectedList is None:
 			return
 		self.COMObject = selectedList[0]
+		if (not CenterOfMassEngine.UpgradeLegacy(self.COMObject)):
+			cmds.warning("{0} is not a center of mass rig, it is skipped by Bake All and segment reevaluation".format(self.COMObject))
 	def COMSelect(self, *args):
 		if (self.COMObjectCheck()):
 			cmds.select(self.COMObject)
@@ -254,6 +275,24 @@ class CenterOfMass:
 		cmds.parent(joint1, projection)
 
 		cmds.select(clear = True)
+	def COMBalanceAnalysis(self, *args):
+		if not self.COMObjectCheck():
+			return
+		
+		# Check selected objects
+		selectedList = Selector.MultipleObjects(minimalCount = 1)
+		if selectedList is None:
+			return
+		
+		threshold = cmds.floatField(self.floatFieldBalanceThreshold, query = True, value = True)
+		ranges = CenterOfMassEngine.AnalyzeBalanceForObject(self.COMObject, selectedList, skipAxis = "y", heightThreshold = threshold)
+		if ranges is None:
+			return
+		if (len(ranges) == 0):
+			print("Center of mass is balanced on the whole time range")
+		for start, end in ranges:
+			print("Unbalanced frames: {0} - {1}".format(start, end))
+		cmds.select(self.COMObject)
 	def COMConstrainToSelected(self, weight, *args):
 		if not self.COMObjectCheck():
 			return
@@ -268,6 +307,44 @@ class CenterOfMass:
 		finalList.append(selectedList)
 
 		Constraints.ConstrainListToLastElement(selected = finalList, maintainOffset = False, parent = False, point = True, weight = weight)
+		CenterOfMassEngine.StoreSegments(self.COMObject)
+	def COMBakeOffline(self, *args):
+		if not self.COMObjectCheck():
+			return
+		result = CenterOfMassEngine.EvaluateForObject(self.COMObject)
+		if (result == None):
+			return
+		times, trajectory = result
+		CenterOfMassEngine.BakeToObject(self.COMObject, times, trajectory[0])
+		cmds.select(self.COMObject)
+	def COMBakeAll(self, *args):
+		baked = CenterOfMassEngine.BakeAll()
+		if not baked:
+			cmds.warning("No registered center of mass objects with segments found")
+			return
+		cmds.select(baked, replace = True)
+	def COMSelectAll(self, *args):
+		registered = CenterOfMassEngine.GetRegistered()
+		if (len(registered) == 0):
+			cmds.warning("No registered center of mass objects found")
+			return
+		cmds.select(registered, replace = True)
+	def COMAutoWeights(self, *args):
+		if not self.COMObjectCheck():
+			return
+		
+		# Check selected objects
+		selectedList = Selector.MultipleObjects(minimalCount = 1)
+		if selectedList is None:
+			return
+		
+		percentages = CenterOfMassEngine.AnalyzeSkinnedMeshes(selectedList)
+		if percentages is None:
+			cmds.warning("No skinned meshes with volume detected in selected objects")
+			return
+		CenterOfMassEngine.AssignWeights(self.COMObject, percentages)
+		CenterOfMassEngine.StoreSegments(self.COMObject)
+		cmds.select(self.COMObject)
 	def COMDisconnectTargets(self, *args):
 		if (self.COMObject is None or not cmds.objExists(self.COMObject)):
 			cmds.warning("Center Of Mass object is not connected to script. Please select Center Of Mass object and press Activate button before")
@@ -279,6 +356,7 @@ class CenterOfMass:
 		
 		selectedList.append(self.COMObject)
 		Constraints.DisconnectTargetsFromConstraint(selectedList)
+		CenterOfMassEngine.StoreSegments(self.COMObject)
 		cmds.select(selectedList[:-1], replace = True)
 
 
@@ -295,7 +373,7 @@ class CenterOfMass:
 			cmds.select(clear = True)
 			return
 
-		self.CachedSelectedObjects = Locators.CreateAndBakeAsChildrenFromLastSelected(euler = self.optionsPlugin.menuCheckboxEulerFilter.Get())
+		self.CachedSelectedObjects = Locators.CreateAndBakeInSpace(selectedList[:-1], selectedList[-1], euler = self.optionsPlugin.menuCheckboxEulerFilter.Get())
 		return self.CachedSelectedObjects
 	def BakeScenario3(self, *args):
 		objects = self.BakeScenario2()
@@ -310,9 +388,9 @@ class CenterOfMass:
 			cmds.warning("No cached objects yet, operation cancelled")
 			return
 		
-		cmds.select(self.CachedSelectedObjects[0][0:-1])
-		Baker.BakeSelected(euler = self.optionsPlugin.menuCheckboxEulerFilter.Get())
+		Locators.BakeBackFromLocators(self.CachedSelectedObjects[0][0:-1], self.CachedSelectedObjects[1][0:-1], euler = self.optionsPlugin.menuCheckboxEulerFilter.Get())
 		cmds.delete(self.CachedSelectedObjects[1][-1])
+		cmds.select(self.CachedSelectedObjects[0][0:-1])
 	
 	def LinkCached(self, maintainOffset=False, *args):
 		if self.CachedSelectedObjects is None:
@@ -431,6 +431,7 @@ class GeneralWindow:
 		cmds.menuItem(dividerLabel = "MOTION TRAIL", divider = True)
 		cmds.menuItem(subMenu = True, label = "Motion Trail", tearOff = True, image = Icons.motionTrail)
 		cmds.menuItem(label = "Create", command = partial(Install.ToShelf_MotionTrailCreate, self.optionsPlugin.directory), image = Icons.plus)
+		cmds.menuItem(label = "Update", command = partial(Install.ToShelf_MotionTrailUpdate, self.optionsPlugin.directory), image = Icons.reset)
 		cmds.menuItem(label = "Select", command = partial(Install.ToShelf_MotionTrailSelect, self.optionsPlugin.directory), image = Icons.cursor)
 		cmds.menuItem(label = "Delete", command = partial(Install.ToShelf_MotionTrailDelete, self.optionsPlugin.directory), image = Icons.minus)
 		cmds.setParent('..', menu = True)
@@ -457,9 +458,10 @@ class GeneralWindow:
 				
 		self.frameMotionTrail = cmds.frameLayout(parent = parentLayout, label = "6. " + titleMT, collapsable = True, backgroundColor = Settings.frames1Color, width = Settings.windowWidth, marginWidth = Settings.marginWidth, marginHeight = Settings.marginHeight)
 		
-		countOffsets = 3
+		countOffsets = 4
 		cmds.gridLayout(parent = self.frameMotionTrail, numberOfColumns = countOffsets, cellWidth = Settings.windowWidthMargin / countOffsets, cellHeight = Settings.lineHeight)
 		cmds.button(label = "Create", command = MotionTrail.Create, backgroundColor = Colors.orange10)
+		cmds.button(label = "Update", command = MotionTrail.Update, backgroundColor = Colors.orange50)
 		cmds.button(label = "Select All", command = MotionTrail.Select, backgroundColor = Colors.orange50)
 		cmds.button(label = "Delete All", command = MotionTrail.Delete, backgroundColor = Colors.orange100)
 		# cmds.popupMenu()
@@ -488,9 +490,15 @@ class GeneralWindow:
 	def WindowDelete(self, *args):
 		if self.WindowCheck():
 			cmds.deleteUI(Settings.windowName)
+			self.CallbacksRemove()
 			print("Window deleted")
 		else:
 			print("No Window")
+	def CallbacksRemove(self, *args):
+		# Scene callbacks of cached queries are registered again on the next query
+		MotionTrail.RemoveTrailCallbacks()
+		Selector.RemoveHierarchyCallbacks()
+		Skinning.RemoveIndexCallbacks()
 	def FramesCollapse(self, value, *args): # TODO collapse function for sub frames
 		if self.frameTransformations is not None:
 			cmds.frameLayout(self.frameTransformations, edit = True, collapse = value)
@@ -515,6 +523,7 @@ class GeneralWindow:
 	def DockDelete(self, *args):
 		if self.DockCheck():
 			cmds.deleteUI(Settings.dockName, control = True)
+			self.CallbacksRemove()
 			# print("Dock Control deleted")
 		# else:
 		# 	print("No Dock")
@@ -35,6 +35,7 @@ from ..utils import Constraints
 from ..utils import File
 from ..utils import Layers
 from ..utils import MayaSettings
+from ..utils import Sampler
 from ..utils import Selector
 from ..utils import Text
 from ..utils import Timeline
@@ -688,8 +689,11 @@ class Overlappy:
 	
 
 	### SETTINGS
-	def RefreshParticlePosition(self, *args): # TODO rework particle offset logic and add refresh method
-		currentPosition = cmds.xform(self.selectedObjects[0], query = True, translation = True, worldSpace = True)
+	def RefreshParticlePosition(self, time=None, *args): # TODO rework particle offset logic and add refresh method
+		if (time == None):
+			currentPosition = cmds.xform(self.selectedObjects[0], query = True, translation = True, worldSpace = True)
+		else:
+			currentPosition = Sampler.SamplePositions([self.selectedObjects[0]], [time])[self.selectedObjects[0]][0]
 		offset = [currentPosition[0] - self.selectedObjectsStartPosition[0], currentPosition[1] - self.selectedObjectsStartPosition[1], currentPosition[2] - self.selectedObjectsStartPosition[2]]
 
 		if (cmds.objExists(self.particleBase)):
@@ -1025,8 +1029,7 @@ class Overlappy:
 		if self.menuCheckboxLoop.Get():
 			startTime = self.time.values[2] - self.time.values[3] * self.GetLoopCyclesIndex()
 			self.time.SetMin(startTime)
-			self.time.SetCurrent(startTime)
-			self.RefreshParticlePosition()
+			self.RefreshParticlePosition(startTime)
 		cmds.setAttr(self.nucleus1 + ".startFrame", startTime)
 		if cmds.objExists(self.nucleus2):
 			cmds.setAttr(self.nucleus2 + ".startFrame", startTime)
@@ -1112,7 +1115,7 @@ class Overlappy:
 		### Cache initial position for the first selected object
 		self.time.Scan()
 		self.time.Reset()
-		self.selectedObjectsStartPosition = cmds.xform(self.selectedObjects[0], query = True, translation = True, worldSpace = True)
+		self.selectedObjectsStartPosition = Sampler.SamplePositions([self.selectedObjects[0]], [self.time.values[2]])[self.selectedObjects[0]][0]
 
 		### Run baking process
 		if (variant == 0 or self.selectedObjects is None):
@@ -1122,7 +1125,7 @@ class Overlappy:
 		else:
 			### Check hierarchy and get objects
 			if (self.menuCheckboxHierarchy.Get()):
-				self.selectedObjects = Selector.SelectHierarchyTransforms()
+				self.selectedObjects = Selector.GetHierarchyOrdered(self.selectedObjects, useCache = True)
 			### Bake
 			for i in range(len(self.selectedObjects)):
 				cmds.select(self.selectedObjects[i], replace = True)
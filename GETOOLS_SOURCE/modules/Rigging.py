@@ -28,6 +28,7 @@ from .. import Settings
 from ..utils import Blendshapes
 from ..utils import Colors
 from ..utils import Constraints
+from ..utils import ConstraintsPreview
 from ..utils import Create
 from ..utils import Curves
 from ..utils import Deformers
@@ -40,6 +41,7 @@ class RiggingAnnotations:
 	_textAllSelectedConstrainToLast = "All selected objects will be constrained to last selected object"
 	constraintReverse = "Reverse the direction of operation from last to first selected"
 	constraintMaintain = "Use maintain offset"
+	constraintPreview = "Don't create constraints, create ghost locators with baked constraint result instead"
 	constraintOffset = "[IN DEVELOPMENT]\nAdd extra locators structure with ability to make offset animation"
 	constraintParent = "Parent constrain.\n{allToLast}".format(allToLast = _textAllSelectedConstrainToLast)
 	constraintPoint = "Point constrain.\n{allToLast}".format(allToLast = _textAllSelectedConstrainToLast)
@@ -59,7 +61,9 @@ class RiggingAnnotations:
 	_jointDrawStyle = "selected joints draw style"
 	jointDrawStyleBone = "Bone {0}".format(_jointDrawStyle)
 	jointDrawStyleHidden = "Hidden {0}".format(_jointDrawStyle)
-	copySkinWeights = "Copy skin weights from last selected object to all other selected objects"
+	saveSkinWeights = "Save skin weights of the last selected mesh to a file.\nOnly nonzero weights are stored together with influence names."
+	loadSkinWeights = "Load skin weights from a file to all selected meshes with the same vertex count.\nInfluences are matched by name, missing influences are added to the skin cluster."
+	copySkinWeights = "Copy skin weights from last selected object to all other selected objects.\nWeights are taken from the closest point on the source surface.\nInfluences are matched by name, missing source influences are added to the target skin cluster.\nMax influences of the target skin cluster are respected when it maintains them."
 
 	### Deformers
 	wrapsCreate = "Create a wrap deformer on selected objects.\nThe last object used as a source deformation object."
@@ -69,7 +73,7 @@ class RiggingAnnotations:
 
 	### Curves
 	curveCreateFromSelectedObjects = "Create a curve from selected objects.\nEach curve point will be created in the pivot."
-	curveCreateFromTrajectory = "***DRAFT***\nCreate a curve from objects trajectories."
+	curveCreateFromTrajectory = "Create a curve from each selected object trajectory in the playback range.\nRight-click to create curves with reduced points."
 
 class Rigging:
 	_version = "v1.6"
@@ -86,6 +90,7 @@ class Rigging:
 		
 		self.checkboxConstraintReverse = None
 		self.checkboxConstraintMaintain = None
+		self.checkboxConstraintPreview = None
 		# self.checkboxConstraintOffset = None
 
 		self.intFieldPolygonWithLocatorsPoints = None
@@ -130,7 +135,7 @@ class Rigging:
 		self.checkboxConstraintReverse = cmds.checkBox(label = "Reverse", value = False, annotation = RiggingAnnotations.constraintReverse)
 		self.checkboxConstraintMaintain = cmds.checkBox(label = "Maintain", value = False, annotation = RiggingAnnotations.constraintMaintain)
 		# self.checkboxConstraintOffset = UI.Checkbox(label = "**Offset", value = False, annotation = RiggingAnnotations.constraintOffset)
-		cmds.separator(style = "none")
+		self.checkboxConstraintPreview = cmds.checkBox(label = "Preview", value = False, annotation = RiggingAnnotations.constraintPreview)
 		
 		countOffsets = 4
 		cmds.gridLayout(parent = layoutColumn, numberOfColumns = countOffsets, cellWidth = Settings.windowWidthMargin / countOffsets, cellHeight = Settings.lineHeight)
@@ -168,6 +173,11 @@ class Rigging:
 		countOffsets = 1
 		cmds.gridLayout(parent = layoutColumn, numberOfColumns = countOffsets, cellWidth = Settings.windowWidthMargin / countOffsets, cellHeight = Settings.lineHeight)
 		cmds.button(label = "Copy Skin Weights From Last Selected", command = Skinning.CopySkinWeightsFromLastMesh, backgroundColor = Colors.blue10, annotation = RiggingAnnotations.copySkinWeights)
+		
+		countOffsets = 2
+		cmds.gridLayout(parent = layoutColumn, numberOfColumns = countOffsets, cellWidth = Settings.windowWidthMargin / countOffsets, cellHeight = Settings.lineHeight)
+		cmds.button(label = "Save Skin Weights", command = Skinning.SaveSkinWeightsDialog, backgroundColor = Colors.blue50, annotation = RiggingAnnotations.saveSkinWeights)
+		cmds.button(label = "Load Skin Weights", command = Skinning.LoadSkinWeightsDialog, backgroundColor = Colors.blue50, annotation = RiggingAnnotations.loadSkinWeights)
 	def UILayoutBlendshapes(self, layoutMain):
 		cmds.frameLayout(parent = layoutMain, label = Settings.frames2Prefix + "BLENDSHAPES", collapsable = True, backgroundColor = Settings.frames2Color, highlightColor = Colors.green100, marginWidth = 0, marginHeight = 0, borderVisible = True)
 		layoutColumn = cmds.columnLayout(adjustableColumn = True, rowSpacing = Settings.columnLayoutRowSpacing)
@@ -190,23 +200,32 @@ class Rigging:
 		cmds.gridLayout(parent = layoutColumn, numberOfColumns = countOffsets, cellWidth = Settings.windowWidthMargin / countOffsets, cellHeight = Settings.lineHeight)
 		cmds.button(label = "From Selected Objects", command = Curves.CreateCurveFromSelectedObjects, backgroundColor = Colors.blue10, annotation = RiggingAnnotations.curveCreateFromSelectedObjects)
 		cmds.button(label = "From Trajectory", command = Curves.CreateCurveFromTrajectory, backgroundColor = Colors.orange10, annotation = RiggingAnnotations.curveCreateFromTrajectory)
+		cmds.popupMenu()
+		cmds.menuItem(label = "Reduced Points", command = Curves.CreateCurveFromTrajectoryReduced)
 
 	### CONSTRAINTS
 	def GetCheckboxConstraintReverse(self):
 		return cmds.checkBox(self.checkboxConstraintReverse, query = True, value = True)
 	def GetCheckboxConstraintMaintain(self):
 		return cmds.checkBox(self.checkboxConstraintMaintain, query = True, value = True)
+	def GetCheckboxConstraintPreview(self):
+		return cmds.checkBox(self.checkboxConstraintPreview, query = True, value = True)
+	def Constrain(self, parent=False, point=False, orient=False, scale=False, aim=False):
+		if (self.GetCheckboxConstraintPreview()):
+			ConstraintsPreview.PreviewSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = parent, point = point, orient = orient, scale = scale, aim = aim)
+		else:
+			Constraints.ConstrainSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = parent, point = point, orient = orient, scale = scale, aim = aim)
 
 	def ConstrainParent(self, *args):
-		Constraints.ConstrainSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = True, point = False, orient = False, scale = False, aim = False)
+		self.Constrain(parent = True)
 	def ConstrainPoint(self, *args):
-		Constraints.ConstrainSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = False, point = True, orient = False, scale = False, aim = False)
+		self.Constrain(point = True)
 	def ConstrainOrient(self, *args):
-		Constraints.ConstrainSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = False, point = False, orient = True, scale = False, aim = False)
+		self.Constrain(orient = True)
 	def ConstrainScale(self, *args):
-		Constraints.ConstrainSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = False, point = False, orient = False, scale = True, aim = False)
+		self.Constrain(scale = True)
 	def ConstrainAim(self, *args): # TODO
-		Constraints.ConstrainSelectedToLastObject(reverse = self.GetCheckboxConstraintReverse(), maintainOffset = self.GetCheckboxConstraintMaintain(), parent = False, point = False, orient = False, scale = False, aim = True)
+		self.Constrain(aim = True)
 
 	### MESH
 	def CreatePolygonWithLocators(self, *args):
@@ -64,11 +64,11 @@ class ToolsAnnotations:
 	locatorsRelative = "{bake}\nThe last locator becomes the parent of other locators".format(bake = locatorsBake)
 	locatorsRelativeReverse = "{relative}\n{reverse}\nRight click allows you to bake the same operation but with constrained last object.".format(relative = locatorsRelative, reverse = _reverseConstraint)
 	#
-	chainDistribution = "Create a chain with distributed rotation. Use the last locator to animate.\nWorks better with 3 selected objects.\nIf you select 4+ objects, the original animation will not be fully preserved.\n\nRight-click to use the alternate mode to preserve 100% of the original animation with any number of selected objects.\nIt is not as convenient to use as the default mode."
+	chainDistribution = "Create a chain with distributed rotation. Use the last locator to animate.\nWorks better with 3 selected objects.\nSelect only the root to use its chain of first children.\nIf you select 4+ objects, the original animation will not be fully preserved.\n\nRight-click to use the alternate mode to preserve 100% of the original animation with any number of selected objects.\nIt is not as convenient to use as the default mode.\nBake Distribution replaces the live alternative mode distribution with keys evaluated by quaternions, select the last locator first."
 	
 	# locatorAimSpace = "Locator Aim distance from original object. Need to use non-zero value"
 	locatorAimSpace = "Aim Space offset from original object.\nNeed to use non-zero value to get best result"
-	locatorAimSpaceBakeAll = "Create Aim Space locators for selected objects.\nOriginal object will be constrained back to locator."
+	locatorAimSpaceBakeAll = "Create Aim Space locators for selected objects.\nOriginal object will be constrained back to locator.\n\nRight-click to bake only the locator, target and up trajectories without aim groups and constraints."
 	locatorAimSpaceBakeRotate = "{0}\n{1}".format(_onlyForRotation, locatorAimSpaceBakeAll)
 
 	### Bake
@@ -105,6 +105,8 @@ class ToolsAnnotations:
 	desyncSetValue = "Set predefined step value"
 	desyncIncrementValue = "Increment step value by 1"
 	desyncValue = "Step value for animation desync"
+	desyncDistribution = "How offsets are distributed between selected objects.\nList uses selection order, Random uses a fixed seed, Distance uses distance from the center of the selected objects, Depth uses hierarchy depth.\nObjects with the same offset are moved together."
+	desyncCycle = "Keep looping animation inside the playback range.\nKeys pushed past the end of the range wrap around to the start."
 
 class ToolsSettings:
 	locatorSize = 10
@@ -113,6 +115,10 @@ class ToolsSettings:
 	aimSpaceOffsetValue = 100
 	aimSpaceRadioButtonDefault = 0
 
+	### Desync
+	desyncDistributions = ("linear", "random", "distance", "depth")
+	desyncDistributionLabels = ("List", "Random", "Distance", "Depth")
+
 class Tools:
 	_version = "v1.5"
 	_name = "TOOLS"
@@ -135,6 +141,8 @@ class Tools:
 		self.aimSpaceCheckbox = None
 		### Desync
 		self.desyncFloatField = None
+		self.desyncRadioButtons = [None, None, None, None]
+		self.desyncCycleCheckbox = None
 
 		self.bakingSamplesValue = None
 
@@ -219,6 +227,13 @@ class Tools:
 		cmds.button(label = "Chain Distribution", command = partial(self.CreateChainDistributionRig, 1), backgroundColor = Colors.purple10, annotation = ToolsAnnotations.chainDistribution)
 		cmds.popupMenu()
 		cmds.menuItem(label = "Alternative Mode", command = partial(self.CreateChainDistributionRig, 2))
+		cmds.menuItem(divider = True)
+		cmds.menuItem(label = "Bake Distribution", subMenu = True)
+		cmds.menuItem(label = "Linear", command = partial(self.BakeChainDistribution, "linear"))
+		cmds.menuItem(label = "Ease In", command = partial(self.BakeChainDistribution, "easeIn"))
+		cmds.menuItem(label = "Ease Out", command = partial(self.BakeChainDistribution, "easeOut"))
+		cmds.menuItem(label = "Smooth", command = partial(self.BakeChainDistribution, "smooth"))
+		cmds.setParent("..", menu = True)
 		# cmds.setParent("..")
 
 		### AIM SPACE SWITCHING
@@ -237,8 +252,12 @@ class Tools:
 		#
 		cmds.rowLayout(parent = layoutAimSpace, adjustableColumn = 1, numberOfColumns = 3, columnWidth3 = (30, 105, 105), columnAlign = [(1, "right"), (2, "center"), (3, "center")], columnAttach = [(1, "both", 0), (2, "both", 0), (3, "both", 0)])
 		cmds.text(label = "Create ")
-		cmds.button(label = "Translate + Rotate", command = partial(self.LocatorsBakeAim, False), backgroundColor = Colors.orange10, annotation = ToolsAnnotations.locatorAimSpaceBakeAll)
-		cmds.button(label = "Only Rotate", command = partial(self.LocatorsBakeAim, True), backgroundColor = Colors.orange10, annotation = ToolsAnnotations.locatorAimSpaceBakeRotate)
+		cmds.button(label = "Translate + Rotate", command = partial(self.LocatorsBakeAim, False, True), backgroundColor = Colors.orange10, annotation = ToolsAnnotations.locatorAimSpaceBakeAll)
+		cmds.popupMenu()
+		cmds.menuItem(label = "Trajectories Only", command = partial(self.LocatorsBakeAim, False, False))
+		cmds.button(label = "Only Rotate", command = partial(self.LocatorsBakeAim, True, True), backgroundColor = Colors.orange10, annotation = ToolsAnnotations.locatorAimSpaceBakeRotate)
+		cmds.popupMenu()
+		cmds.menuItem(label = "Trajectories Only", command = partial(self.LocatorsBakeAim, True, False))
 		# cmds.setParent("..")
 	def UILayoutBaking(self, layoutMain):
 		cmds.frameLayout(parent = layoutMain, label = Settings.frames2Prefix + "BAKING", collapsable = True, backgroundColor = Settings.frames2Color, highlightColor = Colors.green100, marginWidth = 0, marginHeight = 0, borderVisible = True)
@@ -296,8 +315,9 @@ class Tools:
 		#
 
 		### Desync
-		cmds.frameLayout(parent = layoutColumn, label = "Desync", labelIndent = 110, collapsable = False, backgroundColor = Settings.frames2Color, marginWidth = 0, marginHeight = 0)
-		rowLayout = cmds.rowLayout(adjustableColumn = 2, numberOfColumns = 4, columnWidth4 = (120, 30, 30, 70), columnAlign = [(1, "center"), (2, "center"), (3, "right"), (4, "center")], columnAttach = [(1, "both", 0), (2, "both", 0), (3, "both", 0), (4, "both", 0)])
+		layoutDesync = cmds.frameLayout(parent = layoutColumn, label = "Desync", labelIndent = 110, collapsable = False, backgroundColor = Settings.frames2Color, marginWidth = 0, marginHeight = 0)
+		layoutDesync = cmds.columnLayout(parent = layoutDesync, adjustableColumn = True)
+		rowLayout = cmds.rowLayout(parent = layoutDesync, adjustableColumn = 2, numberOfColumns = 4, columnWidth4 = (120, 30, 30, 70), columnAlign = [(1, "center"), (2, "center"), (3, "right"), (4, "center")], columnAttach = [(1, "both", 0), (2, "both", 0), (3, "both", 0), (4, "both", 0)])
 		# 1
 		cmds.gridLayout(parent = rowLayout, numberOfColumns = 6, cellWidth = 20, cellHeight = Settings.lineHeight)
 		cmds.button(label = "0.1", command = partial(self.AnimationOffsetSetValue, 0.1), backgroundColor = Colors.blackWhite90, annotation = ToolsAnnotations.desyncSetValue)
@@ -314,6 +334,14 @@ class Tools:
 		cmds.gridLayout(parent = rowLayout, numberOfColumns = 2, cellWidth = 35, cellHeight = Settings.lineHeight)
 		cmds.button(label = "Left", command = self.AnimationOffsetMoveLeft, backgroundColor = Colors.red50, annotation = ToolsAnnotations.desync)
 		cmds.button(label = "Right", command = self.AnimationOffsetMoveRight, backgroundColor = Colors.green50, annotation = ToolsAnnotations.desync)
+		#
+		cmds.rowLayout(parent = layoutDesync, adjustableColumn = 1, numberOfColumns = 6, columnWidth6 = (40, 45, 45, 50, 45, 50), columnAlign = [1, "right"], columnAttach = [(1, "both", 0)])
+		cmds.text(label = "Order ", annotation = ToolsAnnotations.desyncDistribution)
+		cmds.radioCollection()
+		for i in range(len(ToolsSettings.desyncDistributions)):
+			self.desyncRadioButtons[i] = cmds.radioButton(label = ToolsSettings.desyncDistributionLabels[i], annotation = ToolsAnnotations.desyncDistribution)
+		self.desyncCycleCheckbox = cmds.checkBox(label = "Cycle", value = False, annotation = ToolsAnnotations.desyncCycle)
+		cmds.radioButton(self.desyncRadioButtons[0], edit = True, select = True)
 	def UILayoutTimeline(self, layoutMain):
 		cmds.frameLayout(parent = layoutMain, label = Settings.frames2Prefix + "TIMELINE", collapsable = True, backgroundColor = Settings.frames2Color, highlightColor = Colors.green100, marginWidth = 0, marginHeight = 0, borderVisible = True)
 		layoutColumn = cmds.columnLayout(adjustableColumn = True, rowSpacing = Settings.columnLayoutRowSpacing)
@@ -338,11 +366,7 @@ class Tools:
 		if (selectedList == None):
 			return None
 
-		values = []
-		for item in selectedList:
-			shape = cmds.listRelatives(item, shapes = True, type = Enums.Types.locator)[0]
-			if (shape != None):
-				values.append(Locators.GetSize(item))
+		values = Locators.GetSizes(Locators.GetLocatorShapes(selectedList))
 		
 		count = len(values)
 		if (count == 0):
@@ -388,7 +412,7 @@ class Tools:
 	def LocatorsRelativeReverse(self, *args):
 		Locators.CreateAndBakeAsChildrenFromLastSelected(scale = self.GetFloatLocatorSize(), hideParent = self.GetCheckboxLocatorHideParent(), subLocator = self.GetCheckboxLocatorSubLocator(), constraintReverse = True, skipLastReverse = False, euler = self.optionsPlugin.menuCheckboxEulerFilter.Get())
 	
-	def LocatorsBakeAim(self, rotateOnly=False, *args):
+	def LocatorsBakeAim(self, rotateOnly=False, live=True, *args):
 		scale = self.GetFloatLocatorSize()
 		distance = cmds.floatField(self.aimSpaceFloatField, query = True, value = True)
 		hideParent = self.GetCheckboxLocatorHideParent()
@@ -404,7 +428,7 @@ class Tools:
 		if (cmds.radioButton(self.aimSpaceRadioButtons[2], query = True, select = True)):
 			axisVector = [0, 0, valueAimTarget]
 
-		Locators.CreateOnSelectedAim(scale = scale, hideParent = hideParent, subLocator = subLocators, rotateOnly = rotateOnly, vectorAim = axisVector, distance = distance, reverse = True, euler = self.optionsPlugin.menuCheckboxEulerFilter.Get())
+		Locators.CreateOnSelectedAim(scale = scale, hideParent = hideParent, subLocator = subLocators, rotateOnly = rotateOnly, vectorAim = axisVector, distance = distance, reverse = True, euler = self.optionsPlugin.menuCheckboxEulerFilter.Get(), live = live)
 
 		if (distance == 0):
 			cmds.warning("Aim distance is 0. Highly recommended to use non-zero value.")
@@ -415,6 +439,8 @@ class Tools:
 			ChainDistributionRig.CreateRigVariant1(locatorSize = self.GetFloatLocatorSize())
 		if mode == 2:
 			ChainDistributionRig.CreateRigVariant2(locatorSize = self.GetFloatLocatorSize())
+	def BakeChainDistribution(self, falloff="linear", *args):
+		ChainDistributionRig.BakeDistribution(falloff = falloff)
 
 
 	### BAKING
@@ -507,5 +533,10 @@ class Tools:
 	def AnimationOffsetMoveRight(self, *args):
 		self.AnimationOffsetMove(direction = 1)
 	def AnimationOffset(self, direction=1, step=1, *args):
-		Animation.OffsetSelected(direction, step)
+		distribution = ToolsSettings.desyncDistributions[0]
+		for i in range(len(self.desyncRadioButtons)):
+			if (cmds.radioButton(self.desyncRadioButtons[i], query = True, select = True)):
+				distribution = ToolsSettings.desyncDistributions[i]
+		cycle = cmds.checkBox(self.desyncCycleCheckbox, query = True, value = True)
+		Animation.OffsetSelected(direction, step, distribution = distribution, cycle = cycle)
 
@@ -0,0 +1,86 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+# Undoable skin weights command, loaded by Skinning.SetSkinWeights
+# Weights are staged by Skinning because a whole mesh of weights does not fit command flags
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+
+
+commandName = "gtSetSkinWeights"
+
+
+def maya_useNewAPI():
+	pass
+
+
+class SetSkinWeightsCommand(om.MPxCommand):
+	# All weights are written with one setWeights call, old weights are kept for undo
+	def __init__(self):
+		om.MPxCommand.__init__(self)
+		self.shapePath = None
+		self.skinFn = None
+		self.components = None
+		self.influences = None
+		self.weights = None
+		self.weightsOld = None
+	
+	@staticmethod
+	def creator():
+		return SetSkinWeightsCommand()
+	
+	def isUndoable(self):
+		return True
+	
+	def doIt(self, args):
+		from GETOOLS_SOURCE.utils import Skinning
+		staged = Skinning.PopStagedWeights()
+		if (staged == None):
+			raise RuntimeError("{0} has no staged weights, use Skinning.SetSkinWeights".format(commandName))
+		cluster, mesh, weights, influenceCount = staged
+		
+		selection = om.MSelectionList()
+		selection.add(cluster)
+		selection.add(mesh)
+		self.skinFn = oma.MFnSkinCluster(selection.getDependNode(0))
+		self.shapePath = selection.getDagPath(1).extendToShape()
+		componentFn = om.MFnSingleIndexedComponent()
+		self.components = componentFn.create(om.MFn.kMeshVertComponent)
+		componentFn.setCompleteData(len(weights) // influenceCount if influenceCount > 0 else 0)
+		self.influences = om.MIntArray(list(range(influenceCount)))
+		self.weights = om.MDoubleArray(weights)
+		self.weightsOld = self.skinFn.setWeights(self.shapePath, self.components, self.influences, self.weights, False, True)
+	
+	def redoIt(self):
+		self.skinFn.setWeights(self.shapePath, self.components, self.influences, self.weights, False)
+	
+	def undoIt(self):
+		self.skinFn.setWeights(self.shapePath, self.components, self.influences, self.weightsOld, False)
+
+
+def initializePlugin(plugin):
+	om.MFnPlugin(plugin, "GenEugene").registerCommand(commandName, SetSkinWeightsCommand.creator)
+
+def uninitializePlugin(plugin):
+	om.MFnPlugin(plugin).deregisterCommand(commandName)
@@ -21,14 +21,23 @@
 # Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
 # Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
 
+import math
+import random
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 
 from ..utils import Attributes
+from ..utils import Matrices
 from ..utils import Selector
 from ..utils import Timeline
+from ..values import Enums
 
 
+_timeCurveTypes = ("animCurveTL", "animCurveTA", "animCurveTU", "animCurveTT")
+_staticTolerances = {"animCurveTL": 0.0001, "animCurveTA": 0.001, "animCurveTU": 0.0001} # translate in scene units, rotate in degrees, others in attribute units
+
 def DeleteKeys(channelBox=False, *args):
 	if (Selector.MultipleObjects(1) == None):
 		return
@@ -36,7 +45,8 @@ def DeleteKeys(channelBox=False, *args):
 	# Calculate time range if range highlighted
 	timeRange = [None, None]
 	if (Timeline.CheckHighlighting()):
-		timeRange = [Timeline.GetSelectedTimeRange()[0], Timeline.GetSelectedTimeRange()[1] - 1]
+		rangeSelected = Timeline.GetSelectedTimeRange()
+		timeRange = [rangeSelected[0], rangeSelected[1] - 1]
 
 	# Check channel box attributes
 	selectedAttributes = Attributes.GetAttributesSelectedFromChannelBox()
@@ -55,29 +65,131 @@ def DeleteKeysNonkeyable(*args):
 	selectedList = Selector.MultipleObjects(1)
 	if (selectedList == None):
 		return
+	return DeleteKeysNonkeyableOnObjects(selectedList)
+def DeleteKeysNonkeyableOnObjects(objects):
+	# One connection query for all objects, time curves driving only nonkeyable attributes are deleted together
+	# Driven keys are not time based and are kept
+	connections = cmds.listConnections(objects, source = True, destination = False, connections = True, plugs = True, type = "animCurve") or []
+	if (len(connections) == 0):
+		print("Nonkeyable keys deleted: 0 on 0 curves")
+		return 0
+	timeCurves = set(cmds.ls([connections[i + 1].split(".")[0] for i in range(0, len(connections), 2)], type = list(_timeCurveTypes)) or [])
+	curves = {} # curve -> True while every driven attribute is nonkeyable
+	selection = om.MSelectionList()
+	for i in range(0, len(connections), 2):
+		curve = connections[i + 1].split(".")[0]
+		if (curve not in timeCurves):
+			continue
+		selection.add(connections[i])
+		keyable = selection.getPlug(selection.length() - 1).isKeyable
+		curves[curve] = curves.get(curve, True) and not keyable
+	curves = [curve for curve in curves if curves[curve]]
 
 	counter = 0
-	for item in selectedList:
-		attributes = cmds.listAttr(item, channelBox = 1)
-		if attributes != None:
-			for j in range(len(attributes)):
-				cmds.cutKey(item + "." + attributes[j])
-				counter += 1
-	print("Nonkeyable attributes deleted: {0}".format(counter))
+	if (len(curves) > 0):
+		selection = om.MSelectionList()
+		for curve in curves:
+			selection.add(curve)
+		for i in range(len(curves)):
+			counter += oma.MFnAnimCurve(selection.getDependNode(i)).numKeys
+		cmds.delete(curves)
+	print("Nonkeyable keys deleted: {0} on {1} curves".format(counter, len(curves)))
+	return counter
 def DeleteStaticCurves(*args):
 	# Check selected objects
-	Selector.MultipleObjects(1)
-	cmds.delete(staticChannels = True)
+	selectedList = Selector.MultipleObjects(1)
+	if (selectedList == None):
+		return None
+	return DeleteStaticCurvesOnObjects(selectedList)
+def DeleteStaticCurvesOnObjects(objects, tolerances=None):
+	# Delete all near constant curves in one call, returns a report of (curve, driven plugs, value)
+	report = GetStaticCurves(objects, tolerances)
+	if (len(report) > 0):
+		cmds.delete([item[0] for item in report])
+	print("Static curves deleted: {0}".format(len(report)))
+	return report
+def GetStaticCurves(objects, tolerances=None):
+	# Time based curves whose keys and values between keys stay within tolerance of the first key
+	# Tolerances are taken per curve type, so translate, rotate and other channels can differ
+	tolerancesByType = dict(_staticTolerances)
+	if (tolerances != None):
+		tolerancesByType.update(tolerances)
+	connections = cmds.listConnections(objects, source = True, destination = False, type = "animCurve") or []
+	curves = []
+	for curve in cmds.ls(connections, type = list(tolerancesByType.keys())):
+		if (curve not in curves):
+			curves.append(curve)
+	
+	result = []
+	selection = om.MSelectionList()
+	for curve in curves:
+		selection.add(curve)
+	for i in range(len(curves)):
+		node = selection.getDependNode(i)
+		function = oma.MFnAnimCurve(node)
+		tolerance = tolerancesByType[om.MFnDependencyNode(node).typeName]
+		if (function.animCurveType == oma.MFnAnimCurve.kAnimCurveTA):
+			tolerance = math.radians(tolerance) # API values are in internal units
+		elif (function.animCurveType == oma.MFnAnimCurve.kAnimCurveTL):
+			tolerance = om.MDistance.uiToInternal(tolerance)
+		
+		first = function.value(0) if function.numKeys > 0 else 0.0
+		static = True
+		for key in range(function.numKeys):
+			if (abs(function.value(key) - first) > tolerance):
+				static = False
+				break
+			if (key > 0): # tangents may still move the curve between flat keys
+				timeMiddle = om.MTime((function.input(key - 1).value + function.input(key).value) * 0.5, function.input(key).unit)
+				if (abs(function.evaluate(timeMiddle) - first) > tolerance):
+					static = False
+					break
+		if (not static):
+			continue
+		
+		plugs = [plug.name() for plug in om.MFnDependencyNode(node).findPlug("output", False).connectedTo(False, True)]
+		value = first
+		if (function.animCurveType == oma.MFnAnimCurve.kAnimCurveTA):
+			value = math.degrees(first)
+		elif (function.animCurveType == oma.MFnAnimCurve.kAnimCurveTL):
+			value = om.MDistance.internalToUI(first)
+		result.append((curves[i], plugs, value))
+	return result
 
 def EulerFilterOnObject(obj):
-	cmds.filterCurve(obj)
-	cmds.selectKey(clear = True)
-	print("Euler Filtered {0}".format(obj))
+	EulerFilterOnObjects([obj])
 def EulerFilterOnObjects(objects):
+	# Rotation keys are unwrapped in place with one setAttr per curve, closest Euler solution to the previous key wins
+	# Objects without three rotation curves sharing key times fall back to filterCurve
 	if (objects == None):
 		return None
+	fallback = []
 	for item in objects:
-		EulerFilterOnObject(item)
+		curves = []
+		for attribute in Enums.Attributes.rotateLong:
+			connections = cmds.listConnections(item + "." + attribute, source = True, destination = False, type = "animCurve") or []
+			curves.append(connections[0] if len(connections) > 0 else None)
+		if (None in curves):
+			fallback.append(item)
+			continue
+		times = [cmds.keyframe(curve, query = True, timeChange = True) or [] for curve in curves]
+		if (times[0] != times[1] or times[0] != times[2]):
+			fallback.append(item)
+			continue
+		if (len(times[0]) < 2):
+			continue
+		values = [cmds.keyframe(curve, query = True, valueChange = True) for curve in curves]
+		eulers = Matrices.EulerUnwrapSequence(list(zip(*values)), cmds.getAttr(item + "." + Enums.Attributes.rotateOrder))
+		for axis in range(3):
+			keys = []
+			for i in range(len(eulers)):
+				keys.append(times[0][i])
+				keys.append(eulers[i][axis])
+			cmds.setAttr(curves[axis] + ".keyTimeValue[0:{0}]".format(len(eulers) - 1), *keys)
+	if (len(fallback) > 0):
+		cmds.filterCurve(fallback)
+		cmds.selectKey(clear = True)
+	print("Euler Filtered {0} objects".format(len(objects)))
 def EulerFilterOnSelected(*args):
 	# Check selected objects
 	selected = Selector.MultipleObjects(1)
@@ -116,26 +228,149 @@ def SetInfinityCycleRelative(selected):
 def SetInfinityOscillate(selected):
 	SetInfinity(mode = 5, items = selected)
 
+def GetTimeCurve(plug):
+	# Time based curve connected directly to the plug, driven keys and other sources return None
+	curves = cmds.listConnections(plug, source = True, destination = False, type = "animCurve") or []
+	curves = cmds.ls(curves, type = list(_timeCurveTypes))
+	if (len(curves) == 0):
+		return None
+	return curves[0]
+
+def CreateCurve(node, attribute, times, values):
+	# Unconnected curve of the attribute type filled by a single setAttr call
+	attributeType = cmds.getAttr(node + "." + attribute, type = True)
+	if (attributeType == "doubleLinear"):
+		curveType = "animCurveTL"
+	elif (attributeType == "doubleAngle"):
+		curveType = "animCurveTA"
+	else:
+		curveType = "animCurveTU"
+
+	curve = cmds.createNode(curveType, name = node.split("|")[-1].replace(":", "_") + "_" + attribute, skipSelect = True)
+	keys = []
+	for i in range(len(times)):
+		keys.append(times[i])
+		keys.append(values[i])
+	cmds.setAttr(curve + ".keyTimeValue[0:{0}]".format(len(times) - 1), *keys)
+	return curve
+
+def WriteKeys(node, attribute, times, values, preserveOutsideKeys=False):
+	# Keys are built on a new curve with one setAttr call, layered plugs are keyed on the active layer
+	# An existing time curve keeps its node, connections, infinity and tangents, new keys are pasted over the written range
+	plug = node + "." + attribute
+	if (len(times) == 0):
+		return None
+	existing = GetTimeCurve(plug)
+	if (existing == None):
+		source = cmds.connectionInfo(plug, sourceFromDestination = True)
+		if (source != "" and cmds.objectType(source.split(".")[0], isAType = "animBlendNodeBase")):
+			# Animation layers, setKeyframe writes to the curve of the active layer
+			for time, value in zip(times, values):
+				cmds.setKeyframe(plug, time = time, value = value)
+			return None
+	curve = CreateCurve(node, attribute, times, values)
+	if (existing == None):
+		cmds.connectAttr(curve + ".output", plug, force = True)
+		return curve
+
+	cmds.copyKey(curve)
+	cmds.delete(curve)
+	cmds.pasteKey(plug, option = "replace", time = (times[0], times[-1]))
+	if (not preserveOutsideKeys):
+		outside = [time for time in (cmds.keyframe(existing, query = True, timeChange = True) or []) if time < times[0] or time > times[-1]]
+		if (len(outside) > 0):
+			cmds.cutKey(existing, time = [(time, time) for time in outside], clear = True)
+	return existing
+
 def Offset(selected, time, attributes=None):
 	if (attributes == None):
 		cmds.keyframe(selected, edit = True, relative = True, option = "over", includeUpperBound = True, timeChange = time)
 	else:
 		cmds.keyframe(selected, edit = True, relative = True, option = "over", includeUpperBound = True, timeChange = time, attribute = attributes)
-def OffsetSelected(direction=1, step=1): # use if needed later # , channelBox = False
+def OffsetCycle(selected, time, timeStart, timeEnd, attributes=None):
+	# Shift looping animation inside the cycle range, keys pushed past the end wrap around to the start
+	# Keys are moved on the existing curves, so tangents, infinity, connections and units stay untouched, keys outside the range are kept
+	if (attributes == None):
+		curves = cmds.keyframe(selected, query = True, name = True) or []
+	else:
+		curves = cmds.keyframe(selected, query = True, name = True, attribute = attributes) or []
+	if (len(curves) == 0):
+		return
+	curves = cmds.ls(curves, type = list(_timeCurveTypes)) or []
+	length = float(timeEnd - timeStart)
+	if (length <= 0 or len(curves) == 0):
+		return
+	time = time % length
+	if (time == 0):
+		return
+	timeCut = timeEnd - time # keys after this time wrap to the start
+	cmds.setKeyframe(curves, insert = True, time = [timeStart, timeCut, timeEnd]) # inserted keys keep the curve shape
+	for curve in curves:
+		cmds.copyKey(curve, time = (timeCut, timeEnd))
+		cmds.cutKey(curve, time = (timeCut, timeEnd), clear = True)
+		cmds.keyframe(curve, edit = True, relative = True, timeChange = time, time = (timeStart, timeCut))
+		cmds.pasteKey(curve, time = (timeStart, timeStart), option = "merge")
+		# The wrapped cut key also closes the cycle at the end
+		cmds.copyKey(curve, time = (timeStart, timeStart))
+		cmds.pasteKey(curve, time = (timeEnd, timeEnd), option = "merge")
+
+def GetStaggeredOffsets(objects, step=1, distribution="linear", seed=0, point=None):
+	# Offset per object, distributions: linear by order, random with seed, distance from point, hierarchy depth
+	# Distance is measured from the centroid of the objects pivots when no point is given
+	# All results are multiples of step, so objects can be grouped by identical offset
+	count = len(objects)
+	if (count == 1):
+		return [step]
+	if (distribution == "random"):
+		generator = random.Random(seed)
+		return [generator.randint(0, count - 1) * step for i in range(count)]
+	if (distribution == "distance"):
+		positions = [cmds.xform(item, query = True, worldSpace = True, rotatePivot = True) for item in objects]
+		if (point == None): # center of the selection, offsets spread outwards from it
+			point = Matrices.VectorScale(tuple(sum(position[axis] for position in positions) for axis in range(3)), 1.0 / count)
+		distances = [Matrices.VectorLength(Matrices.VectorSubtract(position, point)) for position in positions]
+		distanceMax = max(distances)
+		if (distanceMax == 0):
+			return [0] * count
+		return [int(round(distance / distanceMax * (count - 1))) * step for distance in distances]
+	if (distribution == "depth"):
+		depths = [item.count("|") for item in cmds.ls(objects, long = True)]
+		return [(depth - min(depths)) * step for depth in depths]
+	return [i * step for i in range(count)]
+
+def GroupByOffset(objects, offsets):
+	# Objects sharing the same offset go together, order of first appearance is kept
+	groups = []
+	indices = {}
+	for item, offset in zip(objects, offsets):
+		if (offset not in indices):
+			indices[offset] = len(groups)
+			groups.append((offset, []))
+		groups[indices[offset]][1].append(item)
+	return groups
+
+def OffsetStaggered(objects, offsets, attributes=None, cycleRange=None):
+	# One keyframe edit per group of identical offsets instead of one per object
+	groups = GroupByOffset(objects, offsets)
+	for offset, items in groups:
+		if (offset == 0):
+			continue
+		if (cycleRange == None):
+			Offset(items, offset, attributes)
+		else:
+			OffsetCycle(items, offset, cycleRange[0], cycleRange[1], attributes)
+	return groups
+
+def OffsetSelected(direction=1, step=1, distribution="linear", seed=0, cycle=False): # use if needed later # , channelBox = False
 	# Check selected objects
 	selectedList = Selector.MultipleObjects(1)
 	if (selectedList == None):
 		return
 	
-	time = step * direction
 	selectedAttributes = Attributes.GetAttributesSelectedFromChannelBox()
-
-	count = len(selectedList)
-	for i in range(count):
-		if (count == 1):
-			timeCurrent = time
-		else:
-			timeCurrent = i * time
-		
-		Offset(selectedList[i], timeCurrent, selectedAttributes)
+	offsets = [value * direction for value in GetStaggeredOffsets(selectedList, step, distribution, seed)]
+	cycleRange = None
+	if (cycle):
+		cycleRange = Timeline.GetTimeMinMax()
+	return OffsetStaggered(selectedList, offsets, selectedAttributes, cycleRange)
 
@@ -26,10 +26,15 @@ import maya.cmds as cmds
 from ..utils import Animation
 from ..utils import Attributes
 from ..utils import Constraints
+from ..utils import Matrices
+from ..utils import Sampler
 from ..utils import Selector
 from ..utils import Timeline
+from ..values import Enums
 
 
+_steppedTypes = ("bool", "enum")
+
 def BakeSelected(classic=True, preserveOutsideKeys=True, sampleBy=1.0, selectedRange=False, channelBox=False, attributes=None, euler=False):
 	# Check selected objects
 	selectedList = Selector.MultipleObjects(1)
@@ -37,12 +42,7 @@ def BakeSelected(classic=True, preserveOutsideKeys=True, sampleBy=1.0, selectedR
 		return
 	
 	# Calculate time range if range highlighted
-	if (selectedRange and Timeline.CheckHighlighting()):
-		rangeCurrent = Timeline.GetSelectedTimeRange()
-		timeRange = [rangeCurrent[0], rangeCurrent[1] - 1]
-	else:
-		rangeCurrent = Timeline.GetTimeMinMax()
-		timeRange = [rangeCurrent[0], rangeCurrent[1]]
+	timeRange = list(Timeline.GetBakeRange(selectedRange))
 
 	cmds.refresh(suspend = True)
 	if (classic):
@@ -60,12 +60,8 @@ def BakeSelected(classic=True, preserveOutsideKeys=True, sampleBy=1.0, selectedR
 		else:
 			cmds.bakeResults(time = (timeRange[0], timeRange[1]), preserveOutsideKeys = preserveOutsideKeys, simulation = True, minimizeRotation = True, sampleBy = sampleBy, attribute = selectedAttributes)
 	else:
-		timeCurrent = Timeline.GetTimeCurrent()
+		BakeSampled(selectedList, Sampler.GetTimes(int(timeRange[0]), int(timeRange[1])))
 		timeRange[1] = timeRange[1] + 1
-		for i in range(int(timeRange[0]), int(timeRange[1])):
-			Timeline.SetTimeCurrent(i)
-			cmds.setKeyframe(respectKeyable = True, animated = False, preserveCurveShape = True)
-		Timeline.SetTimeCurrent(timeCurrent)
 		if (not preserveOutsideKeys):
 			cmds.cutKey(time = (None, timeRange[0] - 1)) # to left
 			cmds.cutKey(time = (timeRange[1], None)) # to right
@@ -74,6 +70,36 @@ def BakeSelected(classic=True, preserveOutsideKeys=True, sampleBy=1.0, selectedR
 	if (euler):
 		Animation.EulerFilterOnObjects(selectedList)
 
+def BakeSampled(objects, times, attributes=None):
+	# Key every keyable attribute on each time from time context samples, current time is never moved
+	# Free or curve driven channels get a new curve in one call, channels driven by other nodes are keyed through setKeyframe
+	# Driven keys are kept, bool and enum channels get stepped keys
+	# All plugs of all objects are sampled together, so each frame is evaluated once
+	plugs = []
+	for item in objects:
+		attributesItem = attributes
+		if (attributesItem == None):
+			attributesItem = cmds.listAttr(item, keyable = True, scalar = True) or []
+		plugs.extend([(item, attribute) for attribute in attributesItem if not cmds.getAttr(item + "." + attribute, lock = True)])
+	if (len(plugs) == 0):
+		return
+	samples = Sampler.SamplePlugs([item + "." + attribute for item, attribute in plugs], times)
+	
+	for item, attribute in plugs:
+		plug = item + "." + attribute
+		values = samples[plug]
+		source = cmds.connectionInfo(plug, sourceFromDestination = True)
+		curveSource = source != "" and cmds.objectType(source.split(".")[0], isAType = "animCurve")
+		if (curveSource and Animation.GetTimeCurve(plug) == None): # driven keys
+			continue
+		if (source == "" or curveSource):
+			Animation.WriteKeys(item, attribute, times, values, preserveOutsideKeys = True)
+		else:
+			for time, value in zip(times, values):
+				cmds.setKeyframe(plug, time = time, value = value)
+		if (cmds.getAttr(plug, type = True) in _steppedTypes):
+			cmds.keyTangent(plug, time = (times[0], times[-1]), outTangentType = "step")
+
 def BakeSelectedByLastObject(pairOnly=False, sampleBy=1.0, selectedRange=False, channelBox=False, attributes=None, euler=False):
 	# Check selected objects
 	selectedList = Selector.MultipleObjects(2)
@@ -110,6 +136,75 @@ def BakeSelectedByWorld(sampleBy=1.0, selectedRange=False, channelBox=False, att
 	BakeSelectedByLastObject(sampleBy = sampleBy, selectedRange = selectedRange, channelBox = channelBox, attributes = attributes, euler = euler)
 	cmds.delete(world)
 
+def BakeWorldMatrices(matricesByObject, times, parentInverseMatrices=None, preserveOutsideKeys=False, translate=True, rotate=True, scale=False, euler=False):
+	# Computed bake without playback, world matrices per frame are converted to channels and written as curves
+	# Matrices are rotate pivot frames like Sampler.SampleMatchMatrices, pivots, rotate axis and joint orient of each object are compensated
+	# Parent inverse matrices are sampled if not provided, locked or connected channels are skipped
+	# Sampled parent spaces follow the hierarchy, parents are baked first and children get parent spaces from the new parent world matrices
+	# Euler flag also tries the alternative Euler solution per frame, so no filter pass is needed after the bake
+	objects = list(matricesByObject.keys())
+	ancestors = {} # object -> closest baked ancestor
+	if (parentInverseMatrices == None):
+		longNames = dict((item, cmds.ls(item, long = True)[0]) for item in objects)
+		objects.sort(key = lambda item: longNames[item].count("|"))
+		for item in objects:
+			for other in objects:
+				if (longNames[item].startswith(longNames[other] + "|") and (item not in ancestors or longNames[other].count("|") > longNames[ancestors[item]].count("|"))):
+					ancestors[item] = other
+		parentInverseMatrices = Sampler.SampleMatrices(objects, times, attribute = "parentInverseMatrix[0]")
+		if (len(ancestors) > 0):
+			parentMatrices = Sampler.SampleMatrices(list(set(ancestors.keys()) | set(ancestors.values())), times, attribute = "parentMatrix[0]")
+			worldInverseMatrices = Sampler.SampleMatrices(list(set(ancestors.values())), times, attribute = "worldInverseMatrix[0]")
+	worldMatrices = {} # new world matrices of baked ancestors
+	
+	for item in objects:
+		rotateOrder = cmds.getAttr(item + "." + Enums.Attributes.rotateOrder)
+		jointOrient = None
+		if (cmds.attributeQuery("jointOrient", node = item, exists = True)):
+			jointOrient = Matrices.EulerToRotation(cmds.getAttr(item + ".jointOrient")[0])
+		pivots = dict((attribute, cmds.getAttr(item + "." + attribute)[0]) for attribute in ("rotatePivot", "rotatePivotTranslate", "scalePivot", "scalePivotTranslate", "scale"))
+		rotateAxis = Matrices.EulerToRotation(cmds.getAttr(item + ".rotateAxis")[0])
+		parentInverse = parentInverseMatrices[item]
+		if (item in ancestors):
+			ancestor = ancestors[item]
+			parentMatrices[item] = [Matrices.ParentSpaceAfterBake(parentMatrices[item][i], worldInverseMatrices[ancestor][i], worldMatrices[ancestor][i]) for i in range(len(times))]
+			parentInverse = [Matrices.MatrixInverse(matrix) for matrix in parentMatrices[item]]
+		
+		translations = []
+		rotations = []
+		scales = []
+		rotationMatrices = []
+		for i in range(len(times)):
+			translation, rotation, scaleValues = Matrices.TransformFromPivotFrame(Matrices.MatrixMultiply(matricesByObject[item][i], parentInverse[i]), rotateAxis = rotateAxis, jointOrient = jointOrient, **pivots)
+			angles = Matrices.RotationToEuler(rotation, rotateOrder)
+			if (len(rotations) > 0):
+				angles = Matrices.EulerUnwrap(angles, rotations[-1], rotateOrder) if euler else Matrices.EulerContinuous(angles, rotations[-1])
+			translations.append(translation)
+			rotations.append(angles)
+			scales.append(scaleValues)
+			rotationMatrices.append(rotation)
+		
+		if (item in ancestors.values()):
+			local = dict(pivots)
+			for i in range(len(times)):
+				if (scale):
+					local["scale"] = scales[i]
+				world = Matrices.MatrixMultiply(Matrices.TransformToMatrix(translations[i], rotationMatrices[i], rotateAxis = rotateAxis, jointOrient = jointOrient, **local), parentMatrices[item][i])
+				worldMatrices.setdefault(item, []).append(world)
+		
+		channels = []
+		if translate:
+			channels.append((Enums.Attributes.translateLong, translations))
+		if rotate:
+			channels.append((Enums.Attributes.rotateLong, rotations))
+		if scale:
+			channels.append((Enums.Attributes.scaleLong, scales))
+		for attributes, values in channels:
+			for axis in range(3):
+				if (not cmds.getAttr(item + "." + attributes[axis], settable = True)):
+					continue
+				Animation.WriteKeys(item, attributes[axis], times, [value[axis] for value in values], preserveOutsideKeys = preserveOutsideKeys)
+
 # def BakeReverseParentOnPair(): # TODO add child locator on parent object (OPTIONAL)
 # 	selectedList = BakeSelectedByLastObject(pairOnly = True)
 # 	Constraints.ConstrainSecondToFirstObject(selectedList[0], selectedList[1], maintainOffset = True)
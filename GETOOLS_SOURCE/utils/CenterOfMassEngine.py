@@ -0,0 +1,227 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+import json
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from ..utils import Animation
+from ..utils import CenterOfMassEvaluation
+from ..utils import Matrices
+from ..utils import Sampler
+from ..utils import Skinning
+from ..utils import Timeline
+from ..values import Enums
+
+
+_attributeMarker = "centerOfMassRig"
+_attributeSegments = "centerOfMassSegments"
+
+
+# SCENE
+def GetConstraintTargets(COMObject):
+	# Targets and weights of the point constraint that drives the center of mass object
+	constraints = cmds.listConnections(COMObject, type = Enums.Constraints.pointConstraint, source = True, destination = False) or []
+	if (len(constraints) == 0):
+		return None
+	constraint = constraints[0]
+	targets = cmds.pointConstraint(constraint, query = True, targetList = True) or []
+	aliases = cmds.pointConstraint(constraint, query = True, weightAliasList = True) or []
+	weights = [cmds.getAttr(constraint + "." + alias) for alias in aliases]
+	return constraint, targets, weights
+
+def EvaluateForObject(COMObject, times=None):
+	# Sample all weighted segments in one pass and evaluate the whole range
+	segments = GetSegments(COMObject)
+	if (segments == None):
+		cmds.warning("Center of mass object has no point constraint with targets")
+		return None
+	targets, weights = segments
+	if (times == None):
+		timeMinMax = Timeline.GetTimeMinMax()
+		times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	pivots = Sampler.SamplePivots(targets, times)
+	trajectory = CenterOfMassEvaluation.EvaluateTrajectory([pivots[target] for target in targets], weights, times)
+	if (trajectory == None):
+		cmds.warning("Center of mass segments of {0} have no weight".format(COMObject))
+		return None
+	return times, trajectory
+
+def BakeToObject(COMObject, times, trajectory, deleteConstraint=True):
+	# Write world space trajectory to the center of mass object, parent space is respected
+	data = GetConstraintTargets(COMObject)
+	if (deleteConstraint and data != None):
+		StoreSegments(COMObject) # keep segments in scene metadata for reevaluation
+		cmds.delete(data[0])
+	parentInverse = Sampler.SampleMatrices([COMObject], times, attribute = "parentInverseMatrix[0]")[COMObject]
+	local = [Matrices.PointTransform(trajectory[i], parentInverse[i]) for i in range(len(times))]
+	for axis in range(3):
+		Animation.WriteKeys(COMObject, Enums.Attributes.translateLong[axis], times, [value[axis] for value in local])
+
+def GetMeshTriangles(mesh):
+	# World space points and flat triangle vertex indices
+	selection = om.MSelectionList()
+	selection.add(mesh)
+	meshFn = om.MFnMesh(selection.getDagPath(0).extendToShape())
+	points = [(point.x, point.y, point.z) for point in meshFn.getPoints(om.MSpace.kWorld)]
+	triangles = list(meshFn.getTriangles()[1])
+	return points, triangles
+
+def AnalyzeSkinnedMeshes(meshes, dominantOnly=False):
+	# Returns {influence: percentage} for all influences of all meshes
+	volumes = {}
+	for mesh in meshes:
+		skin = Skinning.GetSkinWeights(mesh)
+		if (skin == None):
+			continue
+		influences, weights, influenceCount = skin
+		points, triangles = GetMeshTriangles(mesh)
+		for influence, volume in zip(influences, CenterOfMassEvaluation.SegmentVolumes(points, triangles, weights, influenceCount, dominantOnly)):
+			volumes[influence] = volumes.get(influence, 0.0) + volume
+	influences = list(volumes.keys())
+	percentages = CenterOfMassEvaluation.VolumesToPercentages([volumes[influence] for influence in influences])
+	if (percentages == None):
+		return None
+	return dict(zip(influences, percentages))
+
+def AssignWeights(COMObject, percentages, minimalPercent=0.1):
+	# Recreate the center of mass point constraint with one call and set all weights
+	data = GetConstraintTargets(COMObject)
+	if (data != None):
+		cmds.delete(data[0])
+	targets = [influence for influence in percentages if percentages[influence] >= minimalPercent]
+	if (len(targets) == 0):
+		cmds.warning("No influences with enough volume found")
+		return None
+	constraint = cmds.pointConstraint(targets + [COMObject], maintainOffset = False)[0]
+	aliases = cmds.pointConstraint(constraint, query = True, weightAliasList = True)
+	for target, alias in zip(targets, aliases): # aliases follow targets order
+		cmds.setAttr(constraint + "." + alias, percentages[target])
+	return constraint
+
+def AnalyzeBalanceForObject(COMObject, contacts, skipAxis="y", heightThreshold=5.0, floorHeight=0.0, attribute="stability"):
+	# Stability is keyed to a custom attribute on the center of mass object, returns unbalanced time ranges
+	result = EvaluateForObject(COMObject)
+	if (result == None):
+		return None
+	times, trajectory = result
+	pivots = Sampler.SamplePivots(contacts, times)
+	stability, ranges = CenterOfMassEvaluation.AnalyzeBalance(trajectory[0], [pivots[contact] for contact in contacts], skipAxis, heightThreshold, floorHeight)
+
+	if (not cmds.attributeQuery(attribute, node = COMObject, exists = True)):
+		cmds.addAttr(COMObject, longName = attribute, attributeType = "double", keyable = True)
+	Animation.WriteKeys(COMObject, attribute, times, [0.0 if value == None else value for value in stability])
+	return [(times[start], times[end]) for start, end in ranges]
+
+
+# REGISTRY
+def Register(COMObject):
+	# Mark a newly created object as center of mass rig and store its segments weights in the scene
+	if (not cmds.attributeQuery(_attributeMarker, node = COMObject, exists = True)):
+		cmds.addAttr(COMObject, longName = _attributeMarker, attributeType = "bool", defaultValue = True)
+	if (not cmds.attributeQuery(_attributeSegments, node = COMObject, exists = True)):
+		cmds.addAttr(COMObject, longName = _attributeSegments, dataType = Enums.Other.string)
+	StoreSegments(COMObject)
+
+def IsRegistered(COMObject):
+	return cmds.attributeQuery(_attributeMarker, node = COMObject, exists = True)
+
+def UpgradeLegacy(COMObject):
+	# Rigs created before registration have a point constraint but no marker, they are registered on activation
+	# Returns True when the object is a registered rig afterwards
+	if (IsRegistered(COMObject)):
+		return True
+	if (GetConstraintTargets(COMObject) == None):
+		return False
+	Register(COMObject)
+	print("{0} registered as center of mass rig".format(COMObject))
+	return True
+
+def GetRegistered():
+	# All center of mass rigs in the scene including namespaces with one query
+	return cmds.ls("*." + _attributeMarker, objectsOnly = True, recursive = True) or []
+
+def StoreSegments(COMObject):
+	data = GetConstraintTargets(COMObject)
+	segments = {} if data == None else dict(zip(data[1], data[2]))
+	if (cmds.attributeQuery(_attributeSegments, node = COMObject, exists = True)):
+		cmds.setAttr(COMObject + "." + _attributeSegments, json.dumps(segments, sort_keys = True), type = Enums.Other.string)
+	return segments
+
+def GetSegments(COMObject):
+	# Segments from the point constraint, stored scene metadata is used if the constraint was removed after baking
+	data = GetConstraintTargets(COMObject)
+	if (data != None):
+		return list(data[1]), list(data[2])
+	if (not cmds.attributeQuery(_attributeSegments, node = COMObject, exists = True)):
+		return None
+	try:
+		segments = json.loads(cmds.getAttr(COMObject + "." + _attributeSegments) or "{}")
+	except ValueError:
+		return None
+	if (not isinstance(segments, dict)):
+		return None
+	segments = dict((target, weight) for target, weight in segments.items() if cmds.objExists(target))
+	if (len(segments) == 0):
+		return None
+	targets = list(segments.keys())
+	return targets, [segments[target] for target in targets]
+
+def EvaluateAll(COMObjects=None, times=None):
+	# Every segment of every character is sampled once, then each center of mass is computed from shared samples
+	if (COMObjects == None):
+		COMObjects = GetRegistered()
+	if (times == None):
+		timeMinMax = Timeline.GetTimeMinMax()
+		times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	
+	segmentsByObject = {}
+	targetsAll = []
+	for COMObject in COMObjects:
+		segments = GetSegments(COMObject)
+		if (segments == None):
+			cmds.warning("{0} has no segments, skipped".format(COMObject))
+			continue
+		segmentsByObject[COMObject] = segments
+		targetsAll.extend(target for target in segments[0] if target not in targetsAll)
+	if (len(targetsAll) == 0):
+		return None
+	
+	pivots = Sampler.SamplePivots(targetsAll, times)
+	result = {}
+	for COMObject, segments in segmentsByObject.items():
+		trajectory = CenterOfMassEvaluation.EvaluateTrajectory([pivots[target] for target in segments[0]], segments[1], times)
+		if (trajectory == None):
+			cmds.warning("Center of mass segments of {0} have no weight".format(COMObject))
+			continue
+		result[COMObject] = trajectory
+	return times, result
+
+def BakeAll(COMObjects=None):
+	evaluated = EvaluateAll(COMObjects)
+	if (evaluated == None):
+		return None
+	times, result = evaluated
+	for COMObject, trajectory in result.items():
+		BakeToObject(COMObject, times, trajectory[0])
+	return list(result.keys())
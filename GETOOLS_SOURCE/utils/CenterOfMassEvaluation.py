@@ -0,0 +1,199 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+from ..utils import Matrices
+
+
+# Center of mass math on sampled positions and mesh data, no Maya dependency.
+
+
+def Evaluate(positions, weights):
+	# positions - list of segments, each segment is a list of world positions per frame
+	# Returns center of mass position per frame
+	total = float(sum(weights))
+	if (total == 0):
+		return None
+	result = []
+	for frame in range(len(positions[0])):
+		x = 0.0
+		y = 0.0
+		z = 0.0
+		for segment in range(len(positions)):
+			point = positions[segment][frame]
+			weight = weights[segment] / total
+			x += point[0] * weight
+			y += point[1] * weight
+			z += point[2] * weight
+		result.append((x, y, z))
+	return result
+
+def Derivative(values, times):
+	# Central differences inside the range, one sided differences on the borders
+	count = len(values)
+	if (count < 2):
+		return [(0.0, 0.0, 0.0)] * count
+	result = []
+	for i in range(count):
+		previous = max(0, i - 1)
+		following = min(count - 1, i + 1)
+		step = float(times[following] - times[previous])
+		result.append(Matrices.VectorScale(Matrices.VectorSubtract(values[following], values[previous]), 1.0 / step))
+	return result
+
+def EvaluateTrajectory(positions, weights, times):
+	# Returns position, velocity and acceleration per frame, time units are frames
+	trajectory = Evaluate(positions, weights)
+	if (trajectory == None):
+		return None
+	velocity = Derivative(trajectory, times)
+	acceleration = Derivative(velocity, times)
+	return trajectory, velocity, acceleration
+
+def VertexVolumes(points, triangles):
+	# Signed tetrahedron volumes against the mesh center, each triangle shares its volume between its 3 vertices
+	count = len(points)
+	center = Matrices.VectorScale(tuple(sum(point[axis] for point in points) for axis in range(3)), 1.0 / count)
+	local = [Matrices.VectorSubtract(point, center) for point in points]
+	result = [0.0] * count
+	for i in range(0, len(triangles), 3):
+		a = triangles[i]
+		b = triangles[i + 1]
+		c = triangles[i + 2]
+		pa = local[a]
+		pb = local[b]
+		pc = local[c]
+		volume = (
+			pa[0] * (pb[1] * pc[2] - pb[2] * pc[1])
+			+ pa[1] * (pb[2] * pc[0] - pb[0] * pc[2])
+			+ pa[2] * (pb[0] * pc[1] - pb[1] * pc[0])
+			) / 18.0 # 1/6 for tetrahedron and 1/3 for each vertex
+		result[a] += volume
+		result[b] += volume
+		result[c] += volume
+	return result
+
+def SegmentVolumes(points, triangles, weights, influenceCount, dominantOnly=False):
+	# weights - flat vertex-major skin weights, returns volume per influence
+	vertexVolumes = VertexVolumes(points, triangles)
+	if (sum(vertexVolumes) < 0): # inverted normals
+		vertexVolumes = [-volume for volume in vertexVolumes]
+	result = [0.0] * influenceCount
+	for vertex in range(len(points)):
+		vertexWeights = weights[vertex * influenceCount:(vertex + 1) * influenceCount]
+		if dominantOnly:
+			result[vertexWeights.index(max(vertexWeights))] += vertexVolumes[vertex]
+			continue
+		for influence in range(influenceCount):
+			if (vertexWeights[influence] != 0):
+				result[influence] += vertexVolumes[vertex] * vertexWeights[influence]
+	return [max(0.0, volume) for volume in result]
+
+def VolumesToPercentages(volumes):
+	total = sum(volumes)
+	if (total <= 0):
+		return None
+	return [volume / total * 100.0 for volume in volumes]
+
+_axisIndices = {"x": 0, "y": 1, "z": 2}
+
+def ProjectToPlane(point, skipAxis="y"):
+	# Returns 2D point on the plane and height along the skipped axis
+	index = _axisIndices[skipAxis]
+	flat = tuple(point[i] for i in range(3) if i != index)
+	return flat, point[index]
+
+def ConvexHull(points):
+	# Monotone chain, counter clockwise hull without collinear points
+	points = sorted(set(points))
+	if (len(points) < 3):
+		return points
+	def Cross(o, a, b):
+		return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+	lower = []
+	for point in points:
+		while (len(lower) >= 2 and Cross(lower[-2], lower[-1], point) <= 0):
+			lower.pop()
+		lower.append(point)
+	upper = []
+	for point in reversed(points):
+		while (len(upper) >= 2 and Cross(upper[-2], upper[-1], point) <= 0):
+			upper.pop()
+		upper.append(point)
+	return lower[:-1] + upper[:-1]
+
+def _DistanceToSegment(point, a, b):
+	dx = b[0] - a[0]
+	dy = b[1] - a[1]
+	lengthSquared = dx * dx + dy * dy
+	factor = 0.0 if lengthSquared == 0 else max(0.0, min(1.0, ((point[0] - a[0]) * dx + (point[1] - a[1]) * dy) / lengthSquared))
+	x = a[0] + dx * factor - point[0]
+	y = a[1] + dy * factor - point[1]
+	return (x * x + y * y) ** 0.5
+
+def SignedDistanceToHull(point, hull, tolerance=0.0):
+	# Positive inside the hull (distance to the closest edge), negative outside
+	# A single point or a segment (two feet stance) has no area, points closer than tolerance count as supported
+	if (len(hull) == 0):
+		return None
+	if (len(hull) == 1):
+		return tolerance - _DistanceToSegment(point, hull[0], hull[0])
+	distance = min(_DistanceToSegment(point, hull[i], hull[(i + 1) % len(hull)]) for i in range(len(hull)))
+	if (len(hull) < 3):
+		return tolerance - distance
+	for i in range(len(hull)):
+		a = hull[i]
+		b = hull[(i + 1) % len(hull)]
+		if ((b[0] - a[0]) * (point[1] - a[1]) - (b[1] - a[1]) * (point[0] - a[0]) < 0):
+			return -distance
+	return distance
+
+def AnalyzeBalance(trajectory, contacts, skipAxis="y", heightThreshold=5.0, floorHeight=0.0, supportTolerance=None):
+	# trajectory - center of mass positions per frame, contacts - list of contact points trajectories
+	# Returns stability per frame (None if nothing touches the ground) and list of unbalanced (start, end) frame indices
+	# Support tolerance is the width of the support band around one or two contacts, height threshold by default
+	if (supportTolerance == None):
+		supportTolerance = heightThreshold
+	stability = []
+	for frame in range(len(trajectory)):
+		grounded = []
+		for contact in contacts:
+			flat, height = ProjectToPlane(contact[frame], skipAxis)
+			if (height - floorHeight <= heightThreshold):
+				grounded.append(flat)
+		if (len(grounded) == 0):
+			stability.append(None)
+			continue
+		stability.append(SignedDistanceToHull(ProjectToPlane(trajectory[frame], skipAxis)[0], ConvexHull(grounded), supportTolerance))
+	
+	ranges = []
+	start = None
+	for frame in range(len(stability)):
+		unbalanced = stability[frame] == None or stability[frame] < 0
+		if (unbalanced and start == None):
+			start = frame
+		elif (not unbalanced and start != None):
+			ranges.append((start, frame - 1))
+			start = None
+	if (start != None):
+		ranges.append((start, len(stability) - 1))
+	return stability, ranges
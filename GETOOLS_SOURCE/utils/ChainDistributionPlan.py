@@ -0,0 +1,186 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+from ..utils import Matrices
+from ..values import Enums
+
+
+# Chain distribution rigs described as plain data, no Maya dependency.
+# ChainDistributionRig.ExecutePlan builds the scene from a plan, BakeDistribution keys the evaluated distribution.
+
+locatorSize = 100
+nameAttributeWeight = "distribution"
+_nameGroupMain = "grpChain_"
+_nameLocatorPrefix = "loc_"
+_nameGroupFixedPrefix = "grpFixed_"
+_nameGroupDistributedPrefix = "grpDistr_"
+_nameAttributeGlobal = "global"
+_nameMultiplyDivide = "gtMultiplyDivide"
+_falloffs = ("linear", "easeIn", "easeOut", "smooth")
+
+
+class RigPlan:
+	# Pure data description of a rig, every list is executed in order by ExecutePlan
+	def __init__(self):
+		self.nodes = [] # (name, node type, parent name or None), parents always go first
+		self.attributes = [] # (plug, values, flags)
+		self.bake = [] # (node, source object, parent source object or None for world)
+		self.constraints = [] # (constraint command, drivers, driven, maintain offset)
+		self.customAttributes = [] # (node, long name, addAttr flags)
+		self.connections = [] # (source plug, destination plug)
+		self.keys = [] # plugs keyed after constraints
+		self.connectionsAfterKeys = [] # (source plug, destination plug)
+		self.select = None
+		self.warning = None
+
+def _UniqueNameIdentity(baseName):
+	return baseName
+
+def _ShortNames(objects):
+	return [item.split("|")[-1].replace(":", "_") for item in objects]
+
+def PlanRigVariant1(objects, locatorSize=locatorSize, uniqueName=_UniqueNameIdentity):
+	# Locators follow objects in world space, middle links blend orientation between first and next locators
+	plan = RigPlan()
+	names = _ShortNames(objects)
+	count = len(objects)
+
+	mainGroup = uniqueName(_nameGroupMain + names[-1])
+	plan.nodes.append((mainGroup, Enums.Types.transform, None))
+
+	locators = []
+	for i in range(count):
+		locator = uniqueName(_nameLocatorPrefix + names[i])
+		locators.append(locator)
+		plan.nodes.append((locator, Enums.Types.locator, mainGroup))
+		plan.attributes.append((locator + Enums.Types.shape + "." + Enums.Attributes.scaleLocalCompound, (locatorSize, locatorSize, locatorSize), {}))
+		plan.bake.append((locator, objects[i], None))
+
+	for i in range(count):
+		plan.constraints.append(("pointConstraint", [objects[i]], locators[i], False))
+		plan.constraints.append(("orientConstraint", [locators[i]], objects[i], False))
+		if (i > 0 and i < count - 1):
+			plan.constraints.append(("orientConstraint", [locators[0], locators[i + 1]], locators[i], True))
+
+	plan.select = locators[-1]
+	return plan
+
+def PlanRigVariant2(objects, locatorSize=locatorSize, uniqueName=_UniqueNameIdentity):
+	# Each fixed group lives under the previous locator, last locator rotation is distributed along the chain
+	plan = RigPlan()
+	names = _ShortNames(objects)
+	count = len(objects)
+
+	mainGroup = uniqueName(_nameGroupMain + names[-1])
+	plan.nodes.append((mainGroup, Enums.Types.transform, None))
+
+	groupsDistributed = []
+	locators = []
+	for i in range(count):
+		groupFixed = uniqueName(_nameGroupFixedPrefix + names[i])
+		groupDistributed = uniqueName(_nameGroupDistributedPrefix + names[i])
+		locator = uniqueName(_nameLocatorPrefix + names[i])
+		groupsDistributed.append(groupDistributed)
+		locators.append(locator)
+
+		plan.nodes.append((groupFixed, Enums.Types.transform, mainGroup if i == 0 else locators[i - 1]))
+		plan.nodes.append((groupDistributed, Enums.Types.transform, groupFixed))
+		plan.nodes.append((locator, Enums.Types.locator, groupDistributed))
+		plan.attributes.append((locator + Enums.Types.shape + "." + Enums.Attributes.scaleLocalCompound, (locatorSize, locatorSize, locatorSize), {}))
+		plan.bake.append((groupFixed, objects[i], None if i == 0 else objects[i - 1]))
+
+	for i in range(count):
+		plan.constraints.append(("parentConstraint", [locators[i]], objects[i], True))
+
+	### Show last locator Rotate Order and connect it to Distribution groups
+	plan.attributes.append((locators[-1] + "." + Enums.Attributes.rotateOrder, (), {"channelBox": True}))
+	for i in range(count):
+		plan.connections.append((locators[-1] + "." + Enums.Attributes.rotateOrder, groupsDistributed[i] + "." + Enums.Attributes.rotateOrder))
+	
+	plan.select = locators[-1]
+	if (count < 3):
+		plan.warning = "You have less than 3 objects selected. Rotation distribution will not be created"
+		return plan
+
+	### Weight attribute and MultiplyDivide node divide last locator rotation between middle links
+	nodeMultiplyDivide = uniqueName(_nameMultiplyDivide)
+	plan.nodes.append((nodeMultiplyDivide, "multiplyDivide", None))
+	plan.attributes.append((nodeMultiplyDivide + ".operation", (2,), {}))
+	plan.customAttributes.append((locators[-1], nameAttributeWeight, {"attributeType": "double", "defaultValue": count - 1}))
+	plan.customAttributes.append((locators[-1], _nameAttributeGlobal, {"attributeType": "double", "defaultValue": 0, "minValue": 0, "maxValue": 1}))
+	plan.connections.append((locators[-1] + ".rotate", nodeMultiplyDivide + ".input1"))
+	for axis in ("X", "Y", "Z"):
+		plan.connections.append((locators[-1] + "." + nameAttributeWeight, nodeMultiplyDivide + ".input2" + axis))
+	for i in range(1, count - 1):
+		plan.connections.append((nodeMultiplyDivide + ".output", groupsDistributed[i] + ".rotate"))
+
+	### Global attribute blends the last distribution group to main group orientation
+	plan.constraints.append(("orientConstraint", [mainGroup], groupsDistributed[-1], True))
+	plan.keys = [groupsDistributed[-1] + "." + item for item in Enums.Attributes.rotateShort] # keys on constrained channels expose blend orient attribute
+	plan.connectionsAfterKeys.append((locators[-1] + "." + _nameAttributeGlobal, groupsDistributed[-1] + ".blendOrient1"))
+	return plan
+
+# DISTRIBUTION
+def FalloffValue(value, falloff="linear"):
+	# Maps chain position from 0 to 1 into accumulated share of rotation
+	if (falloff == "easeIn"):
+		return value * value
+	if (falloff == "easeOut"):
+		return 1 - (1 - value) * (1 - value)
+	if (falloff == "smooth"):
+		return value * value * (3 - 2 * value)
+	return value
+
+def GetDistributionWeights(count, falloff="linear", distribution=None):
+	# Share of the last locator rotation for each distribution group, first and last groups get nothing
+	# Linear falloff with distribution equal to count - 1 matches the live multiplyDivide layout
+	weights = [0.0] * count
+	if (count < 3):
+		return weights
+	segments = float(count - 1)
+	scale = 1.0
+	if (distribution != None and distribution != 0):
+		scale = segments / distribution
+	for i in range(1, count - 1):
+		weights[i] = (FalloffValue(i / segments, falloff) - FalloffValue((i - 1) / segments, falloff)) * scale
+	return weights
+
+def EvaluateDistribution(eulers, weightsPerFrame, rotateOrder=0):
+	# Euler channels of the last locator per frame, weights per frame for each group
+	# Returns euler values per group per frame, rotation axis and angle come from the channels so turns above 180 degrees are distributed too
+	axisAngles = []
+	for euler in eulers:
+		axisAngles.append(Matrices.EulerToAxisAngle(euler, rotateOrder, axisAngles[-1][0] if len(axisAngles) > 0 else (1, 0, 0)))
+	
+	result = []
+	for group in range(len(weightsPerFrame[0]) if len(weightsPerFrame) > 0 else 0):
+		groupEulers = []
+		for frame in range(len(axisAngles)):
+			axis, angle = axisAngles[frame]
+			weight = weightsPerFrame[frame][group]
+			quaternion = Matrices.QuaternionFromAxisAngle(axis, angle * weight)
+			euler = Matrices.RotationToEuler(Matrices.QuaternionToRotation(quaternion), rotateOrder)
+			previous = groupEulers[-1] if len(groupEulers) > 0 else [value * weight for value in eulers[frame]]
+			groupEulers.append(Matrices.EulerContinuous(euler, previous))
+		result.append(groupEulers)
+	return result
@@ -23,193 +23,144 @@
 
 import maya.cmds as cmds
 
+from ..utils import Animation
+from ..utils import Baker
+from ..utils import ChainDistributionPlan
+from ..utils import Matrices
+from ..utils import Sampler
 from ..utils import Selector
 from ..utils import Text
-
-
-_locatorSize = 100
-_nameGroupMain = "grpChain_"
-_nameLocatorPrefix = "loc_"
-
-
-def CreateRigVariant1(locatorSize=_locatorSize, *args):
-	# Check selected objects
-	selectedList = Selector.MultipleObjects(minimalCount = 1)
-	if (selectedList == None):
-		return
-
-	timeCurrent = cmds.currentTime(query = True)
-	timeMin = cmds.playbackOptions(query = True, min = True)
-	timeMax = cmds.playbackOptions(query = True, max = True)
-	cmds.currentTime(timeMin, edit = True, update = True)
-
-	### Create a list of names from selected objects
-	selected = cmds.ls(selection = True)
-	
-	### Create main group as a container for all new objects
-	mainGroup = cmds.group(name = Text.SetUniqueFromText(_nameGroupMain + selected[-1]), empty = True)
-	
-	### Init empty lists for groups and locators
-	locators = []
-	constraintsForBake = []
+from ..utils import Timeline
+from ..values import Enums
+
+
+def ExecutePlan(plan, timeMin=None, timeMax=None):
+	# Build the planned rig under one undo chunk with refresh suspended, all bake targets are written by one computed bake
+	if (timeMin == None or timeMax == None):
+		timeMin, timeMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMin, timeMax)
+
+	cmds.undoInfo(openChunk = True, chunkName = "ChainDistributionRig")
+	cmds.refresh(suspend = True)
+	try:
+		with Timeline.KeepTime(): # maintained offsets are taken on the first frame, time moves in the DG context only
+			Timeline.SetTimeCurrent(timeMin, update = False)
+			_ExecutePlanSteps(plan, times)
+	finally:
+		cmds.refresh(suspend = False)
+		cmds.undoInfo(closeChunk = True)
+
+	if (plan.select != None):
+		cmds.select(plan.select, replace = True)
+	if (plan.warning != None):
+		cmds.warning(plan.warning)
+	return plan
+
+def _ExecutePlanSteps(plan, times):
+	# Scene changes of ExecutePlan in order, time and undo handling stay with the caller
+	### Nodes
+	for name, nodeType, parent in plan.nodes:
+		flags = {"name": name, "skipSelect": True}
+		if (parent != None):
+			flags["parent"] = parent
+		if (nodeType == Enums.Types.locator):
+			cmds.createNode(Enums.Types.transform, **flags)
+			cmds.createNode(Enums.Types.locator, name = name + Enums.Types.shape, parent = name, skipSelect = True)
+		else:
+			cmds.createNode(nodeType, **flags)
+	for plug, values, flags in plan.attributes:
+		cmds.setAttr(plug, *values, **flags)
+
+	### Single computed bake
+	if (len(plan.bake) > 0):
+		sources = []
+		for node, source, parentSource in plan.bake:
+			for item in (source, parentSource):
+				if (item != None and item not in sources):
+					sources.append(item)
+		sampled = Sampler.SampleMatchMatrices(sources, times)
+		identity = [Matrices.MatrixIdentity()] * len(times)
+		matricesByObject = {}
+		parentInverseMatrices = {}
+		for node, source, parentSource in plan.bake:
+			matricesByObject[node] = sampled[source]
+			parentInverseMatrices[node] = identity if parentSource == None else [Matrices.MatrixInverse(matrix) for matrix in sampled[parentSource]]
+		Baker.BakeWorldMatrices(matricesByObject, times, parentInverseMatrices = parentInverseMatrices)
+
+	### Constraints and connections
+	for command, drivers, driven, maintainOffset in plan.constraints:
+		getattr(cmds, command)(*(list(drivers) + [driven]), maintainOffset = maintainOffset)
+	for node, name, flags in plan.customAttributes:
+		cmds.addAttr(node, longName = name, **flags)
+		cmds.setAttr(node + "." + name, edit = True, keyable = True)
+	for source, destination in plan.connections:
+		cmds.connectAttr(source, destination)
+	if (len(plan.keys) > 0):
+		cmds.setKeyframe(plan.keys)
+	for source, destination in plan.connectionsAfterKeys:
+		cmds.connectAttr(source, destination)
+
+# DISTRIBUTION
+def GetDistributionGroups(locator):
+	# Distribution groups driven by the live layout of the last locator, sorted from chain root to tip
+	nodes = cmds.listConnections(locator + ".rotate", source = False, destination = True, type = "multiplyDivide") or []
+	if (len(nodes) == 0):
+		return None, []
+	node = nodes[0]
+	groups = cmds.listConnections(node + ".output", source = False, destination = True, type = Enums.Types.transform) or []
+	groups = sorted(set(cmds.ls(groups, long = True)), key = lambda item: item.count("|"))
+	return node, groups
+
+def BakeDistribution(locator=None, falloff="linear", timeMin=None, timeMax=None):
+	# Replace the live distribution by keys evaluated offline over the playback range
+	if (locator == None):
+		selectedList = Selector.MultipleObjects(minimalCount = 1)
+		if (selectedList == None):
+			return None
+		locator = selectedList[-1]
 	
-	### Count of selected objects
-	count = len(selected)
+	node, groups = GetDistributionGroups(locator)
+	if (node == None):
+		cmds.warning("No rotation distribution found on {0}".format(locator))
+		return None
 	
-	### Loop through each selected object, create groups, locators and parent them
-	for i in range(count):
-		### Create locator # TODO nurbs circle as control instead of locator (optional)
-		locator = cmds.spaceLocator(name = Text.SetUniqueFromText(_nameLocatorPrefix + selected[i]))[0]
-		locators.append(locator)
-		cmds.setAttr(locator + "Shape.localScaleX", locatorSize)
-		cmds.setAttr(locator + "Shape.localScaleY", locatorSize)
-		cmds.setAttr(locator + "Shape.localScaleZ", locatorSize)
-		
-		### Parent locator to group
-		cmds.parent(locator, mainGroup)
-
-		### Match group position and rotation
-		cmds.matchTransform(locator, selected[i], position = True, rotation = True, scale = False)
-
-		### Parent constraint groupFixed to original object
-		constraint = cmds.parentConstraint(selected[i], locator, maintainOffset = False)
-		constraintsForBake.append(constraint[0])
-
-	### Bake animation to locators and delete constraints
-	cmds.bakeResults(locators, time = (timeMin, timeMax), simulation = True, minimizeRotation = True)
-	cmds.delete(constraintsForBake)
-
-	### Constrain
-	for i in range(count):
-		cmds.pointConstraint(selected[i], locators[i], maintainOffset = False)
-		cmds.orientConstraint(locators[i], selected[i], maintainOffset = False)
-
-		if (i > 0 and i < count - 1):
-			cmds.orientConstraint(locators[0], locators[i], maintainOffset = True)
-			cmds.orientConstraint(locators[i + 1], locators[i], maintainOffset = True)
-
-	### Select last locator
-	cmds.select(locators[-1], replace = True)
-	cmds.currentTime(timeCurrent, edit = True, update = True)
-
-def CreateRigVariant2(locatorSize=_locatorSize, *args):
-	# Check selected objects
+	if (timeMin == None or timeMax == None):
+		timeMin, timeMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMin, timeMax)
+	count = len(groups) + 2
+	eulers = Sampler.SampleAttributes([locator], Enums.Attributes.rotateLong, times)[locator] # channels keep turns above 180 degrees
+	distributions = [None] * len(times)
+	if (cmds.attributeQuery(ChainDistributionPlan.nameAttributeWeight, node = locator, exists = True)):
+		plug = locator + "." + ChainDistributionPlan.nameAttributeWeight
+		distributions = [cmds.getAttr(plug, time = time) for time in times]
+	weightsPerFrame = [ChainDistributionPlan.GetDistributionWeights(count, falloff, distribution)[1:-1] for distribution in distributions]
+	groupEulers = ChainDistributionPlan.EvaluateDistribution(eulers, weightsPerFrame, cmds.getAttr(locator + "." + Enums.Attributes.rotateOrder))
+
+	for group, values in zip(groups, groupEulers):
+		cmds.disconnectAttr(node + ".output", group + ".rotate")
+		for axis in range(3):
+			Animation.WriteKeys(group, Enums.Attributes.rotateLong[axis], times, [value[axis] for value in values])
+	cmds.delete(node)
+	return groups
+
+def GetSelectedChain():
+	# Selected objects in selection order, a single selected object is expanded down its hierarchy
 	selectedList = Selector.MultipleObjects(minimalCount = 1)
 	if (selectedList == None):
-		return
-
-	### Objects names
-	nameGroupFixedPrefix = "grpFixed_"
-	nameGroupDistributedPrefix = "grpDistr_"
-	### Attributes names
-	nameAttributeWeight = "distribution"
-	nameAttributeGlobal = "global"
-	### Nodes names
-	nameMultiplyDivide = "gtMultiplyDivide"
-
-	### Create a list of names from selected objects
-	selected = cmds.ls(selection = True)
-	
-	### Create main group as a container for all new objects
-	mainGroup = cmds.group(name = Text.SetUniqueFromText(_nameGroupMain + selected[-1]), empty = True)
-	
-	### Init empty lists for groups and locators
-	groupsFixed = []
-	groupsDistributed = []
-	locators = []
-	constraintsForBake = []
-	
-	### Count of selected objects
-	count = len(selected)
-	
-	### Loop through each selected object, create groups, locators and parent them
-	for i in range(count):
-		### Create fixed group
-		groupFixed = cmds.group(name = Text.SetUniqueFromText(nameGroupFixedPrefix + selected[i]), empty = True)
-		groupsFixed.append(groupFixed)
-
-		### Create distribution group
-		groupDistributed = cmds.group(name = Text.SetUniqueFromText(nameGroupDistributedPrefix + selected[i]), empty = True)
-		groupsDistributed.append(groupDistributed)
-		
-		### Create locator # TODO use nurbs circle [circle -c 0 0 0 -nr 0 1 0 -sw 360 -r 1 -d 3 -ut 0 -tol 1e-05 -s 8 -ch 1; objectMoveCommand;]
-		locator = cmds.spaceLocator(name = Text.SetUniqueFromText(_nameLocatorPrefix + selected[i]))[0]
-		locators.append(locator)
-		cmds.setAttr(locator + "Shape.localScaleX", locatorSize)
-		cmds.setAttr(locator + "Shape.localScaleY", locatorSize)
-		cmds.setAttr(locator + "Shape.localScaleZ", locatorSize)
-		
-		### Parent locator to group
-		cmds.parent(locator, groupDistributed)
-		
-		### Parent group to corresponding hierarchy object
-		if i == 0:
-			cmds.parent(groupFixed, mainGroup)
-		else:
-			cmds.parent(groupFixed, locators[i - 1])
-		cmds.parent(groupDistributed, groupFixed)
-		
-		### Match group position and rotation
-		cmds.matchTransform(groupFixed, selected[i], position = True, rotation = True, scale = False)
-
-		### Parent constraint groupFixed to original object
-		constraint = cmds.parentConstraint(selected[i], groupFixed, maintainOffset = True)
-		constraintsForBake.append(constraint[0])
-
-	### Bake animation to locators and delete constraints
-	timeMin = cmds.playbackOptions(query = True, min = True)
-	timeMax = cmds.playbackOptions(query = True, max = True)
-	cmds.bakeResults(groupsFixed, time = (timeMin, timeMax), simulation = True, minimizeRotation = True)
-	cmds.delete(constraintsForBake)
-
-	### Parent constraint original objects to locators
-	for i in range(count):
-		cmds.parentConstraint(locators[i], selected[i], maintainOffset = True)
-	
-	### Show last locator Rotate Order and connect it to Distribution groups
-	cmds.setAttr(locators[-1] + ".rotateOrder", channelBox = True)
-	for i in range(count):
-		groupsDistributed[i]
-		cmds.connectAttr(locators[-1] + ".rotateOrder", groupsDistributed[i] + ".rotateOrder")
-	
-	### Check if selected count less than 3 objects and break function
-	if (count < 3):
-		cmds.warning("You have less than 3 objects selected. Rotation distribution will not be created")
-		return
-	
-	### Create weight attribute on last locator
-	cmds.addAttr(locators[-1], longName = nameAttributeWeight, attributeType = "double", defaultValue = count - 1)
-	cmds.setAttr(locators[-1] + "." + nameAttributeWeight, edit = True, keyable = True)
-	
-	### Create MultiplyDivide node
-	nodeMultiplyDivide = cmds.createNode("multiplyDivide", name = Text.SetUniqueFromText(nameMultiplyDivide))
-	cmds.setAttr(nodeMultiplyDivide + ".operation", 2)
-	
-	### Connect rotation and weight to MultiplyDivide node
-	cmds.connectAttr(locators[-1] + ".rotate", nodeMultiplyDivide + ".input1")
-	cmds.connectAttr(locators[-1] + "." + nameAttributeWeight, nodeMultiplyDivide + ".input2X")
-	cmds.connectAttr(locators[-1] + "." + nameAttributeWeight, nodeMultiplyDivide + ".input2Y")
-	cmds.connectAttr(locators[-1] + "." + nameAttributeWeight, nodeMultiplyDivide + ".input2Z")
-
-	### Connect rotation distribution to other locators' groups
-	for i in range(1, count - 1):
-		cmds.connectAttr(nodeMultiplyDivide + ".output", groupsDistributed[i] + ".rotate")
-	
-	### Add global attribute for last locator
-	cmds.addAttr(locators[-1], longName = nameAttributeGlobal, attributeType = "double", defaultValue = 0, minValue = 0, maxValue = 1)
-	cmds.setAttr(locators[-1] + "." + nameAttributeGlobal, edit = True, keyable = True)
-
-	### Create Orient Constraint for last locator
-	cmds.orientConstraint(mainGroup, groupsDistributed[-1], maintainOffset = True)[0]
+		return None
+	if (len(selectedList) == 1):
+		selectedList = Selector.GetHierarchyChain(selectedList[0], useCache = True)
+	return selectedList
 
-	### Show blend orient attribute by setting keys on constrained rotation attributes # I frankly don't know how to do it better
-	cmds.setKeyframe(groupsDistributed[-1] + ".rx")
-	cmds.setKeyframe(groupsDistributed[-1] + ".ry")
-	cmds.setKeyframe(groupsDistributed[-1] + ".rz")
-
-	### Connect Global attribute to blend orient attribute
-	cmds.connectAttr(locators[-1] + "." + nameAttributeGlobal, groupsDistributed[-1] + ".blendOrient1")
+def CreateRigVariant1(locatorSize=ChainDistributionPlan.locatorSize, *args):
+	selectedList = GetSelectedChain()
+	if (selectedList == None):
+		return None
+	return ExecutePlan(ChainDistributionPlan.PlanRigVariant1(selectedList, locatorSize, Text.UniqueNameAllocator().Reserve))
 
-	### Select last locator
-	cmds.select(locators[-1], replace = True)
+def CreateRigVariant2(locatorSize=ChainDistributionPlan.locatorSize, *args):
+	selectedList = GetSelectedChain()
+	if (selectedList == None):
+		return None
+	return ExecutePlan(ChainDistributionPlan.PlanRigVariant2(selectedList, locatorSize, Text.UniqueNameAllocator().Reserve))
 
@@ -114,24 +114,19 @@ def ConstrainAim(objectParent, objectChild, maintainOffset=True, weight=1, aimVe
 		cmds.aimConstraint(objectParent, objectChild, maintainOffset = maintainOffset, weight = weight, skip = "none", aimVector = aimVector, upVector = upVector, worldUpType = "objectrotation", worldUpVector = worldUpVector, worldUpObject = worldUpObject)
 
 def DeleteConstraints(selected):
-	# First pass
-	connections = Selector.GetConnectionsOfType(selected, type = Enums.Types.constraint, source = True, destination = False)
-	for item in connections:
-		if item is None:
-			continue
-		for connection in item:
-			if (not cmds.objExists(connection)):
-				continue
-			for constraint in Enums.Constraints.list:
-				if constraint in connection:
-					cmds.delete(connection)
-
-	# Second pass with checking child objects (if constraint exists but not connected)
-	children = Selector.GetChildrenOfType(selected, type = Enums.Types.constraint)
-	for i in range(len(selected)):
-		if children[i] is not None:
-			for child in children[i]:
-				cmds.delete(child)
+	# Connected constraints and constraint children (if constraint exists but not connected)
+	nodes = set()
+	for connections in Selector.GetConnectionsOfTypeBulk(selected, type = Enums.Types.constraint, source = True, destination = False).values():
+		nodes.update(connections)
+	for children in Selector.GetChildrenOfTypeBulk(selected, type = Enums.Types.constraint).values():
+		nodes.update(children)
+	if (len(nodes) == 0):
+		return
+	
+	# Keep known constraint types only and delete everything in one call
+	constraints = cmds.ls(list(nodes), type = list(Enums.Constraints.list), long = True)
+	if constraints:
+		cmds.delete(list(set(constraints)))
 def DeleteConstraintsOnSelected(*args):
 	selectedList = Selector.MultipleObjects(1)
 	if selectedList is None:
@@ -139,9 +134,9 @@ def DeleteConstraintsOnSelected(*args):
 	DeleteConstraints(selectedList)
 
 def DisconnectTargetsFromConstraint(selected):
-	connections = Selector.GetConnectionsOfType(selected, type = Enums.Types.constraint, source = True, destination = False)
+	connections = Selector.GetConnectionsOfTypeBulk(selected[-1:], type = Enums.Types.constraint, source = True, destination = False)
 	
-	if connections[-1] is None:
+	if selected[-1] not in connections:
 		cmds.warning("No constraints detected inside the last selected object")
 		return
 	
@@ -150,7 +145,7 @@ def DisconnectTargetsFromConstraint(selected):
 	cmds.RemoveConstraintTarget(selected[-1], selected[:-1])
 	
 	# 2. Custom
-	# for connection in connections[-1]:
+	# for connection in connections[selected[-1]]:
 	# 	for item in selected[:-1]:
 	# 		if (not cmds.objExists(connection)):
 	# 				continue
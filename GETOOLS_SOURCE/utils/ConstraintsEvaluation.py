@@ -0,0 +1,135 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+from ..utils import Matrices
+
+
+# Constraint math on sampled matrices, no Maya dependency.
+
+_axisLabels = ("x", "y", "z")
+
+
+def _SkipMask(skip):
+	if (skip == None or skip == "none"):
+		return (False, False, False)
+	if not isinstance(skip, (list, tuple)):
+		skip = (skip,)
+	return tuple(label in skip for label in _axisLabels)
+
+def _AimRotation(position, targetPosition, upDirection, aimVector, upVector):
+	aim = Matrices.VectorNormalize(Matrices.VectorSubtract(targetPosition, position))
+	if (Matrices.VectorLength(aim) == 0):
+		return None
+	worldFrame = Matrices.OrthonormalizeRotation((aim, upDirection, (0, 0, 0)))
+	localFrame = Matrices.OrthonormalizeRotation((aimVector, upVector, (0, 0, 0)))
+	return Matrices.RotationMultiply(Matrices.RotationTranspose(localFrame), worldFrame)
+
+def EvaluateConstraint(targetsMatrices, childMatrices, parentInverseMatrices=None, weights=None, rotateOrder=0, maintainOffset=False, parent=True, point=False, orient=False, scale=False, aim=False, skipTranslate=None, skipRotate=None, skipScale=None, aimVector=(1, 0, 0), upVector=(0, 1, 0), worldUpVector=(0, 1, 0), worldUpMatrices=None):
+	# targetsMatrices - list of world matrices per frame for each target
+	# childMatrices - world matrices per frame of the constrained object without constraint
+	# parentInverseMatrices - parent inverse matrices per frame of the constrained object, world space result if None
+	# worldUpMatrices - optional world matrices per frame, worldUpVector is rotated by them like "objectrotation" up type
+	# Offsets for maintainOffset are calculated on the first frame, like a constraint created on the first frame
+	# Returns (translate, rotate, scale) values per frame, rotation in degrees with the given rotate order
+	countTargets = len(targetsMatrices)
+	if (weights == None):
+		weights = [1.0] * countTargets
+	maskTranslate = _SkipMask(skipTranslate)
+	maskRotate = _SkipMask(skipRotate)
+	maskScale = _SkipMask(skipScale)
+
+	offsetsMatrix = [Matrices.MatrixIdentity()] * countTargets
+	offsetsTranslate = [(0, 0, 0)] * countTargets
+	offsetsRotate = [None] * countTargets
+	offsetsScale = [(1, 1, 1)] * countTargets
+	offsetAim = None
+
+	result = []
+	for frame in range(len(childMatrices)):
+		childWorld = childMatrices[frame]
+		parentInverse = Matrices.MatrixIdentity() if parentInverseMatrices == None else parentInverseMatrices[frame]
+		childTranslate, childRotation, childScale = Matrices.MatrixDecompose(childWorld)
+		targetsDecomposed = [Matrices.MatrixDecompose(matrices[frame]) for matrices in targetsMatrices]
+
+		# Offsets
+		if (frame == 0 and maintainOffset):
+			for i in range(countTargets):
+				targetMatrix = targetsMatrices[i][0]
+				targetTranslate, targetRotation, targetScale = targetsDecomposed[i]
+				offsetsMatrix[i] = Matrices.MatrixMultiply(childWorld, Matrices.MatrixInverse(targetMatrix))
+				offsetsTranslate[i] = Matrices.VectorSubtract(childTranslate, targetTranslate)
+				offsetsRotate[i] = Matrices.RotationMultiply(childRotation, Matrices.RotationTranspose(targetRotation))
+				offsetsScale[i] = tuple(childScale[axis] / targetScale[axis] if targetScale[axis] != 0 else 1.0 for axis in range(3))
+
+		# World space result
+		translate = childTranslate
+		rotation = childRotation
+		scaleValues = childScale
+		if (parent):
+			translations = []
+			quaternions = []
+			for i in range(countTargets):
+				matrix = Matrices.MatrixMultiply(offsetsMatrix[i], targetsMatrices[i][frame])
+				matrixTranslate, matrixRotation, matrixScale = Matrices.MatrixDecompose(matrix)
+				translations.append(matrixTranslate)
+				quaternions.append(Matrices.QuaternionFromRotation(matrixRotation))
+			translate = Matrices.VectorWeightedAverage(translations, weights)
+			rotation = Matrices.QuaternionToRotation(Matrices.QuaternionWeightedAverage(quaternions, weights))
+		else:
+			if (point):
+				translations = [Matrices.VectorAdd(targetsDecomposed[i][0], offsetsTranslate[i]) for i in range(countTargets)]
+				translate = Matrices.VectorWeightedAverage(translations, weights)
+			if (orient):
+				quaternions = []
+				for i in range(countTargets):
+					targetRotation = targetsDecomposed[i][1]
+					if (offsetsRotate[i] != None):
+						targetRotation = Matrices.RotationMultiply(offsetsRotate[i], targetRotation)
+					quaternions.append(Matrices.QuaternionFromRotation(targetRotation))
+				rotation = Matrices.QuaternionToRotation(Matrices.QuaternionWeightedAverage(quaternions, weights))
+		if (scale):
+			scales = [tuple(targetsDecomposed[i][2][axis] * offsetsScale[i][axis] for axis in range(3)) for i in range(countTargets)]
+			scaleValues = Matrices.VectorWeightedAverage(scales, weights)
+		if (aim):
+			targetPosition = Matrices.VectorWeightedAverage([item[0] for item in targetsDecomposed], weights)
+			upDirection = worldUpVector
+			if (worldUpMatrices != None):
+				upDirection = Matrices.VectorRotate(worldUpVector, Matrices.MatrixDecompose(worldUpMatrices[frame])[1])
+			aimRotation = _AimRotation(translate, targetPosition, upDirection, aimVector, upVector)
+			if (aimRotation != None):
+				if (frame == 0 and maintainOffset):
+					offsetAim = Matrices.RotationMultiply(childRotation, Matrices.RotationTranspose(aimRotation))
+				rotation = aimRotation if offsetAim == None else Matrices.RotationMultiply(offsetAim, aimRotation)
+
+		# Convert to local space and apply skipped axes
+		world = Matrices.MatrixCompose(translate, rotation, scaleValues)
+		localTranslate, localRotation, localScale = Matrices.MatrixDecompose(Matrices.MatrixMultiply(world, parentInverse))
+		childLocalTranslate, childLocalRotation, childLocalScale = Matrices.MatrixDecompose(Matrices.MatrixMultiply(childWorld, parentInverse))
+		localRotate = Matrices.RotationToEuler(localRotation, rotateOrder)
+		childLocalRotate = Matrices.RotationToEuler(childLocalRotation, rotateOrder)
+		result.append((
+			tuple(childLocalTranslate[axis] if maskTranslate[axis] else localTranslate[axis] for axis in range(3)),
+			tuple(childLocalRotate[axis] if maskRotate[axis] else localRotate[axis] for axis in range(3)),
+			tuple(childLocalScale[axis] if maskScale[axis] else localScale[axis] for axis in range(3)),
+			))
+	return result
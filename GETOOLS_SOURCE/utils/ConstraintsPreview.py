@@ -0,0 +1,72 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+import maya.cmds as cmds
+
+from ..utils import Animation
+from ..utils import ConstraintsEvaluation
+from ..utils import Locators
+from ..utils import Sampler
+from ..utils import Selector
+from ..utils import Text
+from ..utils import Timeline
+from ..values import Enums
+
+
+_nameGhost = "ghost"
+
+
+# PREVIEW
+def PreviewSelectedToLastObject(reverse=False, maintainOffset=True, parent=True, point=False, orient=False, scale=False, aim=False, weight=1):
+	# Create ghost locators with baked result of the constraint, constraint nodes are not created
+	selected = Selector.MultipleObjects(2)
+	if selected is None:
+		return None
+	if reverse:
+		selected.reverse()
+
+	timeMinMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	matrices = Sampler.SamplePivotMatrices(selected, times) # constraints drive rotate pivots, not object origins
+
+	ghosts = []
+	for item in selected[:-1]:
+		values = ConstraintsEvaluation.EvaluateConstraint(
+			targetsMatrices = [matrices[selected[-1]]],
+			childMatrices = matrices[item],
+			weights = [weight],
+			maintainOffset = maintainOffset,
+			parent = parent,
+			point = point,
+			orient = orient,
+			scale = scale,
+			aim = aim,
+			)
+		ghost = Locators.Create(name = Text.GetShortName(item, removeSpaces = True) + "_" + _nameGhost)
+		for index, attributes in enumerate((Enums.Attributes.translateLong, Enums.Attributes.rotateLong, Enums.Attributes.scaleLong)):
+			for axis in range(3):
+				Animation.WriteKeys(ghost, attributes[axis], times, [value[index][axis] for value in values])
+		ghosts.append(ghost)
+	
+	cmds.select(ghosts, replace = True)
+	return ghosts
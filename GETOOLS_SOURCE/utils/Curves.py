@@ -23,12 +23,19 @@
 
 import maya.cmds as cmds
 
+from ..utils import Matrices
+from ..utils import Sampler
 from ..utils import Selector
-from ..values import Enums
+from ..utils import Text
+from ..utils import Timeline
 
 
 _curveName = "newCurve"
 _curveDegree = 1
+_trajectorySuffix = "_trajectory"
+_trajectoryStep = 1
+_trajectoryDegree = 3
+_trajectoryTolerance = 0.1
 
 
 def CreateCurveFromSelectedObjects(*args):
@@ -46,40 +53,68 @@ def CreateCurveFromSelectedObjects(*args):
 	curve = cmds.curve(name = _curveName, degree = _curveDegree, point = positions)
 	return curve
 
-def CreateCurveFromTrajectory(*args): # TODO rework
-	### Variables
-	step = 1
-	degree = 3
+def CreateCurveFromTrajectory(*args):
+	# Check selected objects
+	selectedList = Selector.MultipleObjects(1)
+	if (selectedList == None):
+		return None
+	return CreateCurvesFromTrajectories(selectedList)
+def CreateCurveFromTrajectoryReduced(*args):
+	# Check selected objects
+	selectedList = Selector.MultipleObjects(1)
+	if (selectedList == None):
+		return None
+	return CreateCurvesFromTrajectories(selectedList, tolerance = _trajectoryTolerance)
+
+def CreateCurvesFromTrajectories(objects, step=_trajectoryStep, degree=_trajectoryDegree, tolerance=0, timeMin=None, timeMax=None):
+	# World positions of all objects are sampled in one pass over the range, no motion trail is created
+	# With tolerance points closer than tolerance to the simplified path are dropped and the curve goes through the remaining points
+	if (timeMin == None or timeMax == None):
+		timeMin, timeMax = Timeline.GetTimeMinMax()
+	positions = Sampler.SamplePositions(objects, Sampler.GetTimes(timeMin, timeMax, step))
 	
-	### Names
-	mtName = "newMotionTrail"
-	mtFinalName = mtName + Enums.MotionTrail.handle
-	curveName = "testCurve"
-
-
-	### Get time start/end
-	start = cmds.playbackOptions(query = 1, min = 1)
-	end = cmds.playbackOptions(query = 1, max = 1)
+	curves = []
+	allocator = Text.UniqueNameAllocator()
+	for item in objects:
+		points = positions[item]
+		if (tolerance > 0):
+			points = SimplifyPolyline(points, tolerance)
+		if (len(points) < 2):
+			continue
+		name = allocator.Reserve(Text.GetShortName(item, removeSpaces = True) + _trajectorySuffix)
+		if (tolerance > 0 and len(points) > 2):
+			curves.append(cmds.curve(name = name, degree = min(degree, len(points) - 1), editPoint = points))
+		else:
+			curves.append(cmds.curve(name = name, degree = min(degree, len(points) - 1), point = points))
 	
-	### Create motion trail
-	cmds.snapshot(name = mtName, motionTrail = 1, increment = step, startTime = start, endTime = end)
-
-	### Get points from motion trail
-	cmds.select(mtFinalName, replace = 1)
-	selected = cmds.ls(selection = 1, dagObjects = 1, exactType = Enums.MotionTrail.snapshotShape)
-	pts = cmds.getAttr(selected[0] + "." + Enums.MotionTrail.pts)
-	size = len(pts)
-	for i in range(size):
-		pts[i] = pts[i][0:3]
-		#print "{0}: {1}".format(i, pts[i])
-
-	### Create curve
-	newCurve = cmds.curve(name = curveName, degree = degree, point = pts)
-
-	### End
-	cmds.delete(mtFinalName)
-	cmds.select(clear = 1)
-
-	return newCurve
-
+	cmds.select(curves, replace = True)
+	return curves
+
+def SimplifyPolyline(points, tolerance):
+	# Douglas-Peucker, iterative so long trajectories do not hit the recursion limit
+	if (len(points) < 3):
+		return list(points)
+	keep = [False] * len(points)
+	keep[0] = keep[-1] = True
+	stack = [(0, len(points) - 1)]
+	while (len(stack) > 0):
+		first, last = stack.pop()
+		segment = Matrices.VectorSubtract(points[last], points[first])
+		lengthSquared = Matrices.VectorDot(segment, segment)
+		distanceMax = 0
+		indexMax = None
+		for i in range(first + 1, last):
+			offset = Matrices.VectorSubtract(points[i], points[first])
+			if (lengthSquared > 0):
+				weight = max(0.0, min(1.0, Matrices.VectorDot(offset, segment) / lengthSquared))
+				offset = Matrices.VectorSubtract(offset, Matrices.VectorScale(segment, weight))
+			distance = Matrices.VectorLength(offset)
+			if (distance > distanceMax):
+				distanceMax = distance
+				indexMax = i
+		if (indexMax != None and distanceMax > tolerance):
+			keep[indexMax] = True
+			stack.append((first, indexMax))
+			stack.append((indexMax, last))
+	return [points[i] for i in range(len(points)) if keep[i]]
 
@@ -293,6 +293,8 @@ def ToShelf_CreateCurveFromTrajectory(path, *args):
 # MOTION TRAIL
 def ToShelf_MotionTrailCreate(path, *args):
 	MoveToShelf(path, ReadFunctionAsString(CodeSamples.MotionTrailCreate), "MotionTrailCreate", "MTCreate")
+def ToShelf_MotionTrailUpdate(path, *args):
+	MoveToShelf(path, ReadFunctionAsString(CodeSamples.MotionTrailUpdate), "MotionTrailUpdate", "MTUpdate")
 def ToShelf_MotionTrailSelect(path, *args):
 	MoveToShelf(path, ReadFunctionAsString(CodeSamples.MotionTrailSelect), "MotionTrailSelect", "MTSelect")
 def ToShelf_MotionTrailDelete(path, *args):
@@ -26,9 +26,11 @@ import maya.cmds as cmds
 from ..utils import Animation
 from ..utils import Baker
 from ..utils import Constraints
-from ..utils import Parent
+from ..utils import Matrices
+from ..utils import Sampler
 from ..utils import Selector
 from ..utils import Text
+from ..utils import Timeline
 from ..values import Enums
 
 
@@ -39,52 +41,48 @@ _minSelectedCount = 1
 
 
 # SIZE
+def GetLocatorShapes(objects):
+	# All locator shapes of objects with one query
+	if (objects == None or len(objects) == 0):
+		return []
+	return cmds.listRelatives(objects, shapes = True, type = Enums.Types.locator, fullPath = True) or []
+def GetSizes(shapes):
+	return [cmds.getAttr(shape + "." + Enums.Attributes.scaleLocalCompound)[0] for shape in shapes]
+def SetSizes(shapes, values):
+	if any(0 in value for value in values):
+		cmds.warning("Target locator scale is ZERO. The lLocator scaler may have problems.")
+	for i in range(len(shapes)):
+		cmds.setAttr(shapes[i] + "." + Enums.Attributes.scaleLocalCompound, values[i][0], values[i][1], values[i][2])
+
 def GetSize(locator):
-	shape = cmds.listRelatives(locator, shapes = True, type = Enums.Types.locator)[0]
-	if (shape != None):
-		return (
-			cmds.getAttr(shape + "." + Enums.Attributes.scaleLocal[0]),
-			cmds.getAttr(shape + "." + Enums.Attributes.scaleLocal[1]),
-			cmds.getAttr(shape + "." + Enums.Attributes.scaleLocal[2]),
-			)
-	else:
+	shapes = GetLocatorShapes([locator])
+	if (len(shapes) == 0):
 		return None
+	return GetSizes(shapes[:1])[0]
 def SetSize(locator, valueX, valueY, valueZ):
-	if (valueX == 0 or valueY == 0 or valueZ == 0):
-		cmds.warning("Target locator scale is ZERO. The lLocator scaler may have problems.")
-	shape = cmds.listRelatives(locator, shapes = True, type = Enums.Types.locator)[0]
-	if (shape != None):
-		cmds.setAttr(shape + "." + Enums.Attributes.scaleLocal[0], valueX)
-		cmds.setAttr(shape + "." + Enums.Attributes.scaleLocal[1], valueY)
-		cmds.setAttr(shape + "." + Enums.Attributes.scaleLocal[2], valueZ)
-		return True
-	else:
+	shapes = GetLocatorShapes([locator])
+	if (len(shapes) == 0):
 		return False
+	SetSizes(shapes[:1], [(valueX, valueY, valueZ)])
+	return True
 def ScaleSize(locator, valueX, valueY, valueZ):
 	size = GetSize(locator)
-	sizeX = size[0] * valueX
-	sizeY = size[1] * valueY
-	sizeZ = size[2] * valueZ
-	SetSize(locator, sizeX, sizeY, sizeZ)
+	SetSize(locator, size[0] * valueX, size[1] * valueY, size[2] * valueZ)
 
 def SelectedLocatorsSizeScale(value, *args):
 	selectedList = Selector.MultipleObjects(1)
 	if (selectedList == None):
 		return None
 	
-	for item in selectedList:
-		shape = cmds.listRelatives(item, shapes = True, type = Enums.Types.locator)[0]
-		if (shape != None):
-			ScaleSize(item, value, value, value)
+	shapes = GetLocatorShapes(selectedList)
+	SetSizes(shapes, [(size[0] * value, size[1] * value, size[2] * value) for size in GetSizes(shapes)])
 def SelectedLocatorsSizeSet(value, *args):
 	selectedList = Selector.MultipleObjects(1)
 	if (selectedList == None):
 		return None
 	
-	for item in selectedList:
-		shape = cmds.listRelatives(item, shapes = True, type = Enums.Types.locator)[0]
-		if (shape != None):
-			SetSize(item, value, value, value)
+	shapes = GetLocatorShapes(selectedList)
+	SetSizes(shapes, [(value, value, value)] * len(shapes))
 
 # CREATE
 def Create(name=_nameBase, scale=_scale, hideParent=False, subLocator=False):
@@ -105,46 +103,62 @@ def Create(name=_nameBase, scale=_scale, hideParent=False, subLocator=False):
 		return locatorCurrent, subLocator
 	else:
 		return locatorCurrent
-def CreateOnSelected(name=_nameBase, scale=_scale, minSelectedCount=_minSelectedCount, hideParent=False, subLocator=False, constraint=False, bake=False, parentToLastSelected=False, constrainReverse=False, constrainTranslate=True, constrainRotate=True, euler=False):
+def CreateBatch(names, scale=_scale, hideParent=False, subLocator=False, matrices=None, allocator=None):
+	# Create many locators without selection changes, matrices are optional world matrices for placement
+	# Pass the same allocator to keep names of several batches consistent before nodes exist
+	if (allocator == None):
+		allocator = Text.UniqueNameAllocator()
+	locatorsList = Text.SetUniqueFromTextList(names, allocator)
+	sublocatorsList = []
+	if subLocator:
+		sublocatorsList = Text.SetUniqueFromTextList([item + "Secondary" for item in locatorsList], allocator)
+
+	for i in range(len(locatorsList)):
+		cmds.createNode(Enums.Types.transform, name = locatorsList[i], skipSelect = True)
+		shape = cmds.createNode(Enums.Types.locator, name = locatorsList[i] + Enums.Types.shape, parent = locatorsList[i], skipSelect = True)
+		cmds.setAttr(shape + "." + Enums.Attributes.scaleLocalCompound, scale, scale, scale)
+		if hideParent:
+			cmds.setAttr(shape + "." + Enums.Attributes.visibility, 0)
+		if subLocator:
+			cmds.createNode(Enums.Types.transform, name = sublocatorsList[i], parent = locatorsList[i], skipSelect = True)
+			shape = cmds.createNode(Enums.Types.locator, name = sublocatorsList[i] + Enums.Types.shape, parent = sublocatorsList[i], skipSelect = True)
+			cmds.setAttr(shape + "." + Enums.Attributes.scaleLocalCompound, scale, scale, scale)
+
+		if (matrices != None):
+			translation, rotation = Matrices.MatrixDecompose(matrices[i])[:2]
+			cmds.setAttr(locatorsList[i] + ".translate", *translation)
+			cmds.setAttr(locatorsList[i] + ".rotate", *Matrices.RotationToEuler(rotation))
+
+	return locatorsList, sublocatorsList
+def GetWorldMatricesForMatch(objects):
+	# World matrices with rotate pivot position, same placement as matchTransform without scale
+	result = []
+	for item in objects:
+		matrix = cmds.getAttr(item + "." + Enums.Attributes.worldMatrix)
+		matrix[12:15] = cmds.xform(item, query = True, worldSpace = True, rotatePivot = True)
+		result.append(matrix)
+	return result
+def CreateOnSelected(name=_nameBase, scale=_scale, minSelectedCount=_minSelectedCount, hideParent=False, subLocator=False, constraint=False, bake=False, parentToLastSelected=False, constrainReverse=False, constrainTranslate=True, constrainRotate=True, euler=False, allocator=None):
 	# Check selected objects
 	selectedList = Selector.MultipleObjects(minSelectedCount)
 	if (selectedList == None):
 		return None
 	
-	locatorsList = []
-	sublocatorsList = []
-
 	# Create locators on selected
-	for item in selectedList:
-		nameCurrent = Text.GetShortName(item, removeSpaces = True) + "_" + name
-		created = Create(name = nameCurrent, scale = scale, hideParent = hideParent, subLocator = subLocator)
-		if subLocator:
-			locatorsList.append(created[0])
-			sublocatorsList.append(created[1])
-		else:
-			locatorsList.append(created)
-		cmds.matchTransform(locatorsList[-1], item, position = True, rotation = True, scale = False)
+	names = [Text.GetShortName(item, removeSpaces = True) + "_" + name for item in selectedList]
+	locatorsList, sublocatorsList = CreateBatch(names, scale = scale, hideParent = hideParent, subLocator = subLocator, matrices = GetWorldMatricesForMatch(selectedList), allocator = allocator)
 
-	# Constrain locators to selected objects
-	if (constraint):
+	# Constrain locators to selected objects, new locators have no locked channels to check
+	if (constraint and not bake):
 		for i in range(len(selectedList)):
-			Constraints.ConstrainSecondToFirstObject(selectedList[i], locatorsList[i], maintainOffset = False)
+			cmds.parentConstraint(selectedList[i], locatorsList[i], maintainOffset = False)
 
-	# Parent locators to last or to last sublocator
+	# Bake computed placements directly, the same result as a baked parent constraint
 	if (bake):
-		if (parentToLastSelected):
-			if subLocator:
-				locatorsListWithLastSub = locatorsList[:-1]
-				locatorsListWithLastSub.append(sublocatorsList[-1])
-				Parent.ListToLastObjects(locatorsListWithLastSub)
-			else:
-				Parent.ListToLastObjects(locatorsList)
-
-		# Bake locators and delete constraints
-		cmds.select(locatorsList)
-		Baker.BakeSelected(euler = euler)
-		Animation.DeleteStaticCurves()
-		Constraints.DeleteConstraints(locatorsList)
+		parentTarget = None
+		if (parentToLastSelected and len(locatorsList) > 1):
+			parentTarget = sublocatorsList[-1] if subLocator else locatorsList[-1]
+		BakeOnObjects(selectedList, locatorsList, parentTarget = parentTarget, euler = euler)
 
 	# Reverse constrain original objects to new locators
 	if constrainReverse:
@@ -162,6 +176,21 @@ def CreateOnSelected(name=_nameBase, scale=_scale, minSelectedCount=_minSelected
 	else:
 		cmds.select(locatorsList)
 		return selectedList, locatorsList
+def BakeOnObjects(objects, locators, parentTarget=None, euler=False):
+	# Locators get rotate pivot placement of objects for the playback range
+	# Parent target is the last locator or a node aligned with it, all other locators become its children
+	timeMinMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	matrices = Sampler.SampleMatchMatrices(objects, times)
+	matricesByLocator = dict((locators[i], matrices[objects[i]]) for i in range(len(objects)))
+	parentInverseByLocator = dict((locator, [Matrices.MatrixIdentity()] * len(times)) for locator in locators)
+	if (parentTarget != None):
+		cmds.parent(locators[:-1], parentTarget)
+		spaceInverse = [Matrices.MatrixInverse(matrix) for matrix in matrices[objects[-1]]]
+		for locator in locators[:-1]:
+			parentInverseByLocator[locator] = spaceInverse
+	Baker.BakeWorldMatrices(matricesByLocator, times, parentInverseMatrices = parentInverseByLocator, euler = euler)
+	Animation.DeleteStaticCurvesOnObjects(locators)
 def CreateAndBakeAsChildrenFromLastSelected(scale=_scale, minSelectedCount=2, hideParent=False, subLocator=False, constraintReverse=False, skipLastReverse=True, euler=False):
 	# Check selected objects
 	objects = CreateOnSelected(scale = scale, minSelectedCount = minSelectedCount, hideParent = hideParent, subLocator = subLocator, constraint = True, bake = True, parentToLastSelected = True, euler = euler)
@@ -184,75 +213,105 @@ def CreateAndBakeAsChildrenFromLastSelected(scale=_scale, minSelectedCount=2, hi
 	else:
 		cmds.select(objects[1][-1])
 	return objects
-def CreateOnSelectedAim(name=_nameAim, scale=_scale, minSelectedCount=_minSelectedCount, hideParent=False, subLocator=False, rotateOnly=False, vectorAim=(1,0,0), distance=100, reverse=True, euler=False):
-	# Check selected objects
-	objects = CreateOnSelected(name = name, scale = scale, minSelectedCount = minSelectedCount, hideParent = hideParent, subLocator = subLocator, euler = euler)
+def CreateAndBakeInSpace(objects, spaceObject, scale=_scale, euler=False):
+	# Computed version of CreateAndBakeAsChildrenFromLastSelected, no constraints and no playback
+	# Space locator follows spaceObject in world, other locators get object transforms relative to spaceObject
+	timeMinMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	selectedList = list(objects) + [spaceObject]
+	matrices = Sampler.SampleMatchMatrices(selectedList, times) # locators sit on rotate pivots, the same as constraints without offset
+	
+	names = [Text.GetShortName(item, removeSpaces = True) + "_" + _nameBase for item in selectedList]
+	locatorsList = CreateBatch(names, scale = scale)[0]
+	cmds.parent(locatorsList[:-1], locatorsList[-1])
+	
+	identity = [Matrices.MatrixIdentity()] * len(times)
+	spaceInverse = [Matrices.MatrixInverse(matrix) for matrix in matrices[spaceObject]]
+	matricesByLocator = dict((locatorsList[i], matrices[selectedList[i]]) for i in range(len(selectedList)))
+	parentInverseByLocator = dict((locator, spaceInverse) for locator in locatorsList[:-1])
+	parentInverseByLocator[locatorsList[-1]] = identity
+	Baker.BakeWorldMatrices(matricesByLocator, times, parentInverseMatrices = parentInverseByLocator, euler = euler)
+	cmds.select(locatorsList[-1], replace = True)
+	return selectedList, locatorsList
+def BakeBackFromLocators(objects, locators, preserveOutsideKeys=True, euler=False):
+	# Write world transforms of locators back to rotate pivots of objects, constraints on objects are removed
+	timeMinMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	matrices = Sampler.SampleMatchMatrices(locators, times)
+	Constraints.DeleteConstraints(objects)
+	Baker.BakeWorldMatrices(dict((objects[i], matrices[locators[i]]) for i in range(len(objects))), times, preserveOutsideKeys = preserveOutsideKeys, euler = euler)
+def CreateOnSelectedAim(name=_nameAim, scale=_scale, minSelectedCount=_minSelectedCount, hideParent=False, subLocator=False, rotateOnly=False, vectorAim=(1,0,0), distance=100, reverse=True, euler=False, live=True):
+	# Returns (objects, aim groups, locators, offset locators, target locators, up locators), groups and offsets are empty lists without live rig
+	# Check selected objects, one allocator names every node of the rig
+	allocator = Text.UniqueNameAllocator()
+	objects = CreateOnSelected(name = name, scale = scale, minSelectedCount = minSelectedCount, hideParent = hideParent, subLocator = subLocator, euler = euler, allocator = allocator)
 	if (objects == None):
 		return None
+	count = len(objects[0])
 	
-	# Create aim locators
+	# Create target and up locators, live rig also needs aim groups and offset locators
+	locatorsTargetsList = CreateBatch([item + "Target" for item in objects[1]], scale = scale, allocator = allocator)[0]
+	locatorsUpList = CreateBatch([item + "Up" for item in objects[1]], scale = scale, allocator = allocator)[0]
 	groupsList = []
 	locatorsOffsetsList = []
-	locatorsTargetsList = []
-	locatorsUpList = []
-	for i in range(len(objects[0])):
-		aimGroup = cmds.group(empty = True, name = objects[0][i] + "_AimGroup")
-		locOffset = Create(name = objects[1][i] + "Offset", scale = scale)
-		locTarget = Create(name = objects[1][i] + "Target", scale = scale)
-		locUp = Create(name = objects[1][i] + "Up", scale = scale)
-
-		cmds.matchTransform(locOffset, objects[1][i], position = True, rotation = True, scale = False)
-		cmds.matchTransform(locTarget, objects[1][i], position = True, rotation = True, scale = False)
-		cmds.matchTransform(locUp, objects[1][i], position = True, rotation = True, scale = False)
-
-		cmds.parent(objects[1][i], aimGroup)
-		cmds.parent(locOffset, objects[1][i])
-		cmds.parent(locTarget, aimGroup)
-		cmds.parent(locUp, aimGroup)
-
-		if subLocator:
-			cmds.matchTransform(objects[2][i], locOffset, position = True, rotation = True, scale = False)
-			cmds.parent(objects[2][i], locOffset)
-		
-		aimVectorScaled = (
-			vectorAim[0] * distance,
-			vectorAim[1] * distance,
-			vectorAim[2] * distance,
-			)
-		cmds.move(aimVectorScaled[0], aimVectorScaled[1], aimVectorScaled[2], locTarget, relative = True, objectSpace = True, worldSpaceDistance = True)
-		cmds.move(aimVectorScaled[2], aimVectorScaled[0], aimVectorScaled[1], locUp, relative = True, objectSpace = True, worldSpaceDistance = True)
-
-		groupsList.append(aimGroup)
-		locatorsOffsetsList.append(locOffset)
-		locatorsTargetsList.append(locTarget)
-		locatorsUpList.append(locUp)
+	if live:
+		locatorsOffsetsList = CreateBatch([item + "Offset" for item in objects[1]], scale = scale, allocator = allocator)[0]
+		for i in range(count):
+			aimGroup = cmds.group(empty = True, name = allocator.Reserve(objects[0][i] + "_AimGroup"))
+			groupsList.append(aimGroup)
+			cmds.parent(objects[1][i], locatorsTargetsList[i], locatorsUpList[i], aimGroup)
+			cmds.parent(locatorsOffsetsList[i], objects[1][i], relative = True)
+			if subLocator:
+				cmds.parent(objects[2][i], locatorsOffsetsList[i], relative = True)
 
-		Constraints.ConstrainListToLastElement(selected = (objects[1][i], objects[0][i]), parent = False, point = True, orient = True)
-		Constraints.ConstrainListToLastElement(selected = (locTarget, objects[0][i]))
-		Constraints.ConstrainListToLastElement(selected = (locUp, objects[0][i]))
-		
-	# Bake animation from original objects
-	cmds.select(objects[1] + locatorsTargetsList, replace = True)
-	cmds.select(objects[1] + locatorsUpList, add = True)
-	Baker.BakeSelected(euler = euler)
-	Constraints.DeleteConstraints(objects[1])
-	Constraints.DeleteConstraints(locatorsTargetsList)
-	Constraints.DeleteConstraints(locatorsUpList)
-	Animation.DeleteStaticCurves()
+	# Compute trajectories from sampled world matrices and bake them directly
+	aimVectorScaled = Matrices.VectorScale(vectorAim, distance)
+	upVectorScaled = (aimVectorScaled[2], aimVectorScaled[0], aimVectorScaled[1])
+	timeMinMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMinMax[0], timeMinMax[1])
+	matrices = Sampler.SampleMatrices(objects[0], times)
+	for i in range(count):
+		translations = []
+		rotations = []
+		targets = []
+		ups = []
+		pivot = cmds.getAttr(objects[0][i] + ".rotatePivot")[0] # same point as used by point constraint
+		for matrix in matrices[objects[0][i]]:
+			rotation = Matrices.MatrixDecompose(matrix)[1]
+			translation = Matrices.PointTransform(pivot, matrix)
+			rotate = Matrices.RotationToEuler(rotation)
+			if (len(rotations) > 0):
+				rotate = Matrices.EulerUnwrap(rotate, rotations[-1]) if euler else Matrices.EulerContinuous(rotate, rotations[-1])
+			translations.append(translation)
+			rotations.append(rotate)
+			targets.append(Matrices.VectorAdd(translation, Matrices.VectorRotate(aimVectorScaled, rotation)))
+			ups.append(Matrices.VectorAdd(translation, Matrices.VectorRotate(upVectorScaled, rotation)))
+		for axis in range(3):
+			Animation.WriteKeys(objects[1][i], Enums.Attributes.translateLong[axis], times, [value[axis] for value in translations])
+			Animation.WriteKeys(objects[1][i], Enums.Attributes.rotateLong[axis], times, [value[axis] for value in rotations])
+			Animation.WriteKeys(locatorsTargetsList[i], Enums.Attributes.translateLong[axis], times, [value[axis] for value in targets])
+			Animation.WriteKeys(locatorsUpList[i], Enums.Attributes.translateLong[axis], times, [value[axis] for value in ups])
+	
+	Animation.DeleteStaticCurvesOnObjects(objects[1] + locatorsTargetsList + locatorsUpList)
+	
+	# Lightweight mode, trajectories only
+	if (not live):
+		cmds.select(locatorsTargetsList)
+		return objects[0], groupsList, objects[1], locatorsOffsetsList, locatorsTargetsList, locatorsUpList
 
 	# Create aim constraint
-	for i in range(len(objects[0])):
-		if vectorAim[0] is not 0:
+	for i in range(count):
+		if vectorAim[0] != 0:
 			vectorUp = (0, 1, 0)
-		elif vectorAim[1] is not 0:
+		elif vectorAim[1] != 0:
 			vectorUp = (0, 0, 1)
-		elif vectorAim[2] is not 0:
+		elif vectorAim[2] != 0:
 			vectorUp = (1, 0, 0)
 		cmds.aimConstraint(locatorsTargetsList[i], locatorsOffsetsList[i], maintainOffset = True, weight = 1, aimVector = vectorAim, upVector = vectorUp, worldUpType = "object", worldUpObject = locatorsUpList[i])
 	
 	# Reverse constrain # TODO move constraint to temp group
 	if (reverse):
-		for i in range(len(objects[0])):
+		for i in range(count):
 			parentObject = None
 			if subLocator:
 				parentObject = objects[2][i]
@@ -268,8 +327,4 @@ def CreateOnSelectedAim(name=_nameAim, scale=_scale, minSelectedCount=_minSelect
 
 	# Select objects and return
 	cmds.select(locatorsTargetsList)
-	# if subLocator:
-	# 	return objects[0], aimGroup, objects[1], locatorsOffsetsList, locatorsTargetsList, objects[2]
-	# else:
-	# 	return objects[0], aimGroup, objects[1], locatorsOffsetsList, locatorsTargetsList
-
+	return objects[0], groupsList, objects[1], locatorsOffsetsList, locatorsTargetsList, locatorsUpList
@@ -0,0 +1,327 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+import math
+
+
+# Pure python math for sampled transforms, no Maya dependency.
+# Matrices are flat lists of 16 values in Maya order (row vectors, translation in elements 12, 13, 14).
+# Rotation matrices are tuples of 3 rows, quaternions are (x, y, z, w).
+
+_epsilon = 1e-10
+_rotateOrders = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0)) # xyz, yzx, zxy, xzy, yxz, zyx
+
+
+# VECTORS
+def VectorAdd(a, b):
+	return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+def VectorSubtract(a, b):
+	return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+def VectorScale(a, value):
+	return (a[0] * value, a[1] * value, a[2] * value)
+def VectorDot(a, b):
+	return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+def VectorCross(a, b):
+	return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+def VectorLength(a):
+	return math.sqrt(VectorDot(a, a))
+def VectorNormalize(a):
+	length = VectorLength(a)
+	if (length < _epsilon):
+		return (0.0, 0.0, 0.0)
+	return (a[0] / length, a[1] / length, a[2] / length)
+def VectorLerp(a, b, weight):
+	return (a[0] + (b[0] - a[0]) * weight, a[1] + (b[1] - a[1]) * weight, a[2] + (b[2] - a[2]) * weight)
+def VectorWeightedAverage(vectors, weights):
+	total = float(sum(weights))
+	if (total < _epsilon):
+		return vectors[0]
+	result = [0.0, 0.0, 0.0]
+	for vector, weight in zip(vectors, weights):
+		for i in range(3):
+			result[i] += vector[i] * weight / total
+	return tuple(result)
+
+def VectorRotate(vector, rotation):
+	return (
+		vector[0] * rotation[0][0] + vector[1] * rotation[1][0] + vector[2] * rotation[2][0],
+		vector[0] * rotation[0][1] + vector[1] * rotation[1][1] + vector[2] * rotation[2][1],
+		vector[0] * rotation[0][2] + vector[1] * rotation[1][2] + vector[2] * rotation[2][2],
+		)
+def PointTransform(point, matrix):
+	return (
+		point[0] * matrix[0] + point[1] * matrix[4] + point[2] * matrix[8] + matrix[12],
+		point[0] * matrix[1] + point[1] * matrix[5] + point[2] * matrix[9] + matrix[13],
+		point[0] * matrix[2] + point[1] * matrix[6] + point[2] * matrix[10] + matrix[14],
+		)
+
+
+# MATRICES
+def MatrixIdentity():
+	return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+def MatrixMultiply(a, b):
+	result = [0.0] * 16
+	for row in range(4):
+		for column in range(4):
+			result[row * 4 + column] = (
+				a[row * 4] * b[column]
+				+ a[row * 4 + 1] * b[4 + column]
+				+ a[row * 4 + 2] * b[8 + column]
+				+ a[row * 4 + 3] * b[12 + column]
+				)
+	return result
+
+def MatrixInverse(matrix):
+	# Gauss-Jordan elimination with partial pivoting
+	rows = [list(matrix[i * 4:i * 4 + 4]) + [1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+	for column in range(4):
+		pivot = max(range(column, 4), key = lambda r: abs(rows[r][column]))
+		if (abs(rows[pivot][column]) < _epsilon):
+			raise ValueError("Matrix is singular and can't be inverted")
+		rows[column], rows[pivot] = rows[pivot], rows[column]
+		divider = rows[column][column]
+		rows[column] = [value / divider for value in rows[column]]
+		for r in range(4):
+			if (r == column):
+				continue
+			factor = rows[r][column]
+			if (factor != 0.0):
+				rows[r] = [value - factor * pivotValue for value, pivotValue in zip(rows[r], rows[column])]
+	return [rows[i][4 + j] for i in range(4) for j in range(4)]
+
+def MatrixGetTranslation(matrix):
+	return (matrix[12], matrix[13], matrix[14])
+
+def MatrixCompose(translation=(0, 0, 0), rotation=None, scale=(1, 1, 1)):
+	if (rotation == None):
+		rotation = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+	result = []
+	for i in range(3):
+		result.extend([rotation[i][0] * scale[i], rotation[i][1] * scale[i], rotation[i][2] * scale[i], 0.0])
+	result.extend([translation[0], translation[1], translation[2], 1.0])
+	return [float(value) for value in result]
+
+def MatrixDecompose(matrix):
+	# Returns translation, rotation 3x3 and scale. Shear is ignored.
+	rows = [tuple(matrix[i * 4:i * 4 + 3]) for i in range(3)]
+	scale = [VectorLength(row) for row in rows]
+	if (VectorDot(VectorCross(rows[0], rows[1]), rows[2]) < 0): # negative determinant
+		scale[0] = -scale[0]
+	rotation = tuple(VectorScale(rows[i], 1.0 / scale[i]) if abs(scale[i]) > _epsilon else (0.0, 0.0, 0.0) for i in range(3))
+	return MatrixGetTranslation(matrix), OrthonormalizeRotation(rotation), tuple(scale)
+
+def TransformFromPivotFrame(matrix, rotatePivot=(0, 0, 0), rotatePivotTranslate=(0, 0, 0), scalePivot=(0, 0, 0), scalePivotTranslate=(0, 0, 0), scale=(1, 1, 1), rotateAxis=None, jointOrient=None):
+	# Translate, rotation and scale of a transform whose rotate pivot frame (pivot position, orientation) relative to the parent is matrix
+	# Maya local matrix is [-sp] S [sp] [spt] [-rp] Ra R [rp] [rpt] T, joints add JO after R, rotate axis and joint orient are 3x3 rotations
+	pivot, rotation, scaleValues = MatrixDecompose(matrix)
+	if (jointOrient != None):
+		rotation = RotationMultiply(rotation, RotationTranspose(jointOrient))
+	pivotOffset = tuple((rotatePivot[axis] - scalePivot[axis]) * scale[axis] + scalePivot[axis] + scalePivotTranslate[axis] - rotatePivot[axis] for axis in range(3))
+	translation = VectorSubtract(VectorSubtract(pivot, VectorAdd(rotatePivot, rotatePivotTranslate)), VectorRotate(pivotOffset, rotation))
+	if (rotateAxis != None):
+		rotation = RotationMultiply(RotationTranspose(rotateAxis), rotation)
+	return translation, rotation, scaleValues
+
+def TransformToMatrix(translation, rotation, scale=(1, 1, 1), rotatePivot=(0, 0, 0), rotatePivotTranslate=(0, 0, 0), scalePivot=(0, 0, 0), scalePivotTranslate=(0, 0, 0), rotateAxis=None, jointOrient=None):
+	# Maya local matrix from channels, the inverse of TransformFromPivotFrame, rotation is the 3x3 of rotate channels
+	chain = [
+		MatrixCompose(VectorScale(scalePivot, -1)),
+		MatrixCompose(scale = scale),
+		MatrixCompose(VectorAdd(scalePivot, scalePivotTranslate)),
+		MatrixCompose(VectorScale(rotatePivot, -1)),
+		]
+	if (rotateAxis != None):
+		chain.append(MatrixCompose(rotation = rotateAxis))
+	chain.append(MatrixCompose(rotation = rotation))
+	if (jointOrient != None):
+		chain.append(MatrixCompose(rotation = jointOrient))
+	chain.append(MatrixCompose(VectorAdd(VectorAdd(rotatePivot, rotatePivotTranslate), translation)))
+	result = chain[0]
+	for matrix in chain[1:]:
+		result = MatrixMultiply(result, matrix)
+	return result
+
+def ParentSpaceAfterBake(parentMatrix, ancestorWorldInverse, ancestorWorld):
+	# Parent matrix of a node below a rebaked ancestor, nodes between them keep their transforms
+	# Old parent matrix and old ancestor world inverse are sampled before the bake, ancestor world is the new one
+	return MatrixMultiply(MatrixMultiply(parentMatrix, ancestorWorldInverse), ancestorWorld)
+
+def OrthonormalizeRotation(rotation):
+	x = VectorNormalize(rotation[0])
+	z = VectorNormalize(VectorCross(x, rotation[1]))
+	if (VectorLength(z) < _epsilon):
+		return ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+	y = VectorCross(z, x)
+	return (x, y, z)
+
+def RotationMultiply(a, b):
+	return tuple(tuple(sum(a[row][k] * b[k][column] for k in range(3)) for column in range(3)) for row in range(3))
+def RotationTranspose(rotation):
+	return tuple(tuple(rotation[column][row] for column in range(3)) for row in range(3))
+
+
+# EULER
+def _RotationAxis(axis, angle):
+	c = math.cos(angle)
+	s = math.sin(angle)
+	if (axis == 0):
+		return ((1.0, 0.0, 0.0), (0.0, c, s), (0.0, -s, c))
+	elif (axis == 1):
+		return ((c, 0.0, -s), (0.0, 1.0, 0.0), (s, 0.0, c))
+	else:
+		return ((c, s, 0.0), (-s, c, 0.0), (0.0, 0.0, 1.0))
+
+def EulerToRotation(euler, rotateOrder=0):
+	# Euler angles in degrees, rotateOrder uses Maya enum values
+	order = _rotateOrders[rotateOrder]
+	result = _RotationAxis(order[0], math.radians(euler[order[0]]))
+	result = RotationMultiply(result, _RotationAxis(order[1], math.radians(euler[order[1]])))
+	result = RotationMultiply(result, _RotationAxis(order[2], math.radians(euler[order[2]])))
+	return result
+
+def RotationToEuler(rotation, rotateOrder=0):
+	# Returns Euler angles in degrees, rotateOrder uses Maya enum values
+	i, j, k = _rotateOrders[rotateOrder]
+	parity = 1.0 if (j - i) % 3 == 1 else -1.0
+	sinMiddle = max(-1.0, min(1.0, -parity * rotation[i][k]))
+	angles = [0.0, 0.0, 0.0]
+	angles[j] = math.asin(sinMiddle)
+	if (abs(sinMiddle) < 1.0 - 1e-9):
+		angles[i] = math.atan2(parity * rotation[j][k], rotation[k][k])
+		angles[k] = math.atan2(parity * rotation[i][j], rotation[i][i])
+	else: # gimbal lock
+		angles[i] = math.atan2(-parity * rotation[k][j], rotation[j][j])
+		angles[k] = 0.0
+	return tuple(math.degrees(value) for value in angles)
+
+def EulerContinuous(euler, previous):
+	# Shift each angle by full turns to the closest value to the previous frame
+	return tuple(euler[i] + 360.0 * round((previous[i] - euler[i]) / 360.0) for i in range(3))
+
+def EulerAlternative(euler, rotateOrder=0):
+	# The second Euler solution of the same rotation, outer axes turn by 180 degrees and the middle axis is mirrored
+	middle = _rotateOrders[rotateOrder][1]
+	return tuple(180.0 - euler[i] if i == middle else euler[i] + 180.0 for i in range(3))
+
+def EulerUnwrap(euler, previous, rotateOrder=0):
+	# Closest to the previous frame of both Euler solutions shifted by full turns
+	candidates = (EulerContinuous(euler, previous), EulerContinuous(EulerAlternative(euler, rotateOrder), previous))
+	distances = [sum((candidate[i] - previous[i]) ** 2 for i in range(3)) for candidate in candidates]
+	return candidates[1] if distances[1] < distances[0] - 1e-6 else candidates[0]
+
+def EulerUnwrapSequence(eulers, rotateOrder=0):
+	result = []
+	for euler in eulers:
+		result.append(EulerUnwrap(euler, result[-1], rotateOrder) if len(result) > 0 else tuple(euler))
+	return result
+
+
+# QUATERNIONS
+def QuaternionFromRotation(rotation):
+	m = rotation
+	trace = m[0][0] + m[1][1] + m[2][2]
+	if (trace > 0):
+		s = math.sqrt(trace + 1.0) * 2
+		result = ((m[1][2] - m[2][1]) / s, (m[2][0] - m[0][2]) / s, (m[0][1] - m[1][0]) / s, 0.25 * s)
+	elif (m[0][0] > m[1][1] and m[0][0] > m[2][2]):
+		s = math.sqrt(1.0 + m[0][0] - m[1][1] - m[2][2]) * 2
+		result = (0.25 * s, (m[0][1] + m[1][0]) / s, (m[2][0] + m[0][2]) / s, (m[1][2] - m[2][1]) / s)
+	elif (m[1][1] > m[2][2]):
+		s = math.sqrt(1.0 + m[1][1] - m[0][0] - m[2][2]) * 2
+		result = ((m[0][1] + m[1][0]) / s, 0.25 * s, (m[1][2] + m[2][1]) / s, (m[2][0] - m[0][2]) / s)
+	else:
+		s = math.sqrt(1.0 + m[2][2] - m[0][0] - m[1][1]) * 2
+		result = ((m[2][0] + m[0][2]) / s, (m[1][2] + m[2][1]) / s, 0.25 * s, (m[0][1] - m[1][0]) / s)
+	return QuaternionNormalize(result)
+
+def QuaternionToRotation(quaternion):
+	x, y, z, w = quaternion
+	return (
+		(1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w)),
+		(2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w)),
+		(2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y)),
+		)
+
+def QuaternionNormalize(quaternion):
+	length = math.sqrt(sum(value * value for value in quaternion))
+	if (length < _epsilon):
+		return (0.0, 0.0, 0.0, 1.0)
+	return tuple(value / length for value in quaternion)
+
+def QuaternionDot(a, b):
+	return a[0] * b[0] + a[1] * b[1] + a[2] * b[2] + a[3] * b[3]
+
+def QuaternionSlerp(a, b, weight):
+	dot = QuaternionDot(a, b)
+	if (dot < 0): # take the shortest path
+		b = tuple(-value for value in b)
+		dot = -dot
+	if (dot > 0.9995):
+		return QuaternionNormalize(tuple(a[i] + (b[i] - a[i]) * weight for i in range(4)))
+	theta = math.acos(dot)
+	sinTheta = math.sin(theta)
+	weightA = math.sin((1 - weight) * theta) / sinTheta
+	weightB = math.sin(weight * theta) / sinTheta
+	return tuple(a[i] * weightA + b[i] * weightB for i in range(4))
+
+def QuaternionPower(quaternion, weight, fallbackAxis=(1, 0, 0)):
+	# Fraction of the rotation from identity without shortest path flip, keeps turns above 180 degrees
+	# Fallback axis is used for a full turn where the quaternion axis is undefined
+	halfAngle = math.atan2(VectorLength(quaternion[:3]), quaternion[3]) * weight
+	x, y, z = QuaternionAxis(quaternion, fallbackAxis)
+	sinHalf = math.sin(halfAngle)
+	return (x * sinHalf, y * sinHalf, z * sinHalf, math.cos(halfAngle))
+
+def QuaternionAxis(quaternion, fallbackAxis=(1, 0, 0)):
+	length = VectorLength(quaternion[:3])
+	if (length < _epsilon):
+		return VectorNormalize(fallbackAxis)
+	return tuple(value / length for value in quaternion[:3])
+
+def QuaternionFromAxisAngle(axis, angle):
+	# Angle in degrees, any number of turns
+	halfAngle = math.radians(angle) * 0.5
+	x, y, z = VectorNormalize(axis)
+	sinHalf = math.sin(halfAngle)
+	return (x * sinHalf, y * sinHalf, z * sinHalf, math.cos(halfAngle))
+
+def EulerToAxisAngle(euler, rotateOrder=0, fallbackAxis=(1, 0, 0)):
+	# Axis and angle in degrees of Euler channels, full turns are kept by matching the angle to the channels projected on the axis
+	quaternion = QuaternionFromRotation(EulerToRotation(euler, rotateOrder))
+	if (VectorLength(euler) > _epsilon):
+		fallbackAxis = euler
+	axis = QuaternionAxis(quaternion, fallbackAxis)
+	angle = math.degrees(2 * math.atan2(VectorLength(quaternion[:3]), quaternion[3]))
+	angle += 360.0 * round((VectorDot(euler, axis) - angle) / 360.0)
+	return axis, angle
+
+def QuaternionWeightedAverage(quaternions, weights):
+	# Normalized weighted sum with hemisphere alignment to the first quaternion
+	reference = quaternions[0]
+	result = [0.0, 0.0, 0.0, 0.0]
+	for quaternion, weight in zip(quaternions, weights):
+		sign = -1.0 if QuaternionDot(reference, quaternion) < 0 else 1.0
+		for i in range(4):
+			result[i] += quaternion[i] * weight * sign
+	return QuaternionNormalize(result)
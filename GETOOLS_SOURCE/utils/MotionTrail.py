@@ -22,41 +22,234 @@
 # Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
 
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 
+from ..utils import Sampler
 from ..utils import Selector
+from ..utils import Text
+from ..utils import Timeline
 from ..values import Enums
 
 
+_nameSuffix = "_motionTrail"
+_attributeSource = "motionTrailSource"
+_step = 1
+_trails = {} # trail curve -> TrailCache, filled lazily from scene markers
+_trailCallbacks = []
+_updatePending = []
+
+
+class TrailCache:
+	# Sampled world positions of the source object per frame and the key snapshot used to find dirty frames
+	def __init__(self, source, trail, times, step=_step):
+		self.source = source
+		self.trail = trail
+		self.times = times
+		self.step = step
+		self.positions = []
+		self.keys = {}
+
+
+def GetKeySnapshot(objects):
+	# Keys, values and tangents of all curves upstream of objects, read through the API
+	# Keys of driven curves have no time and are stored with None instead
+	history = cmds.listHistory(objects) or []
+	curves = []
+	if (len(history) > 0):
+		curves = cmds.ls(history, type = "animCurve") or []
+	result = {}
+	selection = om.MSelectionList()
+	for curve in curves:
+		selection.add(curve)
+	unit = om.MTime.uiUnit()
+	for i in range(len(curves)):
+		function = oma.MFnAnimCurve(selection.getDependNode(i))
+		keys = []
+		timeInput = not function.isUnitlessInput
+		for key in range(function.numKeys):
+			keys.append((function.input(key).asUnits(unit) if timeInput else None, function.value(key), function.getTangentXY(key, True), function.getTangentXY(key, False)))
+		result[curves[i]] = tuple(keys)
+	return result
+
+def GetDirtyRanges(keysOld, keysNew):
+	# Time ranges affected by key changes, None means everything has to be resampled
+	# A changed key reaches two keys to each side, auto tangents of neighbors follow it
+	# Changed driven keys affect any frame
+	if (set(keysOld.keys()) != set(keysNew.keys())):
+		return None
+	ranges = []
+	for curve in keysNew:
+		old = keysOld[curve]
+		new = keysNew[curve]
+		if (old == new):
+			continue
+		changed = set(old).symmetric_difference(new)
+		if (any(key[0] == None for key in changed)):
+			return None
+		times = sorted(set(key[0] for key in old) | set(key[0] for key in new))
+		for key in changed:
+			index = times.index(key[0])
+			start = times[index - 2] if index >= 2 else None
+			end = times[index + 2] if index + 2 < len(times) else None
+			ranges.append((start, end))
+	return ranges
+
+def _GetAncestors(item):
+	# World position also depends on animation of all parents
+	path = cmds.ls(item, long = True)[0].split("|")
+	return ["|".join(path[:i]) for i in range(2, len(path) + 1)]
+
+def _GetDrivers(item):
+	# Ancestors of the item and of every transform upstream of them, so animation of constraint targets and IK handles is tracked too
+	nodes = _GetAncestors(item)
+	for transform in cmds.ls(cmds.listHistory(nodes) or [], type = Enums.Types.transform, long = True) or []:
+		for ancestor in _GetAncestors(transform):
+			if (ancestor not in nodes):
+				nodes.append(ancestor)
+	return nodes
+
+def _WritePoints(trail, positions, indices):
+	# Contiguous runs of control points are written with one setAttr each
+	shape = cmds.listRelatives(trail, shapes = True, fullPath = True)[0]
+	runStart = 0
+	for i in range(1, len(indices) + 1):
+		if (i == len(indices) or indices[i] != indices[i - 1] + 1):
+			values = []
+			for index in indices[runStart:i]:
+				values.extend(positions[index])
+			cmds.setAttr(shape + ".controlPoints[{0}:{1}]".format(indices[runStart], indices[i - 1]), *values)
+			runStart = i
+
+def ClearTrailCache(*args):
+	_trails.clear()
+
+def _RegisterTrailCallbacks():
+	# Cached trails belong to the open scene, the next query scans the new scene for markers
+	if (len(_trailCallbacks) > 0):
+		return
+	_trailCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, ClearTrailCache))
+	_trailCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, ClearTrailCache))
+	_trailCallbacks.append(oma.MAnimMessage.addAnimCurveEditedCallback(_OnAnimCurveEdited))
+
+def _OnAnimCurveEdited(*args):
+	# Several edits in one action are merged into one deferred update, the DG is not changed inside the callback
+	if (len(_trails) == 0 or len(_updatePending) > 0):
+		return
+	_updatePending.append(True)
+	cmds.evalDeferred(_UpdateDeferred)
+
+def _UpdateDeferred():
+	# Trail points follow key edits and their undo, so they are kept out of the undo queue
+	del _updatePending[:]
+	cmds.undoInfo(stateWithoutFlush = False)
+	try:
+		Update()
+	finally:
+		cmds.undoInfo(stateWithoutFlush = True)
+
+def RemoveTrailCallbacks():
+	om.MMessage.removeCallbacks(_trailCallbacks)
+	del _trailCallbacks[:]
+	del _updatePending[:]
+	ClearTrailCache()
+
+def _Scan():
+	# Trails from earlier sessions are found by their marker attribute, only when the cache is empty
+	_RegisterTrailCallbacks()
+	if (len(_trails) > 0):
+		return
+	for trail in cmds.ls("*." + _attributeSource, objectsOnly = True, recursive = True) or []:
+		source = cmds.getAttr(trail + "." + _attributeSource)
+		if (not cmds.objExists(source)):
+			continue
+		timeMin, timeMax = Timeline.GetTimeMinMax()
+		cache = TrailCache(source, trail, Sampler.GetTimes(timeMin, timeMax, _step))
+		cache.positions = Sampler.SamplePositions([source], cache.times)[source]
+		cache.keys = GetKeySnapshot(_GetDrivers(source))
+		_trails[trail] = cache
+		_WritePoints(trail, cache.positions, list(range(len(cache.times))))
+
+def GetTrails():
+	_Scan()
+	for trail in list(_trails.keys()):
+		if (not cmds.objExists(trail) or not cmds.objExists(_trails[trail].source)):
+			del _trails[trail]
+	return list(_trails.keys())
+
+def CreateOnObjects(objects, step=_step):
+	# One degree 1 curve per object, positions of all objects are sampled in one pass
+	_Scan()
+	timeMin, timeMax = Timeline.GetTimeMinMax()
+	times = Sampler.GetTimes(timeMin, timeMax, step)
+	positions = Sampler.SamplePositions(objects, times)
+	allocator = Text.UniqueNameAllocator()
+	trails = []
+	for item in objects:
+		trail = cmds.curve(name = allocator.Reserve(Text.GetShortName(item, removeSpaces = True) + _nameSuffix), degree = 1, point = positions[item])
+		cmds.setAttr(cmds.listRelatives(trail, shapes = True, fullPath = True)[0] + "." + Enums.MotionTrail.template, 1)
+		cmds.addAttr(trail, longName = _attributeSource, dataType = "string")
+		cmds.setAttr(trail + "." + _attributeSource, item, type = "string")
+		cache = TrailCache(item, trail, times, step)
+		cache.positions = positions[item]
+		cache.keys = GetKeySnapshot(_GetDrivers(item))
+		_trails[trail] = cache
+		trails.append(trail)
+	return trails
+
 def Create(*args):
 	selectedList = Selector.MultipleObjects(1)
 	if (selectedList == None):
 		return
-	
-	name = "MotionTrail_1"
-	step = 1
-	start = cmds.playbackOptions(query = True, minTime = True)
-	end = cmds.playbackOptions(query = True, maxTime = True)
-	cmds.snapshot(name = name, motionTrail = True, increment = step, startTime = start, endTime = end)
-	selected = cmds.ls(type = Enums.Types.motionTrail)
-	
-	for item in selected:
-		cmds.setAttr(item + Enums.MotionTrail.handle + "Shape." + Enums.MotionTrail.trailDrawMode, 1)
-		cmds.setAttr(item + Enums.MotionTrail.handle + "Shape." + Enums.MotionTrail.template, 1)
+	CreateOnObjects(selectedList)
+	cmds.select(selectedList, replace = True)
+
+def Update(*args):
+	# Resample only frames around changed keys, trails with new or removed curves are resampled fully
+	# A changed playback range rebuilds the trail with the new frames
+	timeMin, timeMax = Timeline.GetTimeMinMax()
+	for trail in GetTrails():
+		cache = _trails[trail]
+		keys = GetKeySnapshot(_GetDrivers(cache.source))
+		times = Sampler.GetTimes(timeMin, timeMax, cache.step)
+		if (times != cache.times):
+			cache.times = times
+			cache.keys = keys
+			cache.positions = Sampler.SamplePositions([cache.source], times)[cache.source]
+			cmds.curve(trail, replace = True, degree = 1, point = cache.positions)
+			continue
+		ranges = GetDirtyRanges(cache.keys, keys)
+		cache.keys = keys
+		if (ranges == None):
+			indices = list(range(len(cache.times)))
+		else:
+			indices = []
+			for i in range(len(cache.times)):
+				for start, end in ranges:
+					if ((start == None or cache.times[i] >= start) and (end == None or cache.times[i] <= end)):
+						indices.append(i)
+						break
+		if (len(indices) == 0):
+			continue
+		positions = Sampler.SamplePositions([cache.source], [cache.times[i] for i in indices])[cache.source]
+		for index, position in zip(indices, positions):
+			cache.positions[index] = position
+		_WritePoints(trail, cache.positions, indices)
+
+def _GetLegacyHandles():
+	# Handles of motionTrail nodes created by earlier versions with the snapshot command
+	return [item + Enums.MotionTrail.handle for item in cmds.ls(type = Enums.Types.motionTrail) or [] if cmds.objExists(item + Enums.MotionTrail.handle)]
 
 def Select(*args):
-	selected = cmds.ls(type = Enums.Types.motionTrail)
-	if (len(selected) == 0):
+	trails = GetTrails() + _GetLegacyHandles()
+	if (len(trails) == 0):
 		return
-	
-	cmds.select(clear = True)
-	for item in selected:
-		cmds.select(item + Enums.MotionTrail.handle, add = True)
+	cmds.select(trails, replace = True)
 
 def Delete(*args):
-	selected = cmds.ls(type = Enums.Types.motionTrail)
-	if (len(selected) == 0):
+	trails = GetTrails() + _GetLegacyHandles()
+	if (len(trails) == 0):
 		return
-	
-	for item in selected:
-		cmds.delete(item + Enums.MotionTrail.handle)
+	cmds.delete(trails)
+	_trails.clear()
 
@@ -0,0 +1,127 @@
+# GETOOLS is under the terms of the MIT License
+# Copyright (c) 2018-2024 Eugene Gataulin (GenEugene). All Rights Reserved.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
+# Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from ..utils import Matrices
+
+
+# Every function reads values through time context queries, current time and viewport stay untouched
+# All plugs of one call are read inside one DG context per time, so each frame is evaluated once for everything sampled
+# Results are plain lists indexed by time first, so one object gives a (times, values) table
+
+def GetTimes(timeMin, timeMax, step=1.0):
+	times = []
+	count = int(round((timeMax - timeMin) / step)) + 1
+	for i in range(count):
+		times.append(timeMin + i * step)
+	return times
+
+def _GetPlug(name):
+	# One selection list per plug, a shared list would merge aliases of the same plug
+	selection = om.MSelectionList()
+	selection.add(name)
+	return selection.getPlug(0)
+
+def _GetReader(plug):
+	# Values come back in UI units like getAttr, the API reads angles, distances and times in internal units
+	attribute = plug.attribute()
+	if (attribute.hasFn(om.MFn.kUnitAttribute)):
+		unitType = om.MFnUnitAttribute(attribute).unitType()
+		if (unitType == om.MFnUnitAttribute.kAngle):
+			return lambda context: plug.asMAngle(context).asUnits(om.MAngle.uiUnit())
+		if (unitType == om.MFnUnitAttribute.kDistance):
+			return lambda context: plug.asMDistance(context).asUnits(om.MDistance.uiUnit())
+		if (unitType == om.MFnUnitAttribute.kTime):
+			return lambda context: plug.asMTime(context).asUnits(om.MTime.uiUnit())
+	return lambda context: plug.asDouble(context)
+
+def _GetMatrixReader(plug):
+	# Matrices are not unit converted, the same values as getAttr
+	return lambda context: list(om.MFnMatrixData(plug.asMObject(context)).matrix())
+
+def _Sample(names, times, reader):
+	# One DG context per time for all plugs, returns {plug name: [value per time]}
+	names = list(dict.fromkeys(names))
+	readers = [reader(_GetPlug(name)) for name in names]
+	columns = [[] for name in names]
+	unit = om.MTime.uiUnit()
+	for time in times:
+		context = om.MDGContext(om.MTime(time, unit))
+		for column, read in zip(columns, readers):
+			column.append(read(context))
+	return dict(zip(names, columns))
+
+def SamplePlugs(plugs, times):
+	# Scalar plugs of any nodes sampled together
+	return _Sample(plugs, times, _GetReader)
+
+def SampleAttributes(objects, attributes, times):
+	# Values of scalar attributes per time, each row follows the order of attributes
+	samples = SamplePlugs([item + "." + attribute for item in objects for attribute in attributes], times)
+	result = {}
+	for item in objects:
+		columns = [samples[item + "." + attribute] for attribute in attributes]
+		result[item] = [list(row) for row in zip(*columns)]
+	return result
+
+def SampleMatrices(objects, times, attribute="worldMatrix[0]"):
+	samples = _Sample([item + "." + attribute for item in objects], times, _GetMatrixReader)
+	return dict((item, samples[item + "." + attribute]) for item in objects)
+
+def SamplePositions(objects, times):
+	# World space translations, the same values as xform query in world space
+	matrices = SampleMatrices(objects, times)
+	result = {}
+	for item in objects:
+		result[item] = [Matrices.MatrixGetTranslation(matrix) for matrix in matrices[item]]
+	return result
+
+def SamplePivots(objects, times):
+	# World space rotate pivot positions, the same points used by point constraints
+	matrices = SampleMatrices(objects, times)
+	result = {}
+	for item in objects:
+		pivot = cmds.getAttr(item + ".rotatePivot")[0]
+		result[item] = [Matrices.PointTransform(pivot, matrix) for matrix in matrices[item]]
+	return result
+
+def SamplePivotMatrices(objects, times):
+	# World matrices with translation moved to the rotate pivot, rotation and scale are kept
+	# Point and parent constraints drive the rotate pivot, so constraint evaluation works on these frames
+	matrices = SampleMatrices(objects, times)
+	result = {}
+	for item in objects:
+		pivot = cmds.getAttr(item + ".rotatePivot")[0]
+		result[item] = [list(matrix[:12]) + list(Matrices.PointTransform(pivot, matrix)) + [matrix[15]] for matrix in matrices[item]]
+	return result
+
+def SampleMatchMatrices(objects, times):
+	# Rotate pivot position with unscaled rotation, the same placement as matchTransform and parentConstraint
+	matrices = SampleMatrices(objects, times)
+	result = {}
+	for item in objects:
+		pivot = cmds.getAttr(item + ".rotatePivot")[0]
+		result[item] = [Matrices.MatrixCompose(Matrices.PointTransform(pivot, matrix), Matrices.MatrixDecompose(matrix)[1]) for matrix in matrices[item]]
+	return result
@@ -21,11 +21,19 @@
 # Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
 # Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
 
+import collections
+import fnmatch
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
 
 from ..values import Enums
 
 
+_hierarchyCache = {} # root full path -> (parent map, children map), dropped by DAG, rename and scene callbacks
+_hierarchyCallbacks = []
+_hierarchyNodeCallbacks = [] # rename callbacks of cached nodes
+
+
 def MultipleObjects(minimalCount=1, transformsOnly=True, shapes=False):
 	# Save selected objects to variable
 	if (transformsOnly):
@@ -51,31 +59,172 @@ def SelectHierarchyTransforms(*args):
 	selected = MultipleObjects()
 	if (selected == None):
 		return None
+	return SelectHierarchyOrdered(selected)
 
-	cmds.select(hierarchy = True)
-	list = cmds.ls(selection = True, type = Enums.Types.transform, shapes = False)
-	cmds.select(clear = True)
-	
-	for i in range(len(list)):
-		cmds.select(list[i], add = True)
-	
-	return list
+# HIERARCHY
+def ClearHierarchyCache(*args):
+	_hierarchyCache.clear()
 
-def GetChildrenOfType(selected, type=""):
-	result = []
-	for item in selected:
-		if (cmds.objExists(item)):
-			result.append(cmds.listRelatives(item, type = type))
-		else:
-			result.append(None)
+def _RegisterHierarchyCallbacks():
+	# Any parenting or new scene makes cached paths invalid, renaming is watched only on cached nodes
+	if (len(_hierarchyCallbacks) > 0):
+		return
+	_hierarchyCallbacks.append(om.MDagMessage.addAllDagChangesCallback(ClearHierarchyCache))
+	_hierarchyCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, ClearHierarchyCache))
+	_hierarchyCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, ClearHierarchyCache))
+
+def _RegisterHierarchyNodeCallbacks(paths):
+	# Callbacks of a cleared cache are removed when it fills again and not inside a callback
+	if (len(_hierarchyCache) == 0):
+		_RemoveHierarchyNodeCallbacks()
+	selection = om.MSelectionList()
+	for path in paths:
+		selection.add(path)
+	for i in range(selection.length()):
+		_hierarchyNodeCallbacks.append(om.MNodeMessage.addNameChangedCallback(selection.getDependNode(i), ClearHierarchyCache))
+
+def _RemoveHierarchyNodeCallbacks():
+	om.MMessage.removeCallbacks(_hierarchyNodeCallbacks)
+	del _hierarchyNodeCallbacks[:]
+
+def RemoveHierarchyCallbacks():
+	om.MMessage.removeCallbacks(_hierarchyCallbacks)
+	del _hierarchyCallbacks[:]
+	_RemoveHierarchyNodeCallbacks()
+	ClearHierarchyCache()
+
+def GetHierarchyMaps(root, useCache=False):
+	# Parent and children adjacency for the hierarchy under root, built from a single listRelatives query
+	rootPath = cmds.ls(root, long = True)[0]
+	if (useCache and rootPath in _hierarchyCache):
+		return _hierarchyCache[rootPath]
+
+	descendants = cmds.listRelatives(rootPath, allDescendents = True, fullPath = True, type = Enums.Types.transform)
+	descendants = [] if descendants == None else descendants[::-1] # allDescendents lists the deepest items first
+	descendants.sort(key = lambda path: path.count("|")) # stable, keeps children order inside each parent
+
+	parents = {rootPath: None}
+	children = {rootPath: []}
+	for path in descendants:
+		parentPath = path.rsplit("|", 1)[0]
+		parents[path] = parentPath
+		children[path] = []
+		children.setdefault(parentPath, []).append(path)
+
+	if (useCache):
+		_RegisterHierarchyCallbacks()
+		_RegisterHierarchyNodeCallbacks(list(parents.keys()))
+		_hierarchyCache[rootPath] = (parents, children)
+	return parents, children
+
+def GetHierarchyChain(root, useCache=False):
+	# Root with its first child on every level down to the end of the chain
+	parents, children = GetHierarchyMaps(root, useCache = useCache)
+	path = cmds.ls(root, long = True)[0]
+	result = [path]
+	while (len(children[path]) > 0):
+		path = children[path][0]
+		result.append(path)
 	return result
 
-def GetConnectionsOfType(selected, type="", source=True, destination=True):
+def GetHierarchyOrdered(roots, order="dfs", types=None, pattern=None, namespace=None, useCache=False):
+	# order: "dfs" depth first, "bfs" breadth first, "depth" all roots sorted together by depth
+	# types: node types to keep, pattern: fnmatch pattern for short names, namespace: namespace to keep
 	result = []
-	for item in selected:
-		if (cmds.objExists(item)):
-			result.append(cmds.listConnections(item, type = type, source = source, destination = destination))
-		else:
-			result.append(None)
+	visited = set()
+	depths = {}
+	for root in roots:
+		parents, children = GetHierarchyMaps(root, useCache = useCache)
+		rootPath = cmds.ls(root, long = True)[0]
+		queue = collections.deque([(rootPath, 0)])
+		while queue:
+			if (order == "dfs"):
+				path, depth = queue.pop()
+				queue.extend((child, depth + 1) for child in reversed(children[path]))
+			else:
+				path, depth = queue.popleft()
+				queue.extend((child, depth + 1) for child in children[path])
+			if (path in visited):
+				continue
+			visited.add(path)
+			depths[path] = depth
+			result.append(path)
+	if (order == "depth"):
+		result.sort(key = lambda path: depths[path])
+
+	# Filters
+	if (types != None):
+		typed = set(cmds.ls(result, type = types, long = True) or [])
+		result = [path for path in result if path in typed]
+	if (pattern != None):
+		result = [path for path in result if fnmatch.fnmatchcase(path.rsplit("|", 1)[-1].split(":")[-1], pattern)]
+	if (namespace != None):
+		prefix = namespace.strip(":") + ":"
+		result = [path for path in result if path.rsplit("|", 1)[-1].startswith(prefix)]
 	return result
 
+def SelectHierarchyOrdered(roots, order="dfs", types=None, pattern=None, namespace=None, useCache=False):
+	# Select the whole result at once to avoid a selection change event per object
+	paths = GetHierarchyOrdered(roots, order, types, pattern, namespace, useCache)
+	if (len(paths) == 0):
+		cmds.select(clear = True)
+		return []
+	cmds.select(paths, replace = True)
+	return cmds.ls(selection = True)
+
+
+# BULK QUERIES
+def _MapToLongNames(items):
+	# Match input names to long names with one ls call, missing nodes are skipped
+	longNames = cmds.ls(items, long = True) or []
+	suffixes = {}
+	for longName in longNames:
+		parts = longName.split("|")
+		for i in range(len(parts)):
+			suffixes.setdefault("|".join(parts[i:]), longName)
+	return suffixes, dict((item, suffixes[item]) for item in items if item in suffixes)
+
+def _GroupByInput(itemsToLong, pairs):
+	# pairs of (long name, value) are grouped back to input names, duplicates removed
+	inputs = {}
+	for item, longName in itemsToLong.items():
+		inputs.setdefault(longName, []).append(item)
+	result = {}
+	seen = set()
+	for longName, value in pairs:
+		for item in inputs.get(longName, ()):
+			if ((item, value) in seen):
+				continue
+			seen.add((item, value))
+			result.setdefault(item, []).append(value)
+	return result
+
+def GetChildrenOfTypeBulk(selected, type=""):
+	# Returns {input: [children full paths]}, only inputs with children are included
+	suffixes, itemsToLong = _MapToLongNames(selected)
+	if (len(itemsToLong) == 0):
+		return {}
+	children = cmds.listRelatives(list(set(itemsToLong.values())), type = type, fullPath = True) or []
+	return _GroupByInput(itemsToLong, [(child.rsplit("|", 1)[0], child) for child in children])
+
+def GetConnectionsOfTypeBulk(selected, type="", source=True, destination=True):
+	# Returns {input: [connected nodes]}, only inputs with connections are included
+	suffixes, itemsToLong = _MapToLongNames(selected)
+	if (len(itemsToLong) == 0):
+		return {}
+	connections = cmds.listConnections(list(set(itemsToLong.values())), type = type, source = source, destination = destination, connections = True) or []
+	pairs = []
+	for i in range(0, len(connections), 2):
+		node = connections[i].split(".")[0]
+		pairs.append((suffixes.get(node, node), connections[i + 1]))
+	return _GroupByInput(itemsToLong, pairs)
+
+def GetChildrenOfType(selected, type=""):
+	# Per input list for older callers, None where nothing was found
+	children = GetChildrenOfTypeBulk(selected, type)
+	return [children.get(item) for item in selected]
+
+def GetConnectionsOfType(selected, type="", source=True, destination=True):
+	# Per input list for older callers, None where nothing was found
+	connections = GetConnectionsOfTypeBulk(selected, type, source, destination)
+	return [connections.get(item) for item in selected]
@@ -21,12 +21,26 @@
 # Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
 # Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
 
+import json
+import os
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 
 from ..utils import Selector
 from ..values import Enums
 
 
+_weightsFileFilter = "*.json"
+_weightsThreshold = 0.000001
+_indexWatchedAttributes = ("matrix", "outputGeometry") # skin cluster plugs holding influences and skinned geometry
+_index = None # cached SkinIndex, dropped by scene callbacks and by callbacks of its own nodes
+_indexCallbacks = []
+_indexNodeCallbacks = [] # callbacks of nodes in the cached index, replaced on every build
+_weightsCommandPlugin = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plugins", "SetSkinWeightsCommand.py").replace("\\", "/")
+_stagedWeights = [] # weights passed to the plugin command, it reads them back with PopStagedWeights
+
+
 def CopySkinWeightsFromLastMesh(*args):
 	selected = Selector.MultipleObjects(2)
 	if (selected == None):
@@ -35,19 +49,115 @@ def CopySkinWeightsFromLastMesh(*args):
 	if (not HasSkinCluster(selected[-1])):
 		return
 
-	for item in selected:
-		if (item == selected[-1]):
-			break
-		if (not HasSkinCluster(item)):
-			continue
-		
-		cmds.select(selected[-1], item)
-		cmds.CopySkinWeights(surfaceAssociation = "closestPoint", influenceAssociation = "closestJoint", noMirror = True)
-	
+	targets = [item for item in selected[:-1] if HasSkinCluster(item)]
+	if (len(targets) > 0):
+		cmds.undoInfo(openChunk = True, chunkName = "CopySkinWeights")
+		try:
+			TransferSkinWeights(selected[-1], targets)
+		finally:
+			cmds.undoInfo(closeChunk = True)
 	cmds.select(selected)
 
+def TransferSkinWeights(source, targets, maxInfluences=None):
+	# Closest point on source surface for every target vertex, weights of the source triangle are blended by barycentric coordinates
+	# Influences are matched by name, missing ones are added to target clusters, results are normalized and pruned
+	# Without maxInfluences the limit of each target cluster is used when it maintains max influences
+	sourceInfluences, sourceWeights, sourceCount = GetSkinWeights(source)
+	selection = om.MSelectionList()
+	selection.add(source)
+	sourcePath = selection.getDagPath(0).extendToShape()
+	sourceMesh = om.MFnMesh(sourcePath)
+	intersector = om.MMeshIntersector()
+	intersector.create(sourcePath.node(), sourcePath.inclusiveMatrix())
+	triangles = {} # (face, triangle) -> vertex indices, shared by all targets
+	rows = {} # source vertex -> nonzero (influence, weight) pairs, shared by all targets
+
+	for target in targets:
+		cluster = GetSkinCluster(target)[0]
+		influences = [path.partialPathName() for path in _GetSkinClusterFunction(cluster).influenceObjects()]
+		missing = [item for item in sourceInfluences if item not in influences]
+		if (len(missing) > 0):
+			cmds.skinCluster(cluster, edit = True, addInfluence = missing, weight = 0)
+			InvalidateSkinIndex()
+			influences = [path.partialPathName() for path in _GetSkinClusterFunction(cluster).influenceObjects()]
+		influenceMap = [influences.index(item) for item in sourceInfluences]
+		limit = maxInfluences
+		if (limit == None and cmds.getAttr(cluster + ".maintainMaxInfluences")):
+			limit = cmds.getAttr(cluster + ".maxInfluences")
+
+		targetPath = _GetShapePath(target)
+		weights = []
+		for point in om.MFnMesh(targetPath).getPoints(om.MSpace.kWorld):
+			pointOnMesh = intersector.getClosestPoint(point)
+			key = (pointOnMesh.face, pointOnMesh.triangle)
+			if (key not in triangles):
+				triangles[key] = sourceMesh.getPolygonTriangleVertices(key[0], key[1])
+			u, v = pointOnMesh.barycentricCoords
+			vertexWeights = {}
+			for vertex, factor in zip(triangles[key], (u, v, 1.0 - u - v)):
+				if (vertex not in rows):
+					offset = vertex * sourceCount
+					rows[vertex] = [(i, sourceWeights[offset + i]) for i in range(sourceCount) if sourceWeights[offset + i] > 0]
+				for i, value in rows[vertex]:
+					vertexWeights[influenceMap[i]] = vertexWeights.get(influenceMap[i], 0.0) + value * factor
+			weights.append(NormalizeAndPrune(vertexWeights, limit))
+		SetSkinWeights(target, weights)
+	return targets
+
+def NormalizeAndPrune(weights, maxInfluences=None):
+	# Sparse weights as {influence index: value}, keeps strongest influences and scales the sum to 1
+	items = sorted(((value, index) for index, value in weights.items() if value > 0), reverse = True)
+	if (maxInfluences != None and maxInfluences > 0):
+		items = items[:maxInfluences]
+	total = sum(value for value, index in items)
+	if (total <= 0):
+		return {}
+	return dict((index, value / total) for value, index in items)
+
+def SetSkinWeights(mesh, weights):
+	# Sparse weights per vertex by influence order are written with one setWeights call, normalization is already done
+	# The call runs inside the plugin command so it is one undo step that restores the old weights
+	cluster = GetSkinCluster(mesh)[0]
+	influenceCount = len(_GetSkinClusterFunction(cluster).influenceObjects())
+	flat = []
+	for row in weights:
+		flat.extend(row.get(index, 0.0) for index in range(influenceCount))
+	_LoadWeightsCommand()
+	del _stagedWeights[:]
+	_stagedWeights.append((cluster, mesh, flat, influenceCount))
+	try:
+		cmds.gtSetSkinWeights()
+	finally:
+		del _stagedWeights[:]
+
+def PopStagedWeights():
+	# Cluster, mesh, flat weights and influence count for the weights command, None when nothing is staged
+	if (len(_stagedWeights) == 0):
+		return None
+	return _stagedWeights.pop()
+
+def _LoadWeightsCommand():
+	if (not cmds.pluginInfo(_weightsCommandPlugin, query = True, loaded = True)):
+		cmds.loadPlugin(_weightsCommandPlugin, quiet = True)
+
+def _GetShapePath(mesh):
+	selection = om.MSelectionList()
+	selection.add(mesh)
+	return selection.getDagPath(0).extendToShape()
+
+def _GetSkinClusterFunction(cluster):
+	selection = om.MSelectionList()
+	selection.add(cluster)
+	return oma.MFnSkinCluster(selection.getDependNode(0))
+
+def _GetVertexComponents(count):
+	componentFn = om.MFnSingleIndexedComponent()
+	components = componentFn.create(om.MFn.kMeshVertComponent)
+	componentFn.setCompleteData(count)
+	return components
+
 def GetSkinCluster(targetObject):
-	history = cmds.listHistory(targetObject)
+	history = cmds.listHistory(targetObject, pruneDagObjects = True)
 	skinClusterDestination = cmds.ls(history, type = Enums.Types.skinCluster)
 	
 	if (len(skinClusterDestination) == 0):
@@ -64,63 +174,253 @@ def HasSkinCluster(targetObject):
 	else:
 		return True
 
+def GetSkinWeights(mesh):
+	# Influences names and flat vertex-major weights list, read with a single API call
+	cluster = GetSkinCluster(mesh)
+	if (cluster == None):
+		return None
+	skinFn = _GetSkinClusterFunction(cluster[0])
+	shapePath = _GetShapePath(mesh)
+	weights, influenceCount = skinFn.getWeights(shapePath, _GetVertexComponents(om.MFnMesh(shapePath).numVertices))
+	influences = [path.partialPathName() for path in skinFn.influenceObjects()]
+	return influences, list(weights), influenceCount
 
-def GetJointsSkinnedToMesh(mesh):
+# SPARSE WEIGHTS
+def WeightsToTriplets(weights, influenceCount, threshold=_weightsThreshold):
+	# Flat vertex-major weights to parallel lists of vertex indices, influence indices and values, zeros are dropped
+	vertices = []
+	influences = []
+	values = []
+	for i in range(len(weights)):
+		if (weights[i] > threshold):
+			vertices.append(i // influenceCount)
+			influences.append(i % influenceCount)
+			values.append(weights[i])
+	return vertices, influences, values
+
+def TripletsToRows(vertices, influences, values, vertexCount, influenceMap=None):
+	# Sparse rows {influence index: value} per vertex, influence map renumbers stored influences to cluster influences
+	rows = [{} for i in range(vertexCount)]
+	for vertex, influence, value in zip(vertices, influences, values):
+		if (influenceMap != None):
+			influence = influenceMap[influence]
+		rows[vertex][influence] = rows[vertex].get(influence, 0.0) + value
+	return rows
+
+def ExportSkinWeights(mesh):
+	# Influence names with weight triplets, one API read for the whole mesh
+	skin = GetSkinWeights(mesh)
+	if (skin == None):
+		return None
+	influences, weights, influenceCount = skin
+	vertices, influenceIndices, values = WeightsToTriplets(weights, influenceCount)
+	return {
+		"mesh": mesh,
+		"vertexCount": len(weights) // influenceCount if influenceCount > 0 else 0,
+		"influences": influences,
+		"vertices": vertices,
+		"influenceIndices": influenceIndices,
+		"weights": values,
+		}
+
+def ImportSkinWeights(mesh, data, normalize=True):
+	# Stored influences are matched by name, missing ones are added to the cluster, weights are written with one call
 	cluster = GetSkinCluster(mesh)
 	if (cluster == None):
 		return None
+	vertexCount = om.MFnMesh(_GetShapePath(mesh)).numVertices
+	if (vertexCount != data["vertexCount"]):
+		cmds.warning("{0} has {1} vertices, stored weights have {2}".format(mesh, vertexCount, data["vertexCount"]))
+		return None
+	
+	influences = [path.partialPathName() for path in _GetSkinClusterFunction(cluster[0]).influenceObjects()]
+	missing = [item for item in data["influences"] if item not in influences]
+	if (len(missing) > 0):
+		cmds.skinCluster(cluster[0], edit = True, addInfluence = missing, weight = 0)
+		InvalidateSkinIndex()
+		influences = [path.partialPathName() for path in _GetSkinClusterFunction(cluster[0]).influenceObjects()]
+	influenceMap = [influences.index(item) for item in data["influences"]]
+	
+	rows = TripletsToRows(data["vertices"], data["influenceIndices"], data["weights"], vertexCount, influenceMap)
+	if normalize:
+		rows = [NormalizeAndPrune(row, None) for row in rows]
+	SetSkinWeights(mesh, rows)
+	return mesh
 
-	joints = cmds.listConnections(cluster[0] + ".matrix")
-	if (joints == None):
-		cmds.warning("No joints")
+def SaveSkinWeights(mesh, filepath):
+	data = ExportSkinWeights(mesh)
+	if (data == None):
 		return None
+	with open(filepath, "w") as file:
+		json.dump(data, file, separators = (",", ":"))
+	print("Skin weights saved {0}".format(filepath))
+	return filepath
+
+def LoadSkinWeights(mesh, filepath):
+	with open(filepath, "r") as file:
+		data = json.load(file)
+	return ImportSkinWeights(mesh, data)
 
-	for joint in joints:
-		print(joint)
+def SaveSkinWeightsDialog(*args):
+	selected = Selector.MultipleObjects(1)
+	if (selected == None):
+		return None
+	fileDialog = cmds.fileDialog2(fileMode = 0, fileFilter = _weightsFileFilter, dialogStyle = 2)
+	if (fileDialog == None):
+		return None
+	return SaveSkinWeights(selected[-1], fileDialog[0])
+
+def LoadSkinWeightsDialog(*args):
+	selected = Selector.MultipleObjects(1)
+	if (selected == None):
+		return None
+	fileDialog = cmds.fileDialog2(fileMode = 1, fileFilter = _weightsFileFilter, dialogStyle = 2)
+	if (fileDialog == None):
+		return None
+	cmds.undoInfo(openChunk = True, chunkName = "LoadSkinWeights")
+	try:
+		return [LoadSkinWeights(item, fileDialog[0]) for item in selected]
+	finally:
+		cmds.undoInfo(closeChunk = True)
+
+# SKIN INDEX
+class SkinIndex:
+	# Joint, skin cluster and mesh relations of the whole scene, built from one pass over skin clusters
+	def __init__(self):
+		self.jointClusters = {}
+		self.clusterJoints = {}
+		self.meshClusters = {}
+		self.clusterMeshes = {}
+		self.clusterNodes = [] # skin cluster nodes, watched for rebinding and renaming
+		self.paths = [] # influence and mesh transform paths, watched for renaming and reparenting
 	
+	def Build(self):
+		iterator = om.MItDependencyNodes(om.MFn.kSkinClusterFilter)
+		while not iterator.isDone():
+			function = oma.MFnSkinCluster(iterator.thisNode())
+			cluster = function.name()
+			influences = list(function.influenceObjects())
+			geometries = [_GetTransformPath(geometry) for geometry in function.getOutputGeometry()]
+			self.clusterNodes.append(iterator.thisNode())
+			self.paths.extend(influences + geometries)
+			self.clusterJoints[cluster] = set(path.partialPathName() for path in influences)
+			self.clusterMeshes[cluster] = set(path.partialPathName() for path in geometries)
+			for joint in self.clusterJoints[cluster]:
+				self.jointClusters.setdefault(joint, set()).add(cluster)
+			for mesh in self.clusterMeshes[cluster]:
+				self.meshClusters.setdefault(mesh, set()).add(cluster)
+			iterator.next()
+		return self
+	
+	def GetMeshes(self, joints):
+		result = set()
+		for joint in joints:
+			for cluster in self.jointClusters.get(joint, ()):
+				result.update(self.clusterMeshes[cluster])
+		return result
+	
+	def GetJoints(self, meshes):
+		result = set()
+		for mesh in meshes:
+			for cluster in self.meshClusters.get(mesh, ()):
+				result.update(self.clusterJoints[cluster])
+		return result
+
+def _GetTransformPath(node):
+	path = om.MDagPath.getAPathTo(node)
+	if (path.node().hasFn(om.MFn.kShape)):
+		path.pop()
+	return path
+
+def _GetTransforms(nodes):
+	# Shapes are replaced by their transforms, order is kept and duplicates are dropped
+	result = []
+	for node in nodes:
+		if (len(cmds.ls(node, shapes = True)) > 0):
+			node = cmds.listRelatives(node, parent = True)[0]
+		if (node not in result):
+			result.append(node)
+	return result
+
+def _OnSceneChanged(*args):
+	InvalidateSkinIndex()
+
+def _OnClusterAttributeChanged(message, plug, otherPlug, *args):
+	# Influences added or removed and geometry bound or unbound change the index, other attribute changes are ignored
+	if (message & (om.MNodeMessage.kConnectionMade | om.MNodeMessage.kConnectionBroken) and om.MFnAttribute(plug.attribute()).name in _indexWatchedAttributes):
+		InvalidateSkinIndex()
+
+def _RegisterIndexCallbacks():
+	# New or deleted skin clusters and scene changes, joints and meshes of the index are watched per node
+	if (len(_indexCallbacks) > 0):
+		return
+	_indexCallbacks.append(om.MDGMessage.addNodeAddedCallback(_OnSceneChanged, Enums.Types.skinCluster))
+	_indexCallbacks.append(om.MDGMessage.addNodeRemovedCallback(_OnSceneChanged, Enums.Types.skinCluster))
+	_indexCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, _OnSceneChanged))
+	_indexCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, _OnSceneChanged))
+
+def _RegisterIndexNodeCallbacks(index):
+	# Only nodes in the index are watched, callbacks of the previous index are removed here and not inside a callback
+	_RemoveIndexNodeCallbacks()
+	for node in index.clusterNodes:
+		_indexNodeCallbacks.append(om.MNodeMessage.addAttributeChangedCallback(node, _OnClusterAttributeChanged))
+		_indexNodeCallbacks.append(om.MNodeMessage.addNameChangedCallback(node, _OnSceneChanged))
+	for path in index.paths:
+		_indexNodeCallbacks.append(om.MNodeMessage.addNameChangedCallback(path.node(), _OnSceneChanged))
+		_indexNodeCallbacks.append(om.MDagMessage.addParentAddedDagPathCallback(path, _OnSceneChanged)) # reparenting changes partial path names
+
+def _RemoveIndexNodeCallbacks():
+	om.MMessage.removeCallbacks(_indexNodeCallbacks)
+	del _indexNodeCallbacks[:]
+
+def RemoveIndexCallbacks():
+	om.MMessage.removeCallbacks(_indexCallbacks)
+	del _indexCallbacks[:]
+	_RemoveIndexNodeCallbacks()
+	InvalidateSkinIndex()
+
+def InvalidateSkinIndex():
+	global _index
+	_index = None
+
+def GetSkinIndex():
+	# Cached for the session, rebuilt on first query after skin clusters, joints or meshes were created, deleted, renamed, reparented or rebound
+	global _index
+	if (_index == None):
+		_RegisterIndexCallbacks()
+		_index = SkinIndex().Build()
+		_RegisterIndexNodeCallbacks(_index)
+	return _index
+
+def GetMeshesSkinnedToJoints(joints):
+	return sorted(GetSkinIndex().GetMeshes(joints))
+
+def GetJointsSkinnedToMeshes(meshes):
+	return sorted(GetSkinIndex().GetJoints(_GetTransforms(meshes)))
+
+def GetJointsSkinnedToMesh(mesh):
+	joints = GetJointsSkinnedToMeshes([mesh])
+	if (len(joints) == 0):
+		cmds.warning("No joints")
+		return None
 	return joints
 
 def SelectSkinnedMeshesOrJoints(*args):
 	# Check selected objects
-	selectedList = Selector.MultipleObjects(1)
+	selectedList = Selector.MultipleObjects(1, transformsOnly = False)
 	if (selectedList == None):
 		return None
+	selectedList = _GetTransforms(selectedList)
 	
 	if (cmds.nodeType(selectedList[0]) == Enums.Types.joint):
-		resultClusters = []
-		for selected in selectedList:
-			clusters = cmds.listConnections(selected + ".worldMatrix")
-			if (clusters == None):
-				continue
-			for cluster in clusters:
-				if (cluster not in resultClusters):
-					resultClusters.append(cluster)
-		
-		if (len(resultClusters)) == 0:
-			cmds.warning("No clusters found")
+		resultMeshes = GetMeshesSkinnedToJoints(selectedList)
+		if (len(resultMeshes) == 0):
+			cmds.warning("No meshes found")
 			return None
-		
-		resultMeshes = []
-		for cluster in resultClusters:
-			meshes = cmds.listConnections(cluster, type = Enums.Types.mesh)
-			if (meshes != None):
-				for mesh in meshes:
-					if (mesh not in resultMeshes):
-						resultMeshes.append(mesh)
-
-		print(resultMeshes)
 		cmds.select(resultMeshes, replace = True)
 	else:
-		resultJoints = []
-		for selected in selectedList:
-			joints = GetJointsSkinnedToMesh(selected)
-			if (joints != None):
-				resultJoints.append(GetJointsSkinnedToMesh(selected))
-		
-		if (len(resultJoints)) == 0:
+		resultJoints = GetJointsSkinnedToMeshes(selectedList)
+		if (len(resultJoints) == 0):
 			cmds.warning("No joints found")
 			return None
-		
-		resultJoints = resultJoints[0]
 		cmds.select(resultJoints, replace = True)
-
@@ -37,13 +37,52 @@ def ConvertSymbols(text, direction=True):
 		_text = _text.replace(replaceSymbol2[1], replaceSymbol2[0])
 		return _text
 
+class UniqueNameAllocator:
+	# Scans existing names once per base name, next free numbers are given from memory
+	def __init__(self):
+		self.used = {} # base name -> set of used numbers, 0 means the base name itself
+		self.next = {} # base name -> lowest number that may be free
+		self.reserved = set() # all names given by this allocator, protects different base names from collisions
+	
+	def Scan(self, baseName):
+		numbers = set()
+		prefixLength = len(baseName)
+		for item in cmds.ls(baseName + "*") or []:
+			item = item.split("|")[-1]
+			if (item == baseName):
+				numbers.add(0)
+			elif (item.startswith(baseName) and item[prefixLength:].isdigit()):
+				numbers.add(int(item[prefixLength:]))
+		self.used[baseName] = numbers
+		self.next[baseName] = 1
+	
+	def Reserve(self, baseName):
+		if (baseName not in self.used):
+			self.Scan(baseName)
+		numbers = self.used[baseName]
+		if (0 not in numbers and baseName not in self.reserved):
+			numbers.add(0)
+			self.reserved.add(baseName)
+			return baseName
+		numbers.add(0)
+		number = self.next[baseName]
+		while (number in numbers or baseName + str(number) in self.reserved):
+			number += 1
+		numbers.add(number)
+		self.next[baseName] = number + 1
+		self.reserved.add(baseName + str(number))
+		return baseName + str(number)
+	
+	def ReserveMany(self, baseNames):
+		return [self.Reserve(baseName) for baseName in baseNames]
+
 def SetUniqueFromText(baseName):
-	resultName = baseName
-	counter = 0
-	while (cmds.objExists(resultName)):
-		resultName = baseName + str(counter + 1)
-		counter += 1
-	return resultName
+	return UniqueNameAllocator().Reserve(baseName)
+def SetUniqueFromTextList(baseNames, allocator=None):
+	# Unique names for a batch, names given earlier in the batch are reserved for the next ones
+	if (allocator == None):
+		allocator = UniqueNameAllocator()
+	return allocator.ReserveMany(baseNames)
 
 def GetShortName(objectWithName, removeSpaces=False):
 	result = objectWithName
@@ -21,8 +21,11 @@
 # Author: Eugene Gataulin tek942@gmail.com https://www.linkedin.com/in/geneugene https://discord.gg/heMxJhTqCz
 # Source code: https://github.com/GenEugene/GETools or https://app.gumroad.com/geneugene
 
+import contextlib
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 
 
 class TimeRangeHandler:
@@ -30,11 +33,7 @@ class TimeRangeHandler:
 		self.values = [0, 0, 0, 0, 0] # current, minOuter, minInner, maxInner, maxOuter
 	
 	def Scan(self, *args):
-		self.values[0] = cmds.currentTime(query = True)
-		self.values[1] = cmds.playbackOptions(query = True, animationStartTime = True)
-		self.values[2] = cmds.playbackOptions(query = True, min = True)
-		self.values[3] = cmds.playbackOptions(query = True, max = True)
-		self.values[4] = cmds.playbackOptions(query = True, animationEndTime = True)
+		self.values = list(GetState())
 	
 	def SetCurrent(self, value, *args):
 		cmds.currentTime(value)
@@ -43,28 +42,82 @@ class TimeRangeHandler:
 		cmds.currentTime(self.values[0])
 	
 	def SetMin(self, value, *args):
-		cmds.playbackOptions(edit = True, min = value)
+		SetRange(minInner = value)
+		self.values[2] = value
+	
+	def Apply(self, minOuter=None, minInner=None, maxInner=None, maxOuter=None):
+		# Single playbackOptions edit, cached values follow the change
+		SetRange(minOuter, minInner, maxInner, maxOuter)
+		for index, value in ((1, minOuter), (2, minInner), (3, maxInner), (4, maxOuter)):
+			if (value != None):
+				self.values[index] = value
 	
 	def Reset(self): # , *args
-		cmds.playbackOptions(edit = True, animationStartTime = self.values[1], min = self.values[2], max = self.values[3], animationEndTime = self.values[4])
+		SetRange(self.values[1], self.values[2], self.values[3], self.values[4])
 		cmds.currentTime(self.values[2])
 
 
+# State
+def GetState():
+	# Current time and both ranges in one pass through the API, no commands are executed
+	unit = om.MTime.uiUnit()
+	return (
+		oma.MAnimControl.currentTime().asUnits(unit),
+		oma.MAnimControl.animationStartTime().asUnits(unit),
+		oma.MAnimControl.minTime().asUnits(unit),
+		oma.MAnimControl.maxTime().asUnits(unit),
+		oma.MAnimControl.animationEndTime().asUnits(unit),
+		)
+
+def SetRange(minOuter=None, minInner=None, maxInner=None, maxOuter=None):
+	# Only given values are edited, all of them in one playbackOptions call
+	flags = {}
+	if (minOuter != None):
+		flags["animationStartTime"] = minOuter
+	if (minInner != None):
+		flags["min"] = minInner
+	if (maxInner != None):
+		flags["max"] = maxInner
+	if (maxOuter != None):
+		flags["animationEndTime"] = maxOuter
+	if (len(flags) > 0):
+		cmds.playbackOptions(edit = True, **flags)
+
+@contextlib.contextmanager
+def KeepTime(update=True):
+	# Current time is restored on exit, exceptions included
+	timeCurrent = GetTimeCurrent()
+	try:
+		yield timeCurrent
+	finally:
+		SetTimeCurrent(timeCurrent, update)
+
+@contextlib.contextmanager
+def KeepTimeState():
+	# Current time and both ranges are restored on exit, exceptions included
+	handler = TimeRangeHandler()
+	handler.Scan()
+	try:
+		yield handler
+	finally:
+		SetRange(handler.values[1], handler.values[2], handler.values[3], handler.values[4])
+		SetTimeCurrent(handler.values[0])
+
+
 # Utilities
-def SetTimeCurrent(value):
-	cmds.currentTime(value, edit = True, update = True)
+def SetTimeCurrent(value, update=True):
+	# Without update the time changes in the DG context only, nothing is evaluated or redrawn
+	cmds.currentTime(value, edit = True, update = update)
 
 def GetTimeCurrent():
-	return cmds.currentTime(query = True)
+	return oma.MAnimControl.currentTime().asUnits(om.MTime.uiUnit())
 
 def GetTimeMinMax(inner=True):
+	unit = om.MTime.uiUnit()
 	if inner:
-		min = cmds.playbackOptions(query = True, min = True)
-		max = cmds.playbackOptions(query = True, max = True)
+		return (oma.MAnimControl.minTime().asUnits(unit), oma.MAnimControl.maxTime().asUnits(unit))
 	else:
-		min = cmds.playbackOptions(query = True, animationStartTime = True)
-		max = cmds.playbackOptions(query = True, animationEndTime = True)
-	return (min, max)
+		return (oma.MAnimControl.animationStartTime().asUnits(unit), oma.MAnimControl.animationEndTime().asUnits(unit))
 
 def FetchTimeline():
 	return mel.eval('$tmpVar=$gPlayBackSlider')
@@ -72,6 +125,12 @@ def CheckHighlighting():
 	return cmds.timeControl(FetchTimeline(), query = True, rangeVisible = True)
 def GetSelectedTimeRange():
 	return cmds.timeControl(FetchTimeline(), query = True, rangeArray = True)
+def GetBakeRange(selectedRange=True):
+	# Highlighted range with inclusive end if present, playback range otherwise
+	if (selectedRange and CheckHighlighting()):
+		rangeSelected = GetSelectedTimeRange()
+		return (rangeSelected[0], rangeSelected[1] - 1)
+	return GetTimeMinMax()
 
 def SetTime(mode=0, *args):
 	if (mode == 1):
@@ -84,12 +143,11 @@ def SetTime(mode=0, *args):
 		cmds.playbackOptions(animationEndTime = GetTimeCurrent())
 	elif (mode == 5):
 		minMaxOuter = GetTimeMinMax(False)
-		cmds.playbackOptions(min = minMaxOuter[0], max = minMaxOuter[1])
+		SetRange(minInner = minMaxOuter[0], maxInner = minMaxOuter[1])
 	elif (mode == 6):
 		minMaxInner = GetTimeMinMax(True)
-		cmds.playbackOptions(animationStartTime = minMaxInner[0], animationEndTime = minMaxInner[1])
+		SetRange(minOuter = minMaxInner[0], maxOuter = minMaxInner[1])
 	elif (mode == 7):
 		selectedTime = GetSelectedTimeRange()
-		endTime = selectedTime[1] - 1
-		cmds.playbackOptions(min = selectedTime[0], max = endTime)
+		SetRange(minInner = selectedTime[0], maxInner = selectedTime[1] - 1)
 
@@ -355,6 +355,10 @@ def MotionTrailCreate():
 	import GETOOLS_SOURCE.utils.MotionTrail as MotionTrail
 	MotionTrail.Create()
 
+def MotionTrailUpdate():
+	import GETOOLS_SOURCE.utils.MotionTrail as MotionTrail
+	MotionTrail.Update()
+
 def MotionTrailSelect():
 	import GETOOLS_SOURCE.utils.MotionTrail as MotionTrail
 	MotionTrail.Select()
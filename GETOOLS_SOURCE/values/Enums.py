@@ -47,8 +47,10 @@ class Attributes:
 	scaleShort = ("sx", "sy", "sz")
 	scaleLong = ("scaleX", "scaleY", "scaleZ")
 	scaleLocal = ("localScaleX", "localScaleY", "localScaleZ") # used for locators
+	scaleLocalCompound = "localScale"
 
 	visibility = "visibility"
+	worldMatrix = "worldMatrix[0]"
 
 	rotateOrder = "rotateOrder"
 	startFrame = "startFrame"
@@ -0,0 +1,13 @@
+import unittest
+
+
+class VectorTestCase(unittest.TestCase):
+	# Shared float comparisons for vectors, matrices as flat lists and rotation rows
+	def assertVectorEqual(self, a, b, places=7):
+		self.assertEqual(len(a), len(b))
+		for valueA, valueB in zip(a, b):
+			self.assertAlmostEqual(valueA, valueB, places = places)
+
+	def assertRotationEqual(self, a, b, places=7):
+		for rowA, rowB in zip(a, b):
+			self.assertVectorEqual(rowA, rowB, places)
@@ -0,0 +1,131 @@
+import math
+import unittest
+
+from GETOOLS_SOURCE.utils import CenterOfMassEvaluation
+
+
+def Cube(size=1.0, flip=False):
+	# Closed box from 0 to size, triangles wound counter clockwise from outside
+	points = [(x * size, y * size, z * size) for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+	quads = ((0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3))
+	triangles = []
+	for a, b, c, d in quads:
+		triangles.extend((a, b, c, a, c, d))
+	if flip:
+		triangles = [index for i in range(0, len(triangles), 3) for index in (triangles[i], triangles[i + 2], triangles[i + 1])]
+	return points, triangles
+
+def Sphere(radius=1.0, rings=48, segments=96):
+	points = [(0.0, radius, 0.0)]
+	for ring in range(1, rings):
+		theta = math.pi * ring / rings
+		for segment in range(segments):
+			phi = 2 * math.pi * segment / segments
+			points.append((radius * math.sin(theta) * math.cos(phi), radius * math.cos(theta), radius * math.sin(theta) * math.sin(phi)))
+	points.append((0.0, -radius, 0.0))
+	def Index(ring, segment):
+		return 1 + (ring - 1) * segments + segment % segments
+	triangles = []
+	for segment in range(segments):
+		triangles.extend((0, Index(1, segment + 1), Index(1, segment)))
+		triangles.extend((len(points) - 1, Index(rings - 1, segment), Index(rings - 1, segment + 1)))
+	for ring in range(1, rings - 1):
+		for segment in range(segments):
+			a = Index(ring, segment)
+			b = Index(ring, segment + 1)
+			c = Index(ring + 1, segment + 1)
+			d = Index(ring + 1, segment)
+			triangles.extend((a, b, c, a, c, d))
+	return points, triangles
+
+
+class TestVolumes(unittest.TestCase):
+	def test_cube_volume(self):
+		points, triangles = Cube(2.0)
+		self.assertAlmostEqual(sum(CenterOfMassEvaluation.VertexVolumes(points, triangles)), 8.0)
+		self.assertAlmostEqual(CenterOfMassEvaluation.SegmentVolumes(points, triangles, [1.0] * 8, 1)[0], 8.0)
+
+	def test_inverted_normals(self):
+		points, triangles = Cube(2.0, flip = True)
+		self.assertAlmostEqual(CenterOfMassEvaluation.SegmentVolumes(points, triangles, [1.0] * 8, 1)[0], 8.0)
+
+	def test_sphere_volume(self):
+		points, triangles = Sphere(2.0)
+		volume = CenterOfMassEvaluation.SegmentVolumes(points, triangles, [1.0] * len(points), 1)[0]
+		self.assertAlmostEqual(volume, 4.0 / 3.0 * math.pi * 8.0, delta = 0.01 * volume)
+
+	def test_split_between_influences(self):
+		# Lower half of the cube goes to the first influence, upper half to the second
+		points, triangles = Cube()
+		weights = []
+		for point in points:
+			weights.extend((1.0, 0.0) if point[1] == 0 else (0.0, 1.0))
+		volumes = CenterOfMassEvaluation.SegmentVolumes(points, triangles, weights, 2)
+		self.assertAlmostEqual(volumes[0], 0.5)
+		self.assertAlmostEqual(volumes[1], 0.5)
+		self.assertEqual(CenterOfMassEvaluation.VolumesToPercentages(volumes), [50.0, 50.0])
+
+	def test_dominant_only(self):
+		points, triangles = Cube()
+		weights = [0.6, 0.4] * len(points)
+		self.assertEqual(CenterOfMassEvaluation.SegmentVolumes(points, triangles, weights, 2, dominantOnly = True)[1], 0.0)
+		blended = CenterOfMassEvaluation.SegmentVolumes(points, triangles, weights, 2)
+		self.assertAlmostEqual(blended[0], 0.6)
+		self.assertAlmostEqual(blended[1], 0.4)
+
+
+class TestTrajectory(unittest.TestCase):
+	def test_weighted_center(self):
+		positions = [[(0, 0, 0), (0, 0, 0)], [(10, 0, 0), (10, 4, 0)]]
+		result = CenterOfMassEvaluation.Evaluate(positions, [3, 1])
+		self.assertEqual(result, [(2.5, 0.0, 0.0), (2.5, 1.0, 0.0)])
+		self.assertEqual(CenterOfMassEvaluation.Evaluate(positions, [0, 0]), None)
+
+	def test_zero_weights_have_no_trajectory(self):
+		positions = [[(0, 0, 0), (1, 0, 0)], [(5, 0, 0), (6, 0, 0)]]
+		self.assertEqual(CenterOfMassEvaluation.EvaluateTrajectory(positions, [0, 0], [0, 1]), None)
+
+	def test_derivatives(self):
+		positions = [[(t * t, 0, 0) for t in range(5)]]
+		trajectory, velocity, acceleration = CenterOfMassEvaluation.EvaluateTrajectory(positions, [1], list(range(5)))
+		self.assertEqual([value[0] for value in velocity], [1.0, 2.0, 4.0, 6.0, 7.0])
+		self.assertEqual(acceleration[2][0], 2.0)
+
+
+class TestConvexHull(unittest.TestCase):
+	def test_square_with_inner_and_collinear_points(self):
+		points = [(0, 0), (2, 0), (2, 2), (0, 2), (1, 1), (1, 0)]
+		self.assertEqual(CenterOfMassEvaluation.ConvexHull(points), [(0, 0), (2, 0), (2, 2), (0, 2)])
+
+	def test_signed_distance(self):
+		hull = CenterOfMassEvaluation.ConvexHull([(0, 0), (4, 0), (4, 4), (0, 4)])
+		self.assertAlmostEqual(CenterOfMassEvaluation.SignedDistanceToHull((1, 2), hull), 1.0)
+		self.assertAlmostEqual(CenterOfMassEvaluation.SignedDistanceToHull((7, 2), hull), -3.0)
+		self.assertEqual(CenterOfMassEvaluation.SignedDistanceToHull((1, 2), []), None)
+
+	def test_segment_support_band(self):
+		# Two feet give a segment without area, points near it are supported within tolerance
+		hull = CenterOfMassEvaluation.ConvexHull([(0, 0), (4, 0)])
+		self.assertAlmostEqual(CenterOfMassEvaluation.SignedDistanceToHull((2, 1), hull, 3.0), 2.0)
+		self.assertAlmostEqual(CenterOfMassEvaluation.SignedDistanceToHull((2, 5), hull, 3.0), -2.0)
+		self.assertAlmostEqual(CenterOfMassEvaluation.SignedDistanceToHull((2, 1), hull), -1.0)
+		self.assertAlmostEqual(CenterOfMassEvaluation.SignedDistanceToHull((1, 0), [(0, 0)], 3.0), 2.0)
+
+	def test_two_feet_stance_is_balanced(self):
+		contacts = [[(0, 0, 0)] * 2, [(4, 0, 0)] * 2]
+		trajectory = [(2, 90, 1), (2, 90, 20)]
+		stability, ranges = CenterOfMassEvaluation.AnalyzeBalance(trajectory, contacts, heightThreshold = 5.0)
+		self.assertAlmostEqual(stability[0], 4.0)
+		self.assertEqual(ranges, [(1, 1)])
+
+	def test_balance_ranges(self):
+		# Two contacts on the floor and one lifted, center of mass leaves the support triangle on the last frames
+		contacts = [[(0, 0, 0)] * 4, [(4, 0, 0)] * 4, [(0, 0, 4)] * 4, [(4, 10, 4)] * 4]
+		trajectory = [(1, 50, 1), (2, 50, 1), (5, 50, 1), (6, 50, 1)]
+		stability, ranges = CenterOfMassEvaluation.AnalyzeBalance(trajectory, contacts)
+		self.assertAlmostEqual(stability[0], 1.0)
+		self.assertEqual(ranges, [(2, 3)])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+from GETOOLS_SOURCE.utils import ChainDistributionPlan
+
+from helpers import VectorTestCase
+
+
+joints = ["|root|joint1", "|root|joint1|joint2", "|root|joint1|joint2|ns:joint3", "|root|joint1|joint2|ns:joint3|joint4"]
+
+
+class TestPlanRigVariant1(unittest.TestCase):
+	def test_nodes_parented_under_main_group(self):
+		plan = ChainDistributionPlan.PlanRigVariant1(joints)
+		self.assertEqual(plan.nodes[0], ("grpChain_joint4", "transform", None))
+		self.assertEqual([item[0] for item in plan.nodes[1:]], ["loc_joint1", "loc_joint2", "loc_ns_joint3", "loc_joint4"])
+		for item in plan.nodes[1:]:
+			self.assertEqual(item[1:], ("locator", "grpChain_joint4"))
+
+	def test_locator_size_and_bake(self):
+		plan = ChainDistributionPlan.PlanRigVariant1(joints, locatorSize = 5)
+		self.assertEqual(plan.attributes[0], ("loc_joint1Shape.localScale", (5, 5, 5), {}))
+		self.assertEqual(plan.bake, [("loc_joint1", joints[0], None), ("loc_joint2", joints[1], None), ("loc_ns_joint3", joints[2], None), ("loc_joint4", joints[3], None)])
+
+	def test_middle_links_blend_between_first_and_next(self):
+		plan = ChainDistributionPlan.PlanRigVariant1(joints)
+		blends = [item for item in plan.constraints if len(item[1]) == 2]
+		self.assertEqual(blends, [
+			("orientConstraint", ["loc_joint1", "loc_ns_joint3"], "loc_joint2", True),
+			("orientConstraint", ["loc_joint1", "loc_joint4"], "loc_ns_joint3", True),
+			])
+		self.assertEqual(len(plan.constraints), len(joints) * 2 + 2)
+		self.assertEqual(plan.select, "loc_joint4")
+
+	def test_unique_name_applied(self):
+		plan = ChainDistributionPlan.PlanRigVariant1(joints, uniqueName = lambda name: name + "1")
+		self.assertEqual(plan.nodes[0][0], "grpChain_joint41")
+		self.assertEqual(plan.nodes[1][2], "grpChain_joint41")
+		self.assertEqual(plan.select, "loc_joint41")
+
+
+class TestPlanRigVariant2(unittest.TestCase):
+	def test_hierarchy_and_bake_spaces(self):
+		plan = ChainDistributionPlan.PlanRigVariant2(joints)
+		parents = dict((item[0], item[2]) for item in plan.nodes)
+		self.assertEqual(parents["grpFixed_joint1"], "grpChain_joint4")
+		self.assertEqual(parents["grpFixed_joint2"], "loc_joint1")
+		self.assertEqual(parents["grpDistr_joint2"], "grpFixed_joint2")
+		self.assertEqual(parents["loc_joint2"], "grpDistr_joint2")
+		self.assertEqual(plan.bake[0], ("grpFixed_joint1", joints[0], None))
+		self.assertEqual(plan.bake[2], ("grpFixed_ns_joint3", joints[2], joints[1]))
+
+	def test_parents_created_before_children(self):
+		plan = ChainDistributionPlan.PlanRigVariant2(joints)
+		created = set()
+		for name, nodeType, parent in plan.nodes:
+			if (parent is not None):
+				self.assertIn(parent, created)
+			created.add(name)
+
+	def test_multiply_divide_drives_middle_links(self):
+		plan = ChainDistributionPlan.PlanRigVariant2(joints)
+		self.assertIsNone(plan.warning)
+		self.assertIn(("gtMultiplyDivide", "multiplyDivide", None), plan.nodes)
+		self.assertIn(("loc_joint4.rotate", "gtMultiplyDivide.input1"), plan.connections)
+		driven = [item[1] for item in plan.connections if item[0] == "gtMultiplyDivide.output"]
+		self.assertEqual(driven, ["grpDistr_joint2.rotate", "grpDistr_ns_joint3.rotate"])
+		weight = [item for item in plan.customAttributes if item[1] == ChainDistributionPlan.nameAttributeWeight][0]
+		self.assertEqual(weight[2]["defaultValue"], len(joints) - 1)
+		self.assertEqual(plan.keys, ["grpDistr_joint4.rx", "grpDistr_joint4.ry", "grpDistr_joint4.rz"])
+		self.assertEqual(plan.connectionsAfterKeys, [("loc_joint4.global", "grpDistr_joint4.blendOrient1")])
+
+	def test_short_chain_warns_without_distribution(self):
+		plan = ChainDistributionPlan.PlanRigVariant2(joints[:2])
+		self.assertIsNotNone(plan.warning)
+		self.assertEqual([item for item in plan.nodes if item[1] == "multiplyDivide"], [])
+		self.assertEqual(plan.customAttributes, [])
+		self.assertEqual(plan.keys, [])
+		self.assertEqual(plan.select, "loc_joint2")
+
+
+class TestEvaluateDistribution(VectorTestCase):
+	def test_linear_weights_match_live_division(self):
+		weights = ChainDistributionPlan.GetDistributionWeights(5)
+		self.assertVectorEqual(weights, [0, 0.25, 0.25, 0.25, 0])
+		self.assertVectorEqual(ChainDistributionPlan.GetDistributionWeights(5, distribution = 2), [0, 0.5, 0.5, 0.5, 0])
+		self.assertEqual(ChainDistributionPlan.GetDistributionWeights(2), [0.0, 0.0])
+
+	def test_turns_above_half_turn_are_kept(self):
+		eulers = [(0, 0, 400), (0, 0, 720)]
+		result = ChainDistributionPlan.EvaluateDistribution(eulers, [[0.5], [0.5]])
+		self.assertVectorEqual(result[0][0], (0, 0, 200))
+		self.assertVectorEqual(result[0][1], (0, 0, 360))
+
+	def test_negative_turn(self):
+		result = ChainDistributionPlan.EvaluateDistribution([(-300, 0, 0)], [[0.25]])
+		self.assertVectorEqual(result[0][0], (-75, 0, 0))
+
+	def test_weights_per_group(self):
+		result = ChainDistributionPlan.EvaluateDistribution([(0, 90, 0)], [[0.5, 1.0]])
+		self.assertVectorEqual(result[0][0], (0, 45, 0))
+		self.assertVectorEqual(result[1][0], (0, 90, 0))
@@ -0,0 +1,71 @@
+import unittest
+
+from GETOOLS_SOURCE.utils import ConstraintsEvaluation
+from GETOOLS_SOURCE.utils import Matrices
+
+from helpers import VectorTestCase
+
+
+def Translation(x, y, z):
+	return Matrices.MatrixCompose((x, y, z))
+
+def Rotation(x, y, z, translation=(0, 0, 0)):
+	return Matrices.MatrixCompose(translation, Matrices.EulerToRotation((x, y, z)))
+
+
+class TestEvaluateConstraint(VectorTestCase):
+	def test_point_weighted_between_targets(self):
+		targets = [[Translation(0, 0, 0)], [Translation(10, 0, 0)]]
+		child = [Translation(3, 3, 3)]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, child, parent = False, point = True)
+		self.assertVectorEqual(result[0][0], (5, 0, 0))
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, child, weights = [1, 3], parent = False, point = True)
+		self.assertVectorEqual(result[0][0], (7.5, 0, 0))
+		# Rotation and scale stay from the child
+		self.assertVectorEqual(result[0][1], (0, 0, 0))
+		self.assertVectorEqual(result[0][2], (1, 1, 1))
+
+	def test_parent_with_offset_follows_target_rotation(self):
+		# Child is 1 unit along X from the target, target turns 90 degrees around Y on the second frame
+		targets = [[Rotation(0, 0, 0), Rotation(0, 90, 0)]]
+		child = [Translation(1, 0, 0), Translation(1, 0, 0)]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, child, maintainOffset = True)
+		self.assertVectorEqual(result[0][0], (1, 0, 0))
+		self.assertVectorEqual(result[1][0], (0, 0, -1))
+		self.assertVectorEqual(result[1][1], (0, 90, 0))
+
+	def test_parent_without_offset_snaps_to_target(self):
+		targets = [[Rotation(0, 0, 45, (2, 4, 6))]]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, [Translation(1, 0, 0)])
+		self.assertVectorEqual(result[0][0], (2, 4, 6))
+		self.assertVectorEqual(result[0][1], (0, 0, 45))
+
+	def test_parent_inverse_and_skip(self):
+		targets = [[Translation(4, 5, 6)]]
+		child = [Translation(1, 1, 1)]
+		parentInverse = [Matrices.MatrixInverse(Translation(0, 5, 0))]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, child, parentInverseMatrices = parentInverse, parent = False, point = True, skipTranslate = "x")
+		self.assertVectorEqual(result[0][0], (1, 0, 6))
+
+	def test_orient_average(self):
+		targets = [[Rotation(0, 0, 0)], [Rotation(0, 0, 90)]]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, [Translation(1, 2, 3)], parent = False, orient = True)
+		self.assertVectorEqual(result[0][0], (1, 2, 3))
+		self.assertVectorEqual(result[0][1], (0, 0, 45))
+
+	def test_scale(self):
+		targets = [[Matrices.MatrixCompose(scale = (2, 2, 2))], [Matrices.MatrixCompose(scale = (4, 6, 8))]]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, [Translation(0, 0, 0)], parent = False, scale = True)
+		self.assertVectorEqual(result[0][2], (3, 4, 5))
+
+	def test_aim(self):
+		# X axis aims up to the target, Y axis goes to the world up vector
+		targets = [[Translation(0, 10, 0)]]
+		result = ConstraintsEvaluation.EvaluateConstraint(targets, [Translation(0, 0, 0)], parent = False, aim = True, worldUpVector = (0, 0, 1))
+		rotation = Matrices.EulerToRotation(result[0][1])
+		self.assertVectorEqual(Matrices.VectorRotate((1, 0, 0), rotation), (0, 1, 0))
+		self.assertVectorEqual(Matrices.VectorRotate((0, 1, 0), rotation), (0, 0, 1))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,189 @@
+import math
+import unittest
+
+from GETOOLS_SOURCE.utils import Matrices
+
+from helpers import VectorTestCase
+
+
+def Translation(x, y, z):
+	return Matrices.MatrixCompose((x, y, z))
+
+
+class TestEuler(VectorTestCase):
+	def test_single_axis_rotations(self):
+		# Row vectors, rotating the Y axis by 90 degrees around X gives the Z axis
+		self.assertVectorEqual(Matrices.VectorRotate((0, 1, 0), Matrices.EulerToRotation((90, 0, 0))), (0, 0, 1))
+		self.assertVectorEqual(Matrices.VectorRotate((0, 0, 1), Matrices.EulerToRotation((0, 90, 0))), (1, 0, 0))
+		self.assertVectorEqual(Matrices.VectorRotate((1, 0, 0), Matrices.EulerToRotation((0, 0, 90))), (0, 1, 0))
+
+	def test_rotate_order_is_applied_first_to_last(self):
+		# xyz turns Y into Z by X, then Z into X by Y
+		self.assertVectorEqual(Matrices.VectorRotate((0, 1, 0), Matrices.EulerToRotation((90, 90, 0), 0)), (1, 0, 0))
+		# zyx applies Y first which keeps Y, then X turns it into Z
+		self.assertVectorEqual(Matrices.VectorRotate((0, 1, 0), Matrices.EulerToRotation((90, 90, 0), 5)), (0, 0, 1))
+
+	def test_round_trip_all_rotate_orders(self):
+		# Outer angles in -180..180 and the middle angle in -90..90 have only one solution
+		angles = ((0, 0, 0), (30, -45, 60), (-170, 20, 95), (10, 80, -120), (-60, -30, 179))
+		for rotateOrder in range(6):
+			order = Matrices._rotateOrders[rotateOrder]
+			for values in angles:
+				euler = [0.0, 0.0, 0.0]
+				for axis, value in zip(order, values):
+					euler[axis] = value
+				rotation = Matrices.EulerToRotation(euler, rotateOrder)
+				result = Matrices.RotationToEuler(rotation, rotateOrder)
+				self.assertVectorEqual(result, euler)
+
+	def test_gimbal_lock_keeps_rotation(self):
+		for rotateOrder in range(6):
+			euler = [20.0, 20.0, 20.0]
+			euler[Matrices._rotateOrders[rotateOrder][1]] = 90.0
+			rotation = Matrices.EulerToRotation(euler, rotateOrder)
+			result = Matrices.RotationToEuler(rotation, rotateOrder)
+			self.assertRotationEqual(Matrices.EulerToRotation(result, rotateOrder), rotation)
+
+	def test_alternative_solution_is_same_rotation(self):
+		for rotateOrder in range(6):
+			euler = (30, -45, 60)
+			alternative = Matrices.EulerAlternative(euler, rotateOrder)
+			self.assertRotationEqual(Matrices.EulerToRotation(alternative, rotateOrder), Matrices.EulerToRotation(euler, rotateOrder))
+
+	def test_unwrap_sequence_keeps_turns(self):
+		result = Matrices.EulerUnwrapSequence([(0, 0, 170), (0, 0, -170), (0, 0, -10)])
+		self.assertVectorEqual(result[1], (0, 0, 190))
+		self.assertVectorEqual(result[2], (0, 0, 350))
+
+
+class TestQuaternions(VectorTestCase):
+	def test_from_rotation(self):
+		half = math.sqrt(0.5)
+		self.assertVectorEqual(Matrices.QuaternionFromRotation(Matrices.EulerToRotation((0, 0, 90))), (0, 0, half, half))
+		self.assertVectorEqual(Matrices.QuaternionFromRotation(Matrices.EulerToRotation((90, 0, 0))), (half, 0, 0, half))
+		# 180 degrees takes the branch without trace
+		self.assertVectorEqual(Matrices.QuaternionFromRotation(Matrices.EulerToRotation((0, 180, 0))), (0, 1, 0, 0))
+
+	def test_round_trip(self):
+		for rotateOrder in range(6):
+			rotation = Matrices.EulerToRotation((-35, 70, 125), rotateOrder)
+			quaternion = Matrices.QuaternionFromRotation(rotation)
+			self.assertAlmostEqual(sum(value * value for value in quaternion), 1.0)
+			self.assertRotationEqual(Matrices.QuaternionToRotation(quaternion), rotation)
+
+	def test_slerp_and_power(self):
+		identity = (0, 0, 0, 1)
+		quarter = Matrices.QuaternionFromRotation(Matrices.EulerToRotation((0, 0, 90)))
+		eighth = Matrices.QuaternionFromRotation(Matrices.EulerToRotation((0, 0, 45)))
+		self.assertVectorEqual(Matrices.QuaternionSlerp(identity, quarter, 0.5), eighth)
+		self.assertVectorEqual(Matrices.QuaternionPower(quarter, 0.5), eighth)
+		# Power keeps the direction of a turn above 180 degrees
+		turn = (0, 0, math.sin(math.radians(135)), math.cos(math.radians(135)))
+		self.assertRotationEqual(Matrices.QuaternionToRotation(Matrices.QuaternionPower(turn, 0.5)), Matrices.EulerToRotation((0, 0, 135)))
+
+	def test_axis_angle_from_euler_keeps_turns(self):
+		axis, angle = Matrices.EulerToAxisAngle((0, 0, 270))
+		self.assertAlmostEqual(angle * axis[2], 270)
+		axis, angle = Matrices.EulerToAxisAngle((360, 0, 0))
+		self.assertVectorEqual(axis, (1, 0, 0))
+		self.assertAlmostEqual(angle, 360)
+		euler = (30, -50, 70)
+		for rotateOrder in range(6):
+			axis, angle = Matrices.EulerToAxisAngle(euler, rotateOrder)
+			rotation = Matrices.QuaternionToRotation(Matrices.QuaternionFromAxisAngle(axis, angle))
+			self.assertRotationEqual(rotation, Matrices.EulerToRotation(euler, rotateOrder))
+
+	def test_weighted_average_aligns_hemispheres(self):
+		quarter = Matrices.QuaternionFromRotation(Matrices.EulerToRotation((0, 0, 90)))
+		flipped = tuple(-value for value in quarter)
+		self.assertVectorEqual(Matrices.QuaternionWeightedAverage([quarter, flipped], [1, 1]), quarter)
+
+
+class TestMatrixInverse(VectorTestCase):
+	def test_translation_and_scale(self):
+		self.assertVectorEqual(Matrices.MatrixInverse(Translation(1, 2, 3)), Translation(-1, -2, -3))
+		self.assertVectorEqual(Matrices.MatrixInverse(Matrices.MatrixCompose(scale = (2, 4, 0.5))), Matrices.MatrixCompose(scale = (0.5, 0.25, 2)))
+
+	def test_product_is_identity(self):
+		matrix = Matrices.MatrixCompose((5, -2, 7), Matrices.EulerToRotation((10, 20, 30), 3), (1, 2, 3))
+		self.assertVectorEqual(Matrices.MatrixMultiply(matrix, Matrices.MatrixInverse(matrix)), Matrices.MatrixIdentity())
+		self.assertVectorEqual(Matrices.MatrixMultiply(Matrices.MatrixInverse(matrix), matrix), Matrices.MatrixIdentity())
+
+	def test_singular(self):
+		with self.assertRaises(ValueError):
+			Matrices.MatrixInverse(Matrices.MatrixCompose(scale = (1, 0, 1)))
+
+	def test_decompose(self):
+		rotation = Matrices.EulerToRotation((15, -40, 75), 2)
+		translation, resultRotation, scale = Matrices.MatrixDecompose(Matrices.MatrixCompose((1, 2, 3), rotation, (2, 3, 4)))
+		self.assertVectorEqual(translation, (1, 2, 3))
+		self.assertRotationEqual(resultRotation, rotation)
+		self.assertVectorEqual(scale, (2, 3, 4))
+
+
+class TestPivotFrame(VectorTestCase):
+	def test_channels_from_pivot_frame(self):
+		# Build the Maya local matrix from channels, then recover translate and rotate from the rotate pivot frame
+		translate = (3, -2, 5)
+		rotate = (20, -35, 60)
+		rotateOrder = 3
+		rotateAxis = Matrices.EulerToRotation((10, 25, -15))
+		rotatePivot = (1, 2, 3)
+		rotatePivotTranslate = (0.5, -1, 2)
+		scalePivot = (-1, 0.5, 4)
+		scalePivotTranslate = (2, 1, -1)
+		scale = (2, 0.5, 3)
+		chain = (
+			Translation(*Matrices.VectorScale(scalePivot, -1)),
+			Matrices.MatrixCompose(scale = scale),
+			Translation(*scalePivot),
+			Translation(*scalePivotTranslate),
+			Translation(*Matrices.VectorScale(rotatePivot, -1)),
+			Matrices.MatrixCompose(rotation = rotateAxis),
+			Matrices.MatrixCompose(rotation = Matrices.EulerToRotation(rotate, rotateOrder)),
+			Translation(*rotatePivot),
+			Translation(*rotatePivotTranslate),
+			Translation(*translate),
+			)
+		local = Matrices.MatrixIdentity()
+		for matrix in chain:
+			local = Matrices.MatrixMultiply(local, matrix)
+		frame = Matrices.MatrixCompose(Matrices.PointTransform(rotatePivot, local), Matrices.MatrixDecompose(local)[1])
+
+		translation, rotation, scaleValues = Matrices.TransformFromPivotFrame(frame, rotatePivot, rotatePivotTranslate, scalePivot, scalePivotTranslate, scale, rotateAxis)
+		self.assertVectorEqual(translation, translate)
+		self.assertVectorEqual(Matrices.RotationToEuler(rotation, rotateOrder), rotate)
+		self.assertVectorEqual(Matrices.TransformToMatrix(translation, rotation, scale, rotatePivot, rotatePivotTranslate, scalePivot, scalePivotTranslate, rotateAxis), local)
+
+	def test_joint_orient(self):
+		jointOrient = Matrices.EulerToRotation((0, 0, 90))
+		frame = Matrices.MatrixCompose((1, 2, 3), Matrices.RotationMultiply(Matrices.EulerToRotation((30, 0, 0)), jointOrient))
+		translation, rotation, scaleValues = Matrices.TransformFromPivotFrame(frame, jointOrient = jointOrient)
+		self.assertVectorEqual(translation, (1, 2, 3))
+		self.assertVectorEqual(Matrices.RotationToEuler(rotation), (30, 0, 0))
+
+
+	def test_child_follows_rebaked_parent(self):
+		# Parent and child are both baked to world pivot frames, the child parent space comes from the new parent world matrix
+		parentPivot = (0, 1, 0)
+		childPivot = (0.5, 0, -1)
+		jointOrient = Matrices.EulerToRotation((0, 90, 0))
+		parentTarget = Matrices.MatrixCompose((4, 5, 6), Matrices.EulerToRotation((10, 20, 30)))
+		childTarget = Matrices.MatrixCompose((-3, 2, 8), Matrices.EulerToRotation((-40, 15, 70)))
+		parentWorldOld = Matrices.MatrixCompose((1, 0, 0), Matrices.EulerToRotation((0, 45, 0)), (2, 2, 2))
+		childParentOld = parentWorldOld # direct child
+
+		translation, rotation, scaleValues = Matrices.TransformFromPivotFrame(parentTarget, rotatePivot = parentPivot, scale = (2, 2, 2))
+		parentWorld = Matrices.TransformToMatrix(translation, rotation, (2, 2, 2), parentPivot)
+		self.assertVectorEqual(Matrices.PointTransform(parentPivot, parentWorld), (4, 5, 6))
+
+		childParent = Matrices.ParentSpaceAfterBake(childParentOld, Matrices.MatrixInverse(parentWorldOld), parentWorld)
+		self.assertVectorEqual(childParent, parentWorld)
+		translation, rotation, scaleValues = Matrices.TransformFromPivotFrame(Matrices.MatrixMultiply(childTarget, Matrices.MatrixInverse(childParent)), rotatePivot = childPivot, jointOrient = jointOrient)
+		childWorld = Matrices.MatrixMultiply(Matrices.TransformToMatrix(translation, rotation, rotatePivot = childPivot, jointOrient = jointOrient), childParent)
+		self.assertVectorEqual(Matrices.PointTransform(childPivot, childWorld), (-3, 2, 8))
+		self.assertRotationEqual(Matrices.MatrixDecompose(childWorld)[1], Matrices.EulerToRotation((-40, 15, 70)))
+
+
+if __name__ == "__main__":
+	unittest.main()